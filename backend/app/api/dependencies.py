@@ -1,29 +1,107 @@
-from functools import lru_cache
+import secrets
 
-from fastapi import Request
+from fastapi import Depends, HTTPException, Query, Request, Response
 
+from .. import __version__
+from ..core.cache import LRUCache
+from ..core.catalog import CatalogReloader
+from ..core.exceptions import NotModifiedError
+from ..core.settings import settings
+from ..data.quotes import QuoteRepository, QuoteWriter
 from ..rules import RulesEngine
 from ..services.quote import QuoteService
-from ..services.server import ServerService
+from ..services.server import PricedConfiguration, ServerService
 
 
-@lru_cache()
 def get_quote_service(request: Request) -> QuoteService:
-    """Get cached quote service."""
-    return QuoteService(server_service=get_server_service2(request))
+    """Get a quote service backed by the shared quote repository."""
+    return QuoteService(
+        server_service=get_server_service2(request),
+        quote_repository=request.app.state.quote_repository,
+        quote_writer=request.app.state.quote_writer,
+        executor=request.app.state.quote_executor,
+    )
+
+
+def get_catalog_reloader(request: Request) -> CatalogReloader:
+    return request.app.state.catalog_reloader
+
+
+def get_configuration_cache(request: Request) -> LRUCache[PricedConfiguration]:
+    return request.app.state.configuration_cache
+
+
+def get_options_cache(request: Request) -> LRUCache[bytes]:
+    return request.app.state.options_cache
+
+
+def get_quote_repository(request: Request) -> QuoteRepository:
+    return request.app.state.quote_repository
+
+
+def get_quote_writer(request: Request) -> QuoteWriter | None:
+    return request.app.state.quote_writer
 
 
 def get_rule_engine(request: Request) -> RulesEngine:
-    """Retrieve the pre-configured RulesEngine from app state.
+    """Retrieve the current RulesEngine snapshot from app state.
 
-    This is the ONLY dependency that needs to be retrieved from app state,
-    as it's initialized once during application startup.
+    Resolved once per request, so a request keeps running against the same
+    catalog snapshot even if a reload swaps in a new one meanwhile.
     """
     return request.app.state.rule_engine
 
 
-@lru_cache()
 def get_server_service2(request: Request) -> ServerService:
-    """Get cached server service."""
-    return ServerService(rule_engine=get_rule_engine(request))
+    """Get a server service backed by the shared price matrix and caches."""
+    return ServerService(
+        rule_engine=get_rule_engine(request),
+        configuration_cache=request.app.state.configuration_cache,
+        price_matrix=request.app.state.price_matrix,
+        options_cache=request.app.state.options_cache,
+    )
+
+
+def require_admin(request: Request) -> None:
+    """Guard admin routes with the configured token; without one they do not exist."""
+    # an empty token counts as unset, or a request without the header would match it
+    expected = settings.ADMIN_API_TOKEN.get_secret_value() if settings.ADMIN_API_TOKEN else ""
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("X-Admin-Token", "")
+    if not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
+def catalog_conditional_get(
+    request: Request,
+    response: Response,
+    service: ServerService = Depends(get_server_service2),
+    # declared by the routes themselves; parsed here the same way
+    explain: bool = Query(default=False, include_in_schema=False),
+) -> None:
+    """Validate catalog-derived GETs by ETag, answering 304 before the route runs.
+
+    The ETag comes from the snapshot the request's service is bound to (the
+    route shares the same dependency instance), and changes with the catalog
+    content or the application version. Explained responses are never
+    cached, so they skip validation altogether.
+    """
+    if explain:
+        return
+    etag = f'"{__version__}-{service.rule_engine.data_provider.content_hash}"'
+    headers = {"ETag": etag, "Cache-Control": settings.CATALOG_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        raise NotModifiedError(headers)
+    response.headers.update(headers)
+
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match compares weakly: W/"x" matches "x"
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
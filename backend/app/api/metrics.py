@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from ..core.cache import LRUCache
+from ..core.metrics import metrics, render_cache_stats
+from ..data.quotes import QuoteRepository
+from ..services.server import PricedConfiguration
+from .dependencies import (
+    get_configuration_cache,
+    get_options_cache,
+    get_quote_repository,
+)
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(
+    configuration_cache: LRUCache[PricedConfiguration] = Depends(get_configuration_cache),
+    options_cache: LRUCache[bytes] = Depends(get_options_cache),
+    quote_repository: QuoteRepository = Depends(get_quote_repository),
+) -> PlainTextResponse:
+    # cache statistics are read when scraped, so lookups pay nothing extra for them
+    cache_stats = {
+        "pricing": configuration_cache.stats(),
+        "options": options_cache.stats(),
+        "quotes": quote_repository.cache_stats(),
+    }
+    return PlainTextResponse(
+        metrics.render() + render_cache_stats(cache_stats),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from .admin import router as admin_router
 from .quotes import router as quotes_router
 from .servers import router as server_router
 
@@ -16,3 +17,9 @@ api_router.include_router(
     prefix="/quotes",
     tags=["quotes"],
 )
+
+api_router.include_router(
+    admin_router,
+    prefix="/admin",
+    tags=["admin"],
+)
@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ...core.cache import LRUCache
+from ...core.catalog import CatalogReloader
+from ...data.models import (
+    CacheStatus,
+    CatalogStatus,
+    QuoteStorageMaintenance,
+    QuoteWriterStats,
+)
+from ...data.models.responses import BaseResponse
+from ...data.quotes import QuoteRepository, QuoteWriter
+from ...services.server import PricedConfiguration
+from ..dependencies import (
+    get_catalog_reloader,
+    get_configuration_cache,
+    get_options_cache,
+    get_quote_repository,
+    get_quote_writer,
+    require_admin,
+)
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/catalog", response_model=BaseResponse[CatalogStatus])
+async def get_catalog_status(
+    reloader: CatalogReloader = Depends(get_catalog_reloader),
+) -> BaseResponse[CatalogStatus]:
+    return BaseResponse.success(
+        message="Catalog status retrieved successfully.", data=reloader.status()
+    )
+
+
+@router.post("/catalog/reload", response_model=BaseResponse[CatalogStatus])
+async def reload_catalog(
+    reloader: CatalogReloader = Depends(get_catalog_reloader),
+) -> BaseResponse[CatalogStatus]:
+    if not reloader.enabled:
+        raise HTTPException(status_code=404, detail="Catalog reload is disabled.")
+    try:
+        status = await reloader.reload()
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return BaseResponse.success(message="Catalog reloaded successfully.", data=status)
+
+
+@router.get("/catalog/cache", response_model=BaseResponse[CacheStatus])
+async def get_pricing_cache_status(
+    cache: LRUCache[PricedConfiguration] = Depends(get_configuration_cache),
+) -> BaseResponse[CacheStatus]:
+    return BaseResponse.success(
+        message="Pricing cache statistics retrieved successfully.", data=_cache_status(cache)
+    )
+
+
+@router.get("/catalog/options-cache", response_model=BaseResponse[CacheStatus])
+async def get_options_cache_status(
+    cache: LRUCache[bytes] = Depends(get_options_cache),
+) -> BaseResponse[CacheStatus]:
+    return BaseResponse.success(
+        message="Options cache statistics retrieved successfully.", data=_cache_status(cache)
+    )
+
+
+@router.get("/quotes/writer", response_model=BaseResponse[QuoteWriterStats])
+async def get_quote_writer_stats(
+    writer: QuoteWriter | None = Depends(get_quote_writer),
+) -> BaseResponse[QuoteWriterStats]:
+    if writer is None:
+        raise HTTPException(status_code=404, detail="Quote writer is disabled.")
+    return BaseResponse.success(
+        message="Quote writer statistics retrieved successfully.", data=writer.stats()
+    )
+
+
+@router.post("/quotes/compact", response_model=BaseResponse[QuoteStorageMaintenance])
+async def compact_quotes(
+    repository: QuoteRepository = Depends(get_quote_repository),
+) -> BaseResponse[QuoteStorageMaintenance]:
+    data = await asyncio.to_thread(_compact, repository)
+    return BaseResponse.success(message="Quote storage compacted successfully.", data=data)
+
+
+@router.post("/quotes/archive", response_model=BaseResponse[QuoteStorageMaintenance])
+async def archive_quotes(
+    older_than_days: float = Query(gt=0),
+    repository: QuoteRepository = Depends(get_quote_repository),
+) -> BaseResponse[QuoteStorageMaintenance]:
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    data = await asyncio.to_thread(_archive, repository, cutoff)
+    return BaseResponse.success(message="Quote storage archived successfully.", data=data)
+
+
+def _cache_status(cache: LRUCache) -> CacheStatus:
+    stats = cache.stats()
+    lookups = stats.hits + stats.misses
+    return CacheStatus(
+        generation=cache.generation,
+        hit_ratio=stats.hits / lookups if lookups else 0.0,
+        **stats._asdict(),
+    )
+
+
+def _compact(repository: QuoteRepository) -> QuoteStorageMaintenance:
+    removed = repository.compact()
+    return _maintenance(repository, removed)
+
+
+def _archive(repository: QuoteRepository, cutoff: datetime) -> QuoteStorageMaintenance:
+    archived = repository.archive(cutoff)
+    return _maintenance(repository, len(archived))
+
+
+def _maintenance(repository: QuoteRepository, removed: int) -> QuoteStorageMaintenance:
+    return QuoteStorageMaintenance(
+        backend=repository.backend,
+        removed_segments=removed,
+        segments=repository.segment_count,
+        quotes=len(repository),
+    )
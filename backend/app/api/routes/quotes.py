@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Iterator, Optional
 
-from ...data.models.quote import QuoteRequest, QuoteResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ...data.models.quote import Quote, QuotePage, QuoteRequest, QuoteResponse
 from ...data.models.responses import BaseResponse
 from ...services.quote import QuoteService
 from ..dependencies import get_quote_service
@@ -13,9 +17,61 @@ async def create_quote_request(
     request: QuoteRequest, service: QuoteService = Depends(get_quote_service)
 ) -> BaseResponse[QuoteResponse]:
     try:
-        quote = service.create_quote(request)
+        quote = await service.acreate_quote(request)
         return BaseResponse.success(
             message="Quote request created successfully.", data=quote
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("", response_model=BaseResponse[QuotePage])
+async def list_quotes(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    offset: int = Query(default=0, ge=0),
+    created_from: Optional[datetime] = Query(default=None),
+    created_to: Optional[datetime] = Query(default=None),
+    service: QuoteService = Depends(get_quote_service),
+) -> BaseResponse[QuotePage]:
+    try:
+        page = await service.alist_quotes_page(
+            limit=limit,
+            cursor=cursor,
+            offset=offset,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BaseResponse.success(message="Quotes retrieved successfully.", data=page)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_quotes(
+    cursor: Optional[str] = Query(default=None),
+    created_from: Optional[datetime] = Query(default=None),
+    created_to: Optional[datetime] = Query(default=None),
+    service: QuoteService = Depends(get_quote_service),
+) -> StreamingResponse:
+    try:
+        records = service.iter_quotes(cursor, created_from, created_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def ndjson_lines() -> Iterator[bytes]:
+        for _, quote in records:
+            yield f"{quote.model_dump_json()}\n".encode("utf-8")
+
+    # a sync iterator is consumed in the threadpool, off the event loop
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/{quote_id}", response_model=BaseResponse[Quote])
+async def get_quote(
+    quote_id: str, service: QuoteService = Depends(get_quote_service)
+) -> BaseResponse[Quote]:
+    quote = await service.aget_quote(quote_id)
+    if quote is None:
+        raise HTTPException(status_code=404, detail="Quote not found.")
+    return BaseResponse.success(message="Quote retrieved successfully.", data=quote)
@@ -1,30 +1,59 @@
 from typing import Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
+from ...core.settings import settings
 from ...data.models.responses import BaseResponse
-from ...data.models.server import ServerConfigurationResponse, ServerOption
+from ...data.models.server import (
+    ServerConfigurationBatchItem,
+    ServerConfigurationBatchRequest,
+    ServerConfigurationResponse,
+    ServerOption,
+)
 from ...services.server import ServerService
-from ..dependencies import get_server_service2
+from ..dependencies import catalog_conditional_get, get_server_service2
 
 router = APIRouter()
 
+ServerOptionsResponse = BaseResponse[Dict[str, List[ServerOption]]]
+
+# query parameter switching on explain mode; never part of the configuration
+EXPLAIN_PARAM = "explain"
+EXPLAIN_DESCRIPTION = (
+    "Return a trace of the rules checked and matched per rule type, with timings, "
+    "instead of the plain result. Bypasses caches; for debugging only."
+)
+
 
 def extract_configuration(request: Request) -> Dict[str, str]:
     """Extract server configuration from query parameters."""
-    _configuration = {
-        key: value
-        for key, value in request.query_params.items()
-        if value and value.strip()
-    }
-    return _configuration
+    return normalize_configuration(
+        (key, value) for key, value in request.query_params.items() if key != EXPLAIN_PARAM
+    )
+
+
+def normalize_configuration(items) -> Dict[str, str]:
+    """Drop unselected (empty or blank) categories from a configuration."""
+    return {key: value for key, value in items if value and value.strip()}
 
 
-@router.get("/configure", response_model=BaseResponse[ServerConfigurationResponse])
+@router.get(
+    "/configure",
+    response_model=BaseResponse[ServerConfigurationResponse],
+    dependencies=[Depends(catalog_conditional_get)],
+)
 async def get_server_configuration(
     request: Request,
     service: ServerService = Depends(get_server_service2),
-) -> BaseResponse[ServerConfigurationResponse]:
+    explain: bool = Query(default=False, description=EXPLAIN_DESCRIPTION),
+) -> BaseResponse[ServerConfigurationResponse] | Response:
+    if explain:
+        return explained_response(
+            message="Server configuration explained successfully.",
+            data=service.explain_server_configuration(extract_configuration(request)),
+        )
     try:
         configuration = extract_configuration(request)
         result = service.get_server_configuration(configuration)
@@ -36,12 +65,73 @@ async def get_server_configuration(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/options", response_model=BaseResponse[Dict[str, List[ServerOption]]])
+@router.post(
+    "/configure/batch",
+    response_model=BaseResponse[List[ServerConfigurationBatchItem]],
+)
+async def get_server_configurations(
+    batch: ServerConfigurationBatchRequest,
+    service: ServerService = Depends(get_server_service2),
+) -> BaseResponse[List[ServerConfigurationBatchItem]]:
+    if len(batch.configurations) > settings.CONFIGURE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch may hold at most {settings.CONFIGURE_BATCH_MAX_SIZE} configurations.",
+        )
+
+    configurations = [
+        normalize_configuration(configuration.items())
+        for configuration in batch.configurations
+    ]
+    # pricing is CPU-bound; keep a large batch off the event loop
+    priced = await run_in_threadpool(service.get_server_configurations, configurations)
+    return BaseResponse.success(
+        message="Server configurations priced successfully.",
+        data=[
+            ServerConfigurationBatchItem(
+                index=index, configuration=result.response, error=result.error
+            )
+            for index, result in enumerate(priced)
+        ],
+    )
+
+
+@router.get(
+    "/options",
+    response_model=ServerOptionsResponse,
+    dependencies=[Depends(catalog_conditional_get)],
+)
 async def get_server_options(
+        request: Request,
+        response: Response,
         service: ServerService = Depends(get_server_service2),
-):
-    options = service.get_server_options()
-    return BaseResponse.success(
+        explain: bool = Query(default=False, description=EXPLAIN_DESCRIPTION),
+) -> Response:
+    if explain:
+        return explained_response(
+            message="Server options explained successfully.",
+            data=service.explain_server_options(extract_configuration(request)),
+        )
+    # the current selection, passed like /configure, drives per-option availability
+    body = service.render_server_options(
+        extract_configuration(request), render_server_options
+    )
+    # returned as is, so the validators set by the dependency are copied over
+    return Response(content=body, media_type="application/json", headers=response.headers)
+
+
+def render_server_options(options: Dict[str, List[ServerOption]]) -> bytes:
+    """Render an options listing exactly as the `response_model` would serialize it."""
+    return ServerOptionsResponse.success(
         message="Server options retrieved successfully.",
-        data=options
+        data=options,
+    ).model_dump_json().encode()
+
+
+def explained_response(message: str, data: BaseModel) -> Response:
+    """An explain trace, which carries timings, so it is neither cached nor validated."""
+    return Response(
+        content=BaseResponse.success(message=message, data=data).model_dump_json(),
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
     )
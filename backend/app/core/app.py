@@ -1,4 +1,6 @@
-from contextlib import asynccontextmanager
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from typing import Any, AsyncIterator, cast
 
 from asgi_correlation_id import CorrelationIdMiddleware
@@ -6,24 +8,45 @@ from fastapi import FastAPI
 from fastapi.exceptions import HTTPException, RequestValidationError
 from starlette.middleware.cors import CORSMiddleware
 
-from backend.app.data.provider import DataProvider, initialize_data_provider
+from backend.app.data.provider import DataProvider
 
 from ..api import api_router
 from ..api.health import router as health_router
+from ..api.metrics import router as metrics_router
+from ..data.quotes import (
+    JsonlQuoteRepository,
+    QuoteRepository,
+    QuoteWriter,
+    SqliteQuoteRepository,
+)
+from ..data.utilities import data_file
 from ..middleware.requests import HttpRequestLoggingMiddleware
-from ..rules import RulesEngine, initialize_rule_engine
-from ..rules.handlers import initialize_handler_registry
+from ..rules import RulesEngine
+from ..services.price_matrix import PriceMatrix
+from ..services.server import PricedConfiguration
+from .cache import LRUCache
+from .catalog import CatalogReloader, build_catalog_snapshot
+from .exceptions.exception import NotModifiedError
 from .exceptions.handler import (
     generic_exception_handler,
     http_exception_handler,
+    not_modified_handler,
     validation_exception_handler,
 )
+from .metrics import metrics
 from .settings import settings
 
 
 class AppState:
     data_provider: DataProvider
     rule_engine: RulesEngine
+    price_matrix: PriceMatrix | None
+    configuration_cache: LRUCache[PricedConfiguration]
+    options_cache: LRUCache[bytes]
+    catalog_reloader: CatalogReloader
+    quote_repository: QuoteRepository
+    quote_writer: QuoteWriter | None
+    quote_executor: ThreadPoolExecutor
 
 class CPQFastAPI(FastAPI):
     @property
@@ -34,15 +57,70 @@ class CPQFastAPI(FastAPI):
 @asynccontextmanager
 async def lifespan(app: CPQFastAPI) -> AsyncIterator[None]:
     """Application lifespan context manager with enhanced error reporting."""
-    data_provider = initialize_data_provider()
-    handler_registry = initialize_handler_registry(data_provider)
-    rule_engine = initialize_rule_engine(data_provider, handler_registry)
+    catalog_reloader = CatalogReloader(
+        app.state,
+        mode=settings.CATALOG_RELOAD_MODE,
+        watch_interval=settings.CATALOG_WATCH_INTERVAL_SECONDS,
+    )
+    catalog_reloader.install(build_catalog_snapshot())
+
+    app.state.catalog_reloader = catalog_reloader
+    app.state.configuration_cache = LRUCache(
+        max_size=settings.PRICING_CACHE_SIZE,
+        ttl_seconds=settings.PRICING_CACHE_TTL_SECONDS,
+    )
+    app.state.options_cache = LRUCache(max_size=settings.OPTIONS_CACHE_SIZE)
+    app.state.quote_repository = create_quote_repository()
+    app.state.quote_executor = ThreadPoolExecutor(
+        max_workers=settings.QUOTE_IO_WORKERS, thread_name_prefix="quote-io"
+    )
 
-    app.state.data_provider = data_provider
-    app.state.rule_engine = rule_engine
+    quote_writer = None
+    if settings.QUOTE_WRITER_ENABLED:
+        quote_writer = QuoteWriter(
+            app.state.quote_repository,
+            batch_size=settings.QUOTE_WRITER_BATCH_SIZE,
+            flush_interval_ms=settings.QUOTE_WRITER_FLUSH_INTERVAL_MS,
+            fsync=settings.QUOTE_WRITER_FSYNC,
+        )
+        quote_writer.start()
+    app.state.quote_writer = quote_writer
+
+    watch_task = None
+    if settings.CATALOG_RELOAD_MODE == "watch":
+        watch_task = asyncio.create_task(catalog_reloader.watch())
 
     yield
 
+    if watch_task is not None:
+        watch_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await watch_task
+
+    writer_stopped = True
+    if quote_writer is not None:
+        writer_stopped = await asyncio.to_thread(quote_writer.stop)
+    app.state.quote_executor.shutdown(wait=True)
+    if writer_stopped:
+        app.state.quote_repository.close()
+
+
+def create_quote_repository() -> QuoteRepository:
+    """Open the quote storage backend selected in the settings."""
+    if settings.QUOTE_STORAGE_BACKEND == "sqlite":
+        return SqliteQuoteRepository(
+            settings.QUOTES_DATABASE_PATH or data_file("quotes.sqlite3"),
+            cache_size=settings.QUOTE_CACHE_SIZE,
+            busy_timeout_ms=settings.QUOTE_DATABASE_BUSY_TIMEOUT_MS,
+        )
+    return JsonlQuoteRepository(
+        settings.QUOTES_FILE_PATH or data_file("quotes.jsonl"),
+        cache_size=settings.QUOTE_CACHE_SIZE,
+        segment_max_bytes=settings.QUOTE_SEGMENT_MAX_BYTES,
+        segment_max_age_seconds=settings.QUOTE_SEGMENT_MAX_AGE_SECONDS,
+        bloom_false_positive_rate=settings.QUOTE_BLOOM_FALSE_POSITIVE_RATE,
+    )
+
 def create_app(
     *,
     title: str = "FastAPI",
@@ -65,7 +143,11 @@ def create_app(
 
 
 def configure_middleware(app: FastAPI):
-    app.add_middleware(HttpRequestLoggingMiddleware)
+    app.add_middleware(
+        HttpRequestLoggingMiddleware,
+        sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+        slow_request_ms=settings.ACCESS_LOG_SLOW_REQUEST_MS,
+    )
     app.add_middleware(CorrelationIdMiddleware)
     app.add_middleware(
         CORSMiddleware,
@@ -78,12 +160,17 @@ def configure_middleware(app: FastAPI):
 
 def configure_routes(app: FastAPI):
     app.include_router(health_router)
+    # recording follows the setting too, so a disabled registry costs nothing
+    metrics.enabled = settings.METRICS_ENABLED
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
     app.include_router(api_router, prefix="/api/v1")
 
 
 def configure_exception_handlers(app: FastAPI) -> FastAPI:
     app.add_exception_handler(HTTPException, http_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(NotModifiedError, not_modified_handler)
     app.add_exception_handler(Exception, generic_exception_handler)
 
     return app
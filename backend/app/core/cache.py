@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, NamedTuple, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class CacheStats(NamedTuple):
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+    max_size: int
+
+
+class LRUCache(Generic[V]):
+    """Bounded, thread-safe LRU cache with an optional per-entry TTL.
+
+    The cache can be bound to a catalog generation; binding it to a newer
+    generation drops every entry, so values derived from an old catalog are
+    never served against a new one. Older generations never rebind it, so
+    requests still finishing on a superseded snapshot cannot thrash it.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self._entries: OrderedDict[Hashable, tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @property
+    def generation(self) -> Optional[int]:
+        return self._generation
+
+    def bind(self, generation: int) -> None:
+        """Scope the cache to a generation, clearing it when a newer one arrives."""
+        current = self._generation
+        if current is not None and generation <= current:
+            return
+        with self._lock:
+            current = self._generation
+            if current is None or generation > current:
+                if current is not None:
+                    self._invalidations += 1
+                self._entries.clear()
+                self._generation = generation
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, expires_at = entry
+            if self.ttl_seconds is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        if not self.enabled:
+            return
+
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else 0.0
+        )
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+                max_size=self.max_size,
+            )
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from typing import Any, NamedTuple, Optional
+
+from ..data.models import CatalogStatus
+from ..data.provider import DataProvider, initialize_data_provider
+from ..data.utilities import data_file
+from ..rules import RulesEngine, initialize_rule_engine
+from ..rules.handlers import initialize_handler_registry
+from ..services.price_matrix import PriceMatrix, build_price_matrix
+from .logger import app_logger
+from .settings import settings
+
+CATALOG_FILES = ("categories.jsonl", "options.jsonl", "rules.jsonl", "settings.jsonl")
+
+FileSignature = tuple[tuple[str, int, int], ...]
+
+
+def build_rule_engine(version: int = 1) -> RulesEngine:
+    """Load, validate and index the catalog into a fresh rules engine."""
+    data_provider = initialize_data_provider(version=version)
+    handler_registry = initialize_handler_registry(data_provider)
+    return initialize_rule_engine(data_provider, handler_registry)
+
+
+class CatalogSnapshot(NamedTuple):
+
+    rule_engine: RulesEngine
+    price_matrix: Optional[PriceMatrix]
+
+
+def build_catalog_snapshot(version: int = 1) -> CatalogSnapshot:
+    """Build the rules engine and, when enabled, the precomputed price matrix."""
+    rule_engine = build_rule_engine(version)
+    price_matrix = None
+    if settings.PRICE_MATRIX_ENABLED:
+        price_matrix = build_price_matrix(rule_engine, settings.PRICE_MATRIX_MAX_CELLS)
+    return CatalogSnapshot(rule_engine, price_matrix)
+
+
+class CatalogReloader:
+    """Rebuilds the catalog off the hot path and swaps it into the app state.
+
+    Each request resolves `state.rule_engine` once and keeps that reference,
+    so in-flight requests finish on the snapshot they started with while new
+    requests pick up the replacement. Reloads are per worker process.
+    """
+
+    def __init__(self, state: Any, mode: str, watch_interval: float) -> None:
+        self.state = state
+        self.mode = mode
+        self.watch_interval = watch_interval
+        self._lock = asyncio.Lock()
+        self._signature = self._file_signature()
+        self._reload_count = 0
+        self._failed_reloads = 0
+        self._last_reload_latency_ms: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def data_provider(self) -> DataProvider:
+        return self.state.rule_engine.data_provider
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "disabled"
+
+    def install(self, snapshot: CatalogSnapshot) -> None:
+        # a single attribute store per name; readers never see a torn snapshot,
+        # and a price matrix paired with another engine is ignored by the service
+        self.state.rule_engine = snapshot.rule_engine
+        self.state.data_provider = snapshot.rule_engine.data_provider
+        self.state.price_matrix = snapshot.price_matrix
+
+    async def reload(self, reason: str = "manual") -> CatalogStatus:
+        """Build a new snapshot in a worker thread and install it if valid."""
+        async with self._lock:
+            signature = self._file_signature()
+            version = self.data_provider.version + 1
+            start_time = time.perf_counter()
+            try:
+                snapshot = await asyncio.to_thread(build_catalog_snapshot, version)
+            except Exception as e:
+                self._failed_reloads += 1
+                self._last_error = str(e.__cause__ or e)
+                # remember the broken files so watch mode waits for the next edit
+                self._signature = signature
+                app_logger.error(
+                    "Catalog reload failed", reason=reason, error=self._last_error
+                )
+                raise RuntimeError(f"Catalog reload failed: {self._last_error}") from e
+
+            self.install(snapshot)
+            self._signature = signature
+            self._reload_count += 1
+            self._last_error = None
+            self._last_reload_latency_ms = (time.perf_counter() - start_time) * 1000
+
+            app_logger.info(
+                "Catalog reloaded",
+                reason=reason,
+                version=version,
+                latency_ms=round(self._last_reload_latency_ms, 3),
+            )
+            return self.status()
+
+    async def watch(self) -> None:
+        """Poll the catalog files and reload whenever they change."""
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            if self._lock.locked() or self._file_signature() == self._signature:
+                continue
+            try:
+                await self.reload(reason="watch")
+            except RuntimeError:
+                continue
+
+    def status(self) -> CatalogStatus:
+        data_provider = self.data_provider
+        return CatalogStatus(
+            version=data_provider.version,
+            loaded_at=data_provider.loaded_at,
+            load_ms=data_provider.load_ms,
+            snapshot_cache_hit=data_provider.snapshot_cache_hit,
+            reload_mode=self.mode,
+            reload_count=self._reload_count,
+            failed_reloads=self._failed_reloads,
+            last_reload_latency_ms=self._last_reload_latency_ms,
+            last_error=self._last_error,
+        )
+
+    @staticmethod
+    def _file_signature() -> FileSignature:
+        signature = []
+        for filename in CATALOG_FILES:
+            try:
+                stat = data_file(filename).stat()
+                signature.append((filename, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((filename, 0, -1))
+        return tuple(signature)
@@ -1,15 +1,18 @@
-from .exception import PackageVersionNotFoundError
+from .exception import NotModifiedError, PackageVersionNotFoundError
 from .handler import (
     default_http_exception_handler,
     generic_exception_handler,
     http_exception_handler,
+    not_modified_handler,
     validation_exception_handler,
 )
 
 __all__ = [
+    "NotModifiedError",
     "PackageVersionNotFoundError",
     "default_http_exception_handler",
     "generic_exception_handler",
     "http_exception_handler",
+    "not_modified_handler",
     "validation_exception_handler",
 ]
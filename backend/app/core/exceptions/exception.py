@@ -26,3 +26,11 @@ class PackageVersionNotFoundError(Exception):
     def __init__(self, message: str = "Version not found in pyproject.toml") -> None:
         self.message: str = message
         super().__init__(self.message)
+
+
+class NotModifiedError(Exception):
+    """Raised to answer a conditional request with 304 before any work is done."""
+
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.headers = headers
+        super().__init__("Not Modified")
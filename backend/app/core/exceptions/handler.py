@@ -10,6 +10,7 @@ from starlette.responses import JSONResponse, Response
 
 from ...data.enums import ErrorCode
 from ...data.models.responses import ErrorDetail, ErrorResponse
+from .exception import NotModifiedError
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,11 @@ async def http_exception_handler(
     )
 
 
+async def not_modified_handler(_: Request, exc: Exception) -> Response:
+    headers = exc.headers if isinstance(exc, NotModifiedError) else None
+    return Response(status_code=304, headers=headers)
+
+
 async def validation_exception_handler(_: Request, exc: Exception) -> JSONResponse:
     if not isinstance(exc, RequestValidationError):
         return JSONResponse(
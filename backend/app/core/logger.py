@@ -1,10 +1,69 @@
+import atexit
 import logging
+import queue
 import sys
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Literal, Optional
 
 import structlog
 from structlog.types import Processor
 
+DropPolicy = Literal["drop_newest", "drop_oldest"]
+
+_queue_listener: Optional[QueueListener] = None
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Hands records to a bounded queue without ever blocking the caller.
+
+    Records are passed on unrendered, so formatting runs on the listener
+    thread. When the queue is full the newest record is dropped, or with
+    `drop_oldest` the oldest queued one; the count of dropped records is
+    logged as a warning once the queue has room again.
+    """
+
+    def __init__(self, log_queue: queue.Queue, drop_policy: DropPolicy = "drop_newest") -> None:
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # emit() runs under the handler lock, so the counters need no other guard
+        if self.drop_policy == "drop_oldest" and self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self._dropped_one()
+            except queue.Empty:
+                pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._dropped_one()
+            return
+
+        if self._unreported:
+            report = logging.makeLogRecord(
+                {
+                    "name": "system",
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"Dropped {self._unreported} log records: logging queue full",
+                }
+            )
+            try:
+                self.queue.put_nowait(report)
+                self._unreported = 0
+            except queue.Full:
+                pass
+
+    def _dropped_one(self) -> None:
+        self.dropped += 1
+        self._unreported += 1
+
 
 def _get_shared_processors() -> list[Processor]:
     """Get processors shared between sync and async configurations."""
@@ -22,8 +81,19 @@ def _get_shared_processors() -> list[Processor]:
 
 def configure_logging(
         enable_json_logging: Optional[bool] = None,
-        log_level: Optional[str] = None
+        log_level: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        drop_policy: DropPolicy = "drop_newest",
 ) -> None:
+    """Route structlog and stdlib logging to stderr.
+
+    With `queue_size`, records go through a bounded queue and are rendered
+    and written by a background thread (see `BoundedQueueHandler`).
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
 
     logging.basicConfig(level=logging.NOTSET)
     for handler in logging.root.handlers[:]:
@@ -33,7 +103,8 @@ def configure_logging(
     shared_processors = _get_shared_processors()
 
     structlog.configure(
-        processors=shared_processors + [
+        # drop disabled levels before any processor runs
+        processors=[structlog.stdlib.filter_by_level] + shared_processors + [
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
@@ -62,7 +133,15 @@ def configure_logging(
     handler.setLevel(log_level.upper())
 
     root_logger = logging.getLogger()
-    root_logger.addHandler(handler)
+    if queue_size:
+        _queue_listener = QueueListener(
+            queue.Queue(maxsize=queue_size), handler, respect_handler_level=True
+        )
+        _queue_listener.start()
+        atexit.register(_queue_listener.stop)
+        root_logger.addHandler(BoundedQueueHandler(_queue_listener.queue, drop_policy))
+    else:
+        root_logger.addHandler(handler)
     root_logger.setLevel(log_level.upper())
 
     for logger_name in ["uvicorn", "granian", "_granian", "uvloop", "h11", "httpcore", "httpx"]:
@@ -86,7 +165,8 @@ def configure_logging(
     structlog.get_logger("system").info(
         "Logging configured",
         json_format=enable_json_logging,
-        level=log_level.upper()
+        level=log_level.upper(),
+        queue_size=queue_size,
     )
 
 app_logger = structlog.get_logger("system")
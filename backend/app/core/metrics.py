@@ -0,0 +1,231 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Generic, Iterator, Mapping, Sequence, TypeVar
+
+from .cache import CacheStats
+
+# seconds; spans a cached lookup (microseconds) to a slow fsynced batch
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+C = TypeVar("C")
+
+
+class _CounterValue:
+
+    __slots__ = ("_lock", "value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramValue:
+
+    __slots__ = ("_bounds", "_lock", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self._lock = threading.Lock()
+        # one slot per bucket plus +Inf; cumulated only when rendered
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class _Metric(Generic[C]):
+    """A named metric family; one child value per distinct label tuple."""
+
+    kind: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], C] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> C:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape_help(self.documentation)}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            yield from self._render_child(dict(zip(self.labelnames, values)), child)
+
+    def _new_child(self) -> C:
+        raise NotImplementedError
+
+    def _render_child(self, labels: dict[str, str], child: C) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric[_CounterValue]):
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _new_child(self) -> _CounterValue:
+        return _CounterValue()
+
+    def _render_child(self, labels: dict[str, str], child: _CounterValue) -> Iterator[str]:
+        yield _sample(self.name, labels, child.value)
+
+
+class Histogram(_Metric[_HistogramValue]):
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def _render_child(self, labels: dict[str, str], child: _HistogramValue) -> Iterator[str]:
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), counts):
+            cumulative += count
+            yield _sample(f"{self.name}_bucket", {**labels, "le": _format(bound)}, cumulative)
+        yield _sample(f"{self.name}_sum", labels, total)
+        yield _sample(f"{self.name}_count", labels, cumulative)
+
+
+class MetricsRegistry:
+    """In-process counters and histograms, rendered in the Prometheus text format.
+
+    Recording is a dict lookup and a short lock per sample; callers check
+    `enabled` first so a disabled registry costs a single attribute read.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "".join(f"{line}\n" for metric in self._metrics.values() for line in metric.render())
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name} is already registered differently")
+        return existing
+
+
+def render_cache_stats(stats_by_cache: Mapping[str, CacheStats]) -> str:
+    """Cache statistics as Prometheus metrics, one `cache` label per cache."""
+    families = (
+        ("cpq_cache_hits_total", "counter", "Cache lookups that found an entry", "hits"),
+        ("cpq_cache_misses_total", "counter", "Cache lookups that found no entry", "misses"),
+        ("cpq_cache_evictions_total", "counter", "Entries evicted to stay within size", "evictions"),
+        ("cpq_cache_entries", "gauge", "Entries currently cached", "size"),
+    )
+    lines = []
+    for name, kind, documentation, field in families:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        for cache, stats in stats_by_cache.items():
+            lines.append(_sample(name, {"cache": cache}, getattr(stats, field)))
+
+    name = "cpq_cache_hit_ratio"
+    lines += [f"# HELP {name} Share of cache lookups that hit", f"# TYPE {name} gauge"]
+    for cache, stats in stats_by_cache.items():
+        lookups = stats.hits + stats.misses
+        lines.append(_sample(name, {"cache": cache}, stats.hits / lookups if lookups else 0.0))
+    return "".join(f"{line}\n" for line in lines)
+
+
+def _sample(name: str, labels: dict[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_format(value)}"
+    rendered = ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels.items())
+    return f"{name}{{{rendered}}} {_format(value)}"
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
+
+RULES_PROCESSING_SECONDS = metrics.histogram(
+    "cpq_rules_processing_seconds",
+    "Time spent in process_rules, matching and handler execution, by rule type",
+    ["rule_type"],
+)
+RULES_MATCHED = metrics.counter(
+    "cpq_rules_matched_total", "Rules whose conditions matched, by rule type", ["rule_type"]
+)
+RULE_HITS = metrics.counter(
+    "cpq_rule_hits_total", "Times each rule matched", ["rule_type", "rule_id"]
+)
+PRICE_MATRIX_LOOKUPS = metrics.counter(
+    "cpq_price_matrix_lookups_total",
+    "Price matrix lookups; misses fall back to the rules engine",
+    ["result"],
+)
+QUOTE_WRITE_SECONDS = metrics.histogram(
+    "cpq_quote_write_seconds",
+    "Time from submitting a quote to it being written to storage",
+    ["backend"],
+)
@@ -1,8 +1,8 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import Final, Literal
+from typing import Final, Literal, Optional
 
-from pydantic import AnyUrl, Field
+from pydantic import AnyUrl, Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from .logger import app_logger
@@ -31,6 +31,162 @@ class Settings(BaseSettings):
         default="INFO", description="Logging level"
     )
     STRUCTURED_LOGGING_ENABLED: bool = Field(default=False, description="Use JSON logging format")
+    LOG_QUEUE_ENABLED: bool = Field(
+        default=False,
+        description="Render and write log records on a background thread instead of inline",
+    )
+    LOG_QUEUE_SIZE: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of log records waiting for the background thread",
+    )
+    LOG_QUEUE_DROP_POLICY: Literal["drop_newest", "drop_oldest"] = Field(
+        default="drop_newest",
+        description="Which records are dropped when the log queue is full",
+    )
+    ACCESS_LOG_SAMPLE_RATE: float = Field(
+        default=1.0,
+        ge=0,
+        le=1,
+        description="Fraction of successful, fast requests written to the access log",
+    )
+    ACCESS_LOG_SLOW_REQUEST_MS: float = Field(
+        default=500.0,
+        ge=0,
+        description="Requests at least this slow are always written to the access log (0 disables)",
+    )
+    METRICS_ENABLED: bool = Field(
+        default=True,
+        description="Record rule engine, cache and quote metrics and serve them on /metrics",
+    )
+
+    PRICING_CACHE_SIZE: int = Field(
+        default=4096,
+        ge=0,
+        description="Maximum number of priced configurations to cache (0 disables the cache)",
+    )
+    PRICING_CACHE_TTL_SECONDS: float = Field(
+        default=300.0,
+        ge=0,
+        description="Lifetime of a cached priced configuration (0 keeps entries until evicted)",
+    )
+    OPTIONS_CACHE_SIZE: int = Field(
+        default=4096,
+        ge=0,
+        description="Maximum number of option listings to cache, one per selection (0 disables the cache)",
+    )
+    PRICE_MATRIX_ENABLED: bool = Field(
+        default=True,
+        description="Precompute every fully specified configuration at catalog load (needs numpy)",
+    )
+    PRICE_MATRIX_MAX_CELLS: int = Field(
+        default=2_000_000,
+        ge=1,
+        description="Largest option space, in configurations, the price matrix is built for",
+    )
+    CONFIGURE_BATCH_MAX_SIZE: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum number of configurations priced by one batch request",
+    )
+
+    QUOTE_STORAGE_BACKEND: Literal["jsonl", "sqlite"] = Field(
+        default="jsonl",
+        description="Quote storage backend: segmented JSONL log or embedded SQLite (WAL)",
+    )
+    QUOTES_FILE_PATH: Optional[Path] = Field(
+        default=None,
+        description="Location of the quotes log (defaults to the bundled data store)",
+    )
+    QUOTES_DATABASE_PATH: Optional[Path] = Field(
+        default=None,
+        description="Location of the SQLite quotes database (defaults to the bundled data store)",
+    )
+    QUOTE_DATABASE_BUSY_TIMEOUT_MS: int = Field(
+        default=5000,
+        ge=0,
+        description="How long a SQLite write waits for another writer's lock before failing",
+    )
+    QUOTE_IO_WORKERS: int = Field(
+        default=4,
+        ge=1,
+        description="Threads available for blocking quote storage I/O",
+    )
+    QUOTE_CACHE_SIZE: int = Field(
+        default=1024,
+        ge=0,
+        description="Maximum number of decoded quotes kept in memory for lookups",
+    )
+
+    QUOTE_SEGMENT_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Seal the active quotes file into a segment past this size (0 disables)",
+    )
+    QUOTE_SEGMENT_MAX_AGE_SECONDS: float = Field(
+        default=0,
+        ge=0,
+        description="Seal the active quotes file once its first quote is this old (0 disables)",
+    )
+    QUOTE_BLOOM_FALSE_POSITIVE_RATE: float = Field(
+        default=0.01,
+        gt=0,
+        lt=1,
+        description="Target false positive rate of each sealed segment's bloom filter",
+    )
+
+    QUOTE_WRITER_ENABLED: bool = Field(
+        default=True,
+        description="Persist quotes through the background group-commit writer",
+    )
+    QUOTE_WRITER_BATCH_SIZE: int = Field(
+        default=128,
+        ge=1,
+        description="Maximum number of quotes committed in a single batch",
+    )
+    QUOTE_WRITER_FLUSH_INTERVAL_MS: float = Field(
+        default=2.0,
+        ge=0,
+        description="Longest time a batch waits for more quotes before it is committed",
+    )
+    QUOTE_WRITER_FSYNC: bool = Field(
+        default=False,
+        description="Make every committed batch durable (fsync, or synchronous=FULL for SQLite)",
+    )
+
+    CATALOG_RELOAD_MODE: Literal["disabled", "manual", "watch"] = Field(
+        default="disabled",
+        description="Catalog hot reload: disabled, manual (admin trigger only) or watch (poll store files)",
+    )
+    CATALOG_WATCH_INTERVAL_SECONDS: float = Field(
+        default=2.0,
+        gt=0,
+        description="Interval between catalog file checks in watch mode",
+    )
+    CATALOG_SNAPSHOT_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Keep the validated catalog on disk and restore it while the catalog files are unchanged",
+    )
+    CATALOG_SNAPSHOT_CACHE_DIR: Optional[Path] = Field(
+        default=None,
+        description="Directory for catalog snapshots, written only by this service (defaults to the bundled data store)",
+    )
+    CATALOG_SHARED_MEMORY_ENABLED: bool = Field(
+        default=False,
+        description="Map one compiled catalog file shared by every worker process instead of loading a copy per worker",
+    )
+    CATALOG_SHARED_MEMORY_DIR: Optional[Path] = Field(
+        default=None,
+        description="Directory for the shared catalog file, written only by this service; a tmpfs such as /dev/shm keeps it in memory (defaults to the bundled data store)",
+    )
+    CATALOG_CACHE_CONTROL: str = Field(
+        default="no-cache",
+        description="Cache-Control sent with catalog-derived responses; clients revalidate them by ETag",
+    )
+    ADMIN_API_TOKEN: Optional[SecretStr] = Field(
+        default=None,
+        description="Token required in the X-Admin-Token header for admin routes (unset disables the admin API)",
+    )
 
 
 @lru_cache
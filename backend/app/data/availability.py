@@ -0,0 +1,180 @@
+import copy
+from typing import Any, Mapping, Optional
+
+from .compiler import CompiledRule, compile_rule
+from .indexes import MISSING_CATEGORIES, OPTION_CATEGORY, OPTION_VALUES
+from .models import Option, Rule, RuleContext, SetUnavailableAction
+
+_OPTION_FIELDS = (OPTION_CATEGORY, OPTION_VALUES)
+
+
+class AvailabilityIndex:
+    """Availability rules compiled into per-option and per-value bitsets.
+
+    Each `set_unavailable` rule is one bit. Its option conditions
+    (`option_category`, `option_values`) are resolved against every option
+    at load time, giving each option the set of rules that can hide it;
+    its configuration conditions become, per field, the rules that constrain
+    the field and the rules each value satisfies. An option is unavailable
+    for a configuration when one of its rules is also matched by the
+    configuration, so a whole options listing costs one pass over the
+    constrained fields plus an AND per option.
+
+    Conditions whose values are not lists of strings keep their original
+    semantics by being evaluated as predicates, once per configuration.
+    """
+
+    def __init__(self, rules: list[Rule], options: list[Option]) -> None:
+        # rules are expected in priority order; bit positions follow it
+        self._all = 0
+        self._unconditional = 0
+        self._option_masks: dict[str, int] = {option.id: 0 for option in options}
+        self._option_ids_by_category: dict[str, list[str]] = {}
+        self._category_by_option_id: dict[str, str] = {}
+        for option in options:
+            self._option_ids_by_category.setdefault(option.category_id, []).append(option.id)
+            self._category_by_option_id[option.id] = option.category_id
+        self._required_by_field: dict[str, int] = {}
+        self._satisfied_by_field_value: dict[str, dict[str, int]] = {}
+        self._missing_required = 0
+        self._missing_by_category: dict[str, int] = {}
+        self._residual: list[tuple[int, CompiledRule]] = []
+
+        unavailable_rules = [
+            rule for rule in rules if isinstance(rule.action, SetUnavailableAction)
+        ]
+        for bit, rule in enumerate(unavailable_rules):
+            self._add_rule(1 << bit, rule, options)
+
+    def matching_rules(self, configuration: dict[str, str]) -> int:
+        """Bitset of the rules whose configuration conditions the configuration meets."""
+        matching = self._all
+        for field_name, required in self._required_by_field.items():
+            value = configuration.get(field_name)
+            if value is None:
+                matching &= ~required
+            else:
+                satisfied = self._satisfied_by_field_value[field_name].get(value, 0)
+                matching &= ~required | satisfied
+
+        if self._missing_required:
+            missing = 0
+            for category_id, mask in self._missing_by_category.items():
+                if configuration.get(category_id) is None:
+                    missing |= mask
+            matching &= ~self._missing_required | missing
+
+        if self._residual and matching:
+            context = RuleContext(configuration=configuration)
+            for mask, compiled in self._residual:
+                if matching & mask and not compiled.matches(context):
+                    matching &= ~mask
+        return matching
+
+    def is_available(self, option_id: str, matching_rules: int) -> bool:
+        """Whether an option stays available given `matching_rules(configuration)`."""
+        return not self._option_masks.get(option_id, self._unconditional) & matching_rules
+
+    def option_mask(self, option_id: str) -> int:
+        """Bitset of the rules that can hide an option."""
+        return self._option_masks.get(option_id, self._unconditional)
+
+    def with_option_masks(self, option_masks: Mapping[str, int]) -> "AvailabilityIndex":
+        """A copy reading its per-option bitsets from `option_masks` instead."""
+        index = copy.copy(self)
+        index._option_masks = option_masks
+        return index
+
+    def __getstate__(self) -> dict[str, Any]:
+        # compiled predicates are closures; pickle the rules and recompile.
+        # The option lookups are only needed while rules are being added.
+        state = self.__dict__.copy()
+        state.pop("_option_ids_by_category", None)
+        state.pop("_category_by_option_id", None)
+        state["_residual"] = [(mask, compiled.rule) for mask, compiled in self._residual]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        state["_residual"] = [(mask, compile_rule(rule)) for mask, rule in state["_residual"]]
+        self.__dict__.update(state)
+
+    def _add_rule(self, mask: int, rule: Rule, options: list[Option]) -> None:
+        self._all |= mask
+
+        option_conditions = {
+            field_name: expected_values
+            for field_name, expected_values in rule.conditions.items()
+            if field_name in _OPTION_FIELDS
+        }
+        if option_conditions:
+            for option_id in self._selected_option_ids(rule, option_conditions, options):
+                self._option_masks[option_id] |= mask
+        else:
+            self._unconditional |= mask
+            for option_id in self._option_masks:
+                self._option_masks[option_id] |= mask
+
+        residual = {}
+        for field_name, expected_values in rule.conditions.items():
+            if field_name in _OPTION_FIELDS:
+                continue
+            values = self._string_values(expected_values)
+            if values is None:
+                residual[field_name] = expected_values
+            elif field_name == MISSING_CATEGORIES:
+                self._missing_required |= mask
+                for category_id in values:
+                    self._missing_by_category[category_id] = (
+                        self._missing_by_category.get(category_id, 0) | mask
+                    )
+            else:
+                self._required_by_field[field_name] = (
+                    self._required_by_field.get(field_name, 0) | mask
+                )
+                satisfied = self._satisfied_by_field_value.setdefault(field_name, {})
+                for value in values:
+                    satisfied[value] = satisfied.get(value, 0) | mask
+
+        if residual:
+            compiled = compile_rule(rule.model_copy(update={"conditions": residual}))
+            self._residual.append((mask, compiled))
+
+    def _selected_option_ids(
+        self, rule: Rule, option_conditions: dict[str, Any], options: list[Option]
+    ) -> list[str]:
+        """Ids of the options a rule's option conditions select.
+
+        Lists of ids resolve through the category and option lookups, so
+        building the index costs the size of each rule's conditions rather
+        than one predicate call per option.
+        """
+        resolved = {
+            field_name: self._string_values(expected_values)
+            for field_name, expected_values in option_conditions.items()
+        }
+        if None in resolved.values():
+            matches = compile_rule(rule.model_copy(update={"conditions": option_conditions})).matches
+            return [option.id for option in options if matches(RuleContext(current_option=option))]
+
+        category_ids = resolved.get(OPTION_CATEGORY)
+        option_ids = resolved.get(OPTION_VALUES)
+        if option_ids is None:
+            return [
+                option_id
+                for category_id in category_ids
+                for option_id in self._option_ids_by_category.get(category_id, ())
+            ]
+        return [
+            option_id
+            for option_id in option_ids
+            if option_id in self._category_by_option_id
+            and (category_ids is None or self._category_by_option_id[option_id] in category_ids)
+        ]
+
+    @staticmethod
+    def _string_values(expected_values: Any) -> Optional[set[str]]:
+        if not isinstance(expected_values, (list, tuple, set, frozenset)):
+            return None
+        if not all(isinstance(value, str) for value in expected_values):
+            return None
+        return set(expected_values)
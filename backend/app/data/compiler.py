@@ -0,0 +1,102 @@
+from typing import Any, Callable, Collection, NamedTuple
+
+from .indexes import MISSING_CATEGORIES, OPTION_CATEGORY, OPTION_VALUES
+from .models import Rule, RuleContext
+
+Predicate = Callable[[RuleContext], bool]
+
+
+class CompiledRule(NamedTuple):
+    """A rule paired with a prebuilt predicate over its conditions."""
+
+    rule: Rule
+    matches: Predicate
+
+
+def compile_rule(rule: Rule) -> CompiledRule:
+    """Compile the rule's conditions into a single predicate."""
+    predicates = [
+        _compile_condition(field_name, expected_values)
+        for field_name, expected_values in rule.conditions.items()
+    ]
+    return CompiledRule(rule=rule, matches=_conjunction(predicates))
+
+
+def compile_rules(rules: list[Rule]) -> list[CompiledRule]:
+    return [compile_rule(rule) for rule in rules]
+
+
+def _always(_: RuleContext) -> bool:
+    return True
+
+
+def _conjunction(predicates: list[Predicate]) -> Predicate:
+    if not predicates:
+        return _always
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+
+        def _both(context: RuleContext) -> bool:
+            return first(context) and second(context)
+
+        return _both
+
+    chain = tuple(predicates)
+
+    def _all(context: RuleContext) -> bool:
+        for predicate in chain:
+            if not predicate(context):
+                return False
+        return True
+
+    return _all
+
+
+def _compile_condition(field_name: str, expected_values: Any) -> Predicate:
+    values = _freeze(expected_values)
+
+    if field_name == MISSING_CATEGORIES:
+        categories = tuple(values)
+
+        def _missing_categories(context: RuleContext) -> bool:
+            configuration = context.configuration
+            for category in categories:
+                if configuration.get(category) is None:
+                    return True
+            return False
+
+        return _missing_categories
+
+    if field_name == OPTION_CATEGORY:
+
+        def _option_category(context: RuleContext) -> bool:
+            option = context.current_option
+            return option is not None and option.category_id in values
+
+        return _option_category
+
+    if field_name == OPTION_VALUES:
+
+        def _option_values(context: RuleContext) -> bool:
+            option = context.current_option
+            return option is not None and option.id in values
+
+        return _option_values
+
+    def _field(context: RuleContext) -> bool:
+        current_value = context.configuration.get(field_name)
+        return current_value is not None and current_value in values
+
+    return _field
+
+
+def _freeze(expected_values: Any) -> Collection:
+    """Turn list values into a frozenset; anything else keeps its `in` semantics."""
+    if isinstance(expected_values, (list, tuple, set, frozenset)):
+        try:
+            return frozenset(expected_values)
+        except TypeError:
+            return expected_values
+    return expected_values
@@ -0,0 +1,106 @@
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from .models import RuleContext
+
+if TYPE_CHECKING:
+    from .compiler import CompiledRule
+
+MISSING_CATEGORIES = "missing_categories"
+OPTION_CATEGORY = "option_category"
+OPTION_VALUES = "option_values"
+
+
+class RuleConditionIndex:
+    """Inverted index from condition values to the rules that could match them.
+
+    Every rule is indexed under a single anchor condition: a rule can only
+    match a context that satisfies its anchor, so the union of the buckets
+    hit by a context is a superset of the matching rules. Candidates still
+    have to be checked against their full conditions by the caller.
+    """
+
+    def __init__(self, rules: list["CompiledRule"]) -> None:
+        # rules are expected in priority order; positions preserve that order
+        self._rules = rules
+        self._always: list[int] = []
+        self._unindexed: list[int] = []
+        self._by_field_value: dict[tuple[str, str], list[int]] = {}
+        self._by_option_category: dict[str, list[int]] = {}
+        self._by_option_value: dict[str, list[int]] = {}
+
+        for position, rule in enumerate(rules):
+            self._add_rule(position, rule)
+
+    def candidates(self, context: RuleContext) -> list["CompiledRule"]:
+        """Return rules that could match the context, in priority order."""
+        positions = set(self._always)
+        positions.update(self._unindexed)
+
+        for item in context.configuration.items():
+            positions.update(self._by_field_value.get(item, ()))
+
+        option = context.current_option
+        if option is not None:
+            positions.update(self._by_option_category.get(option.category_id, ()))
+            positions.update(self._by_option_value.get(option.id, ()))
+
+        return [self._rules[position] for position in sorted(positions)]
+
+    def unkeyed_positions(self) -> list[int]:
+        """Positions of the rules every context is a candidate for."""
+        return sorted(self._always + self._unindexed)
+
+    def buckets(self) -> Iterator[tuple[tuple[str, ...], list[int]]]:
+        """Every keyed bucket with its rule positions.
+
+        Keys are `("field", field_name, value)` for configuration values and
+        `(OPTION_CATEGORY, category_id)` or `(OPTION_VALUES, option_id)` for
+        the current option.
+        """
+        for (field_name, value), positions in self._by_field_value.items():
+            yield ("field", field_name, value), positions
+        for category_id, positions in self._by_option_category.items():
+            yield (OPTION_CATEGORY, category_id), positions
+        for option_id, positions in self._by_option_value.items():
+            yield (OPTION_VALUES, option_id), positions
+
+    def _add_rule(self, position: int, compiled: "CompiledRule") -> None:
+        conditions = compiled.rule.conditions
+        if not conditions:
+            self._always.append(position)
+            return
+
+        anchor = self._select_anchor(conditions)
+        if anchor is None:
+            self._unindexed.append(position)
+            return
+
+        field_name, expected_values = anchor
+        for value in set(expected_values):
+            if field_name == OPTION_CATEGORY:
+                bucket = self._by_option_category.setdefault(value, [])
+            elif field_name == OPTION_VALUES:
+                bucket = self._by_option_value.setdefault(value, [])
+            else:
+                bucket = self._by_field_value.setdefault((field_name, value), [])
+            bucket.append(position)
+
+    @staticmethod
+    def _select_anchor(conditions: dict[str, Any]) -> tuple[str, Iterable] | None:
+        """Pick the most selective condition the index can key on.
+
+        `missing_categories` matches on absence and cannot be keyed, and
+        non-list values keep their original `in` semantics only under full
+        evaluation, so both are left out.
+        """
+        anchor = None
+        for field_name, expected_values in conditions.items():
+            if field_name == MISSING_CATEGORIES:
+                continue
+            if not isinstance(expected_values, (list, tuple, set, frozenset)):
+                continue
+            if not all(isinstance(value, str) for value in expected_values):
+                continue
+            if anchor is None or len(expected_values) < len(anchor[1]):
+                anchor = (field_name, expected_values)
+        return anchor
@@ -1,23 +1,68 @@
+from .actions import (
+    AddErrorAction,
+    PercentageDiscountAction,
+    RuleAction,
+    SetBasePriceAction,
+    SetUnavailableAction,
+    UnknownAction,
+)
+from .catalog import CacheStatus, CatalogStatus
 from .data_store import Category, Option, Rule, RuleContext, Setting
+from .explain import (
+    ConfigurationExplanation,
+    ExplainedServerConfiguration,
+    ExplainedServerOptions,
+    OptionAvailabilityTrace,
+    OptionsExplanation,
+    PriceStep,
+    RuleCheck,
+    RuleTypeTrace,
+)
 from .quote import (
     Quote,
+    QuotePage,
     QuoteRequest,
     QuoteResponse,
+    QuoteStorageMaintenance,
+    QuoteWriterStats,
 )
 from .server import (
+    ServerConfigurationBatchItem,
+    ServerConfigurationBatchRequest,
     ServerConfigurationResponse,
     ServerOption,
 )
 
 __all__ = [
+    "AddErrorAction",
+    "CacheStatus",
+    "CatalogStatus",
     "Category",
+    "ConfigurationExplanation",
+    "ExplainedServerConfiguration",
+    "ExplainedServerOptions",
     "Option",
+    "OptionAvailabilityTrace",
+    "OptionsExplanation",
+    "PercentageDiscountAction",
+    "PriceStep",
     "Quote",
+    "QuotePage",
     "QuoteRequest",
     "QuoteResponse",
+    "QuoteStorageMaintenance",
+    "QuoteWriterStats",
     "Rule",
+    "RuleAction",
+    "RuleCheck",
     "RuleContext",
+    "RuleTypeTrace",
+    "SetBasePriceAction",
+    "SetUnavailableAction",
     "Setting",
+    "ServerConfigurationBatchItem",
+    "ServerConfigurationBatchRequest",
     "ServerConfigurationResponse",
-    "ServerOption"
+    "ServerOption",
+    "UnknownAction"
 ]
@@ -0,0 +1,80 @@
+from decimal import Decimal
+from typing import Annotated, Any, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Discriminator, PrivateAttr, Tag, TypeAdapter
+
+
+class SetBasePriceAction(BaseModel):
+
+    model_config = ConfigDict(frozen=True)
+
+    type: Literal["set_base_price"]
+    amount: Decimal = Decimal("0.00")
+
+
+class SetUnavailableAction(BaseModel):
+
+    model_config = ConfigDict(frozen=True)
+
+    type: Literal["set_unavailable"]
+    reason: Optional[str] = None
+
+
+class AddErrorAction(BaseModel):
+
+    model_config = ConfigDict(frozen=True)
+
+    type: Literal["add_error"]
+    message: str = "Validation error"
+
+
+class PercentageDiscountAction(BaseModel):
+
+    model_config = ConfigDict(frozen=True)
+
+    type: Literal["percentage_discount"]
+    category: Optional[str] = None
+    percentage: Decimal = Decimal("0")
+    description: str = ""
+
+    _rate: Decimal = PrivateAttr()
+
+    def model_post_init(self, _: Any) -> None:
+        # the fraction applied to option prices, computed once per catalog load
+        self._rate = self.percentage / 100
+
+    @property
+    def rate(self) -> Decimal:
+        return self._rate
+
+
+class UnknownAction(BaseModel):
+    """An action type no handler acts on; kept so such rules still load."""
+
+    model_config = ConfigDict(frozen=True, extra="allow")
+
+    type: Optional[str] = None
+
+
+_KNOWN_ACTION_TYPES = frozenset(
+    {"set_base_price", "set_unavailable", "add_error", "percentage_discount"}
+)
+
+
+def _action_tag(value: Any) -> str:
+    action_type = value.get("type") if isinstance(value, dict) else getattr(value, "type", None)
+    return action_type if action_type in _KNOWN_ACTION_TYPES else "unknown"
+
+
+RuleAction = Annotated[
+    Union[
+        Annotated[SetBasePriceAction, Tag("set_base_price")],
+        Annotated[SetUnavailableAction, Tag("set_unavailable")],
+        Annotated[AddErrorAction, Tag("add_error")],
+        Annotated[PercentageDiscountAction, Tag("percentage_discount")],
+        Annotated[UnknownAction, Tag("unknown")],
+    ],
+    Discriminator(_action_tag),
+]
+
+rule_action_adapter: TypeAdapter[RuleAction] = TypeAdapter(RuleAction)
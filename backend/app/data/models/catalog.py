@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CatalogStatus(BaseModel):
+
+    version: int
+    loaded_at: datetime
+    # time to load the current catalog, and whether it came from the snapshot
+    # cache (None when the cache is disabled)
+    load_ms: Optional[float] = None
+    snapshot_cache_hit: Optional[bool] = None
+    reload_mode: str
+    reload_count: int = 0
+    failed_reloads: int = 0
+    last_reload_latency_ms: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class CacheStatus(BaseModel):
+
+    generation: Optional[int] = None
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+    max_size: int
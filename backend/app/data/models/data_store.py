@@ -1,7 +1,9 @@
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .actions import RuleAction, rule_action_adapter
 
 
 class Category(BaseModel):
@@ -33,6 +35,17 @@ class Rule(BaseModel):
     priority: int
     active: bool
 
+    _action: RuleAction = PrivateAttr()
+
+    def model_post_init(self, _: Any) -> None:
+        # validated once on load, so handlers never re-parse `actions`
+        self._action = rule_action_adapter.validate_python(self.actions)
+
+    @property
+    def action(self) -> RuleAction:
+        """`actions` as a typed, immutable action object."""
+        return self._action
+
 
 class Setting(BaseModel):
 
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+from .server import ServerConfigurationResponse, ServerOption
+
+
+class RuleCheck(BaseModel):
+
+    rule_id: str
+    matched: bool
+
+
+class RuleTypeTrace(BaseModel):
+    """One `process_rules` call: the rules checked, in priority order, and the outcome."""
+
+    rule_type: str
+    active_rules: int
+    checked: list[RuleCheck]
+    matched: list[str]
+    condition_time_ms: float
+    handler_time_ms: float
+
+
+class PriceStep(BaseModel):
+
+    kind: Literal["base_price", "option", "discount"]
+    source: str
+    amount: Decimal
+    subtotal: Decimal
+
+
+class ConfigurationExplanation(BaseModel):
+
+    rules: list[RuleTypeTrace]
+    price_steps: list[PriceStep]
+    # whether the normal path would have priced it from the price matrix
+    price_matrix_hit: Optional[bool] = None
+    total_time_ms: float
+
+
+class ExplainedServerConfiguration(BaseModel):
+
+    configuration: Optional[ServerConfigurationResponse] = None
+    error: Optional[str] = None
+    explain: ConfigurationExplanation
+
+
+class OptionAvailabilityTrace(BaseModel):
+
+    option_id: str
+    available: bool
+    trace: RuleTypeTrace
+
+
+class OptionsExplanation(BaseModel):
+
+    availability: list[OptionAvailabilityTrace]
+    # whether the normal path would have used the availability index instead
+    availability_index: bool
+    total_time_ms: float
+
+
+class ExplainedServerOptions(BaseModel):
+
+    options: dict[str, list[ServerOption]]
+    explain: OptionsExplanation
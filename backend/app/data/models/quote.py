@@ -26,3 +26,23 @@ class QuoteResponse(BaseModel):
     id: str
     total_price: Decimal
     created_at: datetime
+
+class QuotePage(BaseModel):
+    items: list[Quote]
+    next_cursor: Optional[str] = None
+
+class QuoteWriterStats(BaseModel):
+    batches: int
+    records: int
+    pending: int
+    average_batch_size: float
+    max_batch_size: int
+    average_commit_latency_ms: float
+    max_commit_latency_ms: float
+    fsync: bool
+
+class QuoteStorageMaintenance(BaseModel):
+    backend: str
+    removed_segments: int
+    segments: int
+    quotes: int
@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,3 +19,22 @@ class ServerConfigurationResponse(BaseModel):
     total_discount: Optional[Decimal] = None
     discount_descriptions: list[str] = []
     is_valid: bool = True
+
+
+class PricedConfiguration(NamedTuple):
+    """Outcome of pricing a configuration: a response or a validation error."""
+
+    response: Optional[ServerConfigurationResponse]
+    error: Optional[str]
+
+
+class ServerConfigurationBatchRequest(BaseModel):
+
+    configurations: list[dict[str, str]] = Field(min_length=1)
+
+
+class ServerConfigurationBatchItem(BaseModel):
+
+    index: int
+    configuration: Optional[ServerConfigurationResponse] = None
+    error: Optional[str] = None
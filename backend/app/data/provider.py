@@ -1,10 +1,34 @@
-import json
+import gc
+import hashlib
+import re
+import threading
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator, Optional
+
+from pydantic import TypeAdapter, ValidationError
 
 from ..core.logger import app_logger
-from ..data.models import Category, Option, Rule, Setting
+from ..core.settings import settings
+from ..data.models import (
+    Category,
+    Option,
+    Rule,
+    RuleContext,
+    SetBasePriceAction,
+    Setting,
+)
 from ..data.utilities import data_file
+from .availability import AvailabilityIndex
+from .compiler import CompiledRule, compile_rules
+from .indexes import RuleConditionIndex
+from .shared_catalog import SharedCatalog, SharedOptions, open_shared_catalog
+from .snapshot_cache import CachedCatalog, CatalogSnapshotCache
 
 
 class DataProvider:
@@ -16,15 +40,54 @@ class DataProvider:
         options_file: Path,
         rules_file: Path,
         settings_file: Path,
+        version: int = 1,
+        snapshot_cache: Optional[CatalogSnapshotCache] = None,
     ) -> None:
-        self.categories = self._load_categories(categories_file)
-        self.options = self._load_options(options_file)
-        self.rules = self._load_rules(rules_file)
-        self.settings = self._load_settings(settings_file)
-
-        self._build_indexes()
-
-        self._validate_data()
+        start_time = time.perf_counter()
+        self.version = version
+        self.loaded_at = datetime.now()
+
+        # loading allocates a great many objects and frees almost none, so
+        # cyclic collections during it only rescan what was just built
+        with _gc_paused():
+            # each file is read once; the snapshot key and the parse share the bytes
+            contents = [
+                self._read_file(categories_file, "categories"),
+                self._read_file(options_file, "options"),
+                self._read_file(rules_file, "rules"),
+                self._read_file(settings_file, "settings"),
+            ]
+            cache_key = snapshot_cache.key(contents) if snapshot_cache is not None else None
+            cached = snapshot_cache.load(cache_key) if snapshot_cache is not None else None
+
+            if cached is not None:
+                self.categories = cached.categories
+                self.options = cached.options
+                self.rules = cached.rules
+                self.settings = cached.settings
+
+                self._build_indexes(cached.availability_index)
+
+                self.content_hash = cached.content_hash
+            else:
+                categories_content, options_content, rules_content, settings_content = contents
+                self.categories = self._load_categories(categories_content)
+                self.options = self._load_options(options_content)
+                self.rules = self._load_rules(rules_content)
+                self.settings = self._load_settings(settings_content)
+
+                self._build_indexes()
+
+                self._validate_data()
+
+                self.content_hash = self._content_hash()
+
+                if snapshot_cache is not None:
+                    snapshot_cache.store(cache_key, self._cached_catalog())
+
+        # None when no snapshot cache is in use
+        self.snapshot_cache_hit = cached is not None if snapshot_cache is not None else None
+        self.load_ms = (time.perf_counter() - start_time) * 1000
 
     def get_all_categories(self) -> list[Category]:
         return sorted(self.categories, key=lambda c: c.order)
@@ -34,13 +97,22 @@ class DataProvider:
             opt for opt in self.get_options_by_category(category_id) if opt.available
         ]
 
+    def get_availability_index(self) -> AvailabilityIndex:
+        """Get the availability rules compiled into per-option bitsets."""
+        return self._availability_index
+
     def get_base_price(self) -> Decimal:
         """Get base server price from rules."""
-        pricing_rules = self.get_rules_by_type("pricing")
-        for rule in pricing_rules:
-            if rule.id == "base_pricing":
-                return Decimal(rule.actions.get("amount", "0.00"))
-        return Decimal("0.00")
+        return self._base_price
+
+    def get_candidate_rules(
+        self, rule_type: str, context: RuleContext
+    ) -> list[CompiledRule]:
+        """Get compiled active rules of a type that could match the context, by priority."""
+        index = self._rule_indexes_by_type.get(rule_type)
+        if index is None:
+            return []
+        return index.candidates(context)
 
     def get_option_price(self, option_id: str) -> Decimal:
         """Get option price"""
@@ -56,9 +128,7 @@ class DataProvider:
     def get_rules_by_type(self, rule_type: str) -> list[Rule]:
         return self._active_rules_by_type.get(rule_type, [])
 
-    def _build_indexes(self) -> None:
-
-        self._categories_by_id = {cat.id: cat for cat in self.categories}
+    def _build_indexes(self, availability_index: Optional[AvailabilityIndex] = None) -> None:
 
         self._options_by_id = {opt.id: opt for opt in self.options}
         self._options_by_category: dict[str, list[Option]] = {}
@@ -69,6 +139,25 @@ class DataProvider:
 
         self._prices_by_option_id = {opt.id: opt.price for opt in self.options}
 
+        self._index_rules()
+
+        # compiled predicates and inverted condition index over the
+        # priority-sorted active rules
+        self._rule_indexes_by_type = {
+            rule_type: RuleConditionIndex(compile_rules(rules))
+            for rule_type, rules in self._active_rules_by_type.items()
+        }
+
+        if availability_index is None:
+            availability_index = AvailabilityIndex(
+                self._active_rules_by_type.get("availability", []), self.options
+            )
+        self._availability_index = availability_index
+
+    def _index_rules(self) -> None:
+        """Index categories, rules and settings; everything but options."""
+        self._categories_by_id = {cat.id: cat for cat in self.categories}
+
         self._rules_by_type: dict[str, list[Rule]] = {}
         self._active_rules_by_type: dict[str, list[Rule]] = {}
         for rule in self.rules:
@@ -87,42 +176,80 @@ class DataProvider:
         for rule_type in self._active_rules_by_type:
             self._active_rules_by_type[rule_type].sort(key=lambda r: r.priority)
 
+        self._base_price = Decimal("0.00")
+        for rule in self._active_rules_by_type.get("pricing", []):
+            if rule.id == "base_pricing":
+                if isinstance(rule.action, SetBasePriceAction):
+                    self._base_price = rule.action.amount
+                break
+
         # settings lookup
         self._settings_by_key = {setting.key: setting for setting in self.settings}
 
-    def _load_categories(self, file_path: Path) -> list[Category]:
+    def _content_hash(self) -> str:
+        """SHA-256 over the parsed catalog, stable across reloads of unchanged data."""
+        digest = hashlib.sha256()
+        for items in (self.categories, self.options, self.rules, self.settings):
+            for item in items:
+                digest.update(item.model_dump_json().encode())
+                digest.update(b"\n")
+            # keep an item from shifting into a neighbouring collection
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _cached_catalog(self) -> CachedCatalog:
+        return CachedCatalog(
+            categories=self.categories,
+            options=self.options,
+            rules=self.rules,
+            settings=self.settings,
+            content_hash=self.content_hash,
+            availability_index=self._availability_index,
+        )
+
+    def _load_categories(self, content: bytes) -> list[Category]:
         """Load categories from the pertinent file."""
-        return self._load_jsonl_file(file_path, Category, "categories")
+        return self._load_jsonl_file(content, Category, "categories")
 
     @staticmethod
-    def _load_jsonl_file(file_path: Path, model_class, data_type: str) -> list:
-        items = []
+    def _read_file(file_path: Path, data_type: str) -> bytes:
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                for line in file:
-                    line = line.strip()
-                    if line:
-                        data = json.loads(line)
-
-                        if model_class == Option and "price" in data:
-                            data["price"] = Decimal(data["price"])
-
-                        items.append(model_class.model_validate(data))
+            with open(file_path, "rb") as file:
+                return file.read()
         except FileNotFoundError:
             raise RuntimeError(f"{data_type} file not found: {file_path}")
-        except (json.JSONDecodeError, ValueError) as e:
-            raise RuntimeError(f"Invalid data in {data_type} file: {e}")
 
+    @staticmethod
+    def _load_jsonl_file(content: bytes, model_class, data_type: str) -> list:
+        """Validate every line of a JSONL file in one pass through pydantic-core."""
+        numbered = [
+            (number, line)
+            for number, line in enumerate(content.splitlines(), start=1)
+            if line.strip()
+        ]
+        lines = [line for _, line in numbered]
+        try:
+            items = _list_adapter(model_class).validate_json(b"[" + b",".join(lines) + b"]")
+        except ValidationError as e:
+            raise RuntimeError(
+                f"Invalid data in {data_type} file: {_describe_line_errors(e, numbered)}"
+            )
+        # a line holding several values, or a value spread over several lines,
+        # still parses once joined but changes the item count
+        if len(items) != len(lines):
+            raise RuntimeError(
+                f"Invalid data in {data_type} file: expected one JSON object per line"
+            )
         return items
 
-    def _load_options(self, file_path: Path) -> list[Option]:
-        return self._load_jsonl_file(file_path, Option, "options")
+    def _load_options(self, content: bytes) -> list[Option]:
+        return self._load_jsonl_file(content, Option, "options")
 
-    def _load_rules(self, file_path: Path) -> list[Rule]:
-        return self._load_jsonl_file(file_path, Rule, "rules")
+    def _load_rules(self, content: bytes) -> list[Rule]:
+        return self._load_jsonl_file(content, Rule, "rules")
 
-    def _load_settings(self, file_path: Path) -> list[Setting]:
-        return self._load_jsonl_file(file_path, Setting, "settings")
+    def _load_settings(self, content: bytes) -> list[Setting]:
+        return self._load_jsonl_file(content, Setting, "settings")
 
     def _validate_data(self) -> None:
         errors = []
@@ -144,15 +271,143 @@ class DataProvider:
             raise RuntimeError(f"Data validation failed: {'; '.join(errors)}")
 
 
-def initialize_data_provider() -> DataProvider:
+class SharedDataProvider(DataProvider):
+    """A DataProvider reading options and indexes from a `SharedCatalog`.
+
+    Worker processes mapping the same catalog file share one copy of the
+    options, the option lookups, the availability bitsets and the rule
+    condition buckets; an `Option` is built for each one a lookup returns.
+    Categories, settings and rules are loaded per process, as compiled
+    predicates and rule handlers work on them as objects.
+    """
+
+    def __init__(self, shared_catalog: SharedCatalog, version: int = 1) -> None:
+        start_time = time.perf_counter()
+        self.version = version
+        self.loaded_at = datetime.now()
+        self.shared_catalog = shared_catalog
+
+        with _gc_paused():
+            self.categories = shared_catalog.categories()
+            self.options = SharedOptions(shared_catalog)
+            self.rules = shared_catalog.rules()
+            self.settings = shared_catalog.settings()
+
+            # the builder ran the same stable sort, so rule positions line up
+            self._index_rules()
+            self._rule_indexes_by_type = {
+                rule_type: shared_catalog.rule_index(rule_type, rules)
+                for rule_type, rules in self._active_rules_by_type.items()
+            }
+            self._availability_index = shared_catalog.availability_index()
+
+            self.content_hash = shared_catalog.content_hash
+
+        self.snapshot_cache_hit = None
+        self.load_ms = (time.perf_counter() - start_time) * 1000
+
+    def get_option_price(self, option_id: str) -> Decimal:
+        """Get option price"""
+        price = self.shared_catalog.option_price(option_id)
+        if price is None:
+            raise ValueError(f"Unknown option ID: {option_id}")
+        return price
+
+    def get_options_by_category(self, category_id: str) -> list[Option]:
+        return self.shared_catalog.options_in_category(category_id)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # gc.disable() is process-wide: only pause for loads on the main thread,
+    # i.e. at startup, not for hot reloads built while requests are served
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    enabled = gc.isenabled()
+    gc.disable()
     try:
-        app_logger.debug("Initializing data provider")
-        return DataProvider(
-            categories_file=data_file("categories.jsonl"),
-            options_file=data_file("options.jsonl"),
-            rules_file=data_file("rules.jsonl"),
-            settings_file=data_file("settings.jsonl"),
-        )
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@lru_cache
+def _list_adapter(model_class: type) -> TypeAdapter:
+    return TypeAdapter(list[model_class])
+
+
+_JSON_POSITION = re.compile(r" at line 1 column (\d+)$")
+
+
+def _describe_line_errors(error: ValidationError, numbered: list[tuple[int, bytes]]) -> str:
+    """Report bulk validation errors by file line number instead of array index.
+
+    Field errors locate the item by index, JSON syntax errors by a column in
+    the joined array; `numbered` maps both back to the 1-based source lines.
+    """
+    # offset of each line in `[line,line,...]`
+    starts = []
+    offset = 1
+    for _, line in numbered:
+        starts.append(offset)
+        offset += len(line) + 1
+
+    messages = []
+    for details in error.errors(include_url=False):
+        loc, message = details["loc"], details["msg"]
+        if loc and isinstance(loc[0], int) and loc[0] < len(numbered):
+            field = ".".join(str(part) for part in loc[1:])
+            messages.append(
+                f"line {numbered[loc[0]][0]}: {f'{field}: ' if field else ''}{message}"
+            )
+            continue
+        position = _JSON_POSITION.search(message)
+        if position is not None and numbered:
+            index = max(bisect_right(starts, int(position.group(1)) - 1) - 1, 0)
+            message = f"line {numbered[index][0]}: {message[: position.start()]}"
+        messages.append(message)
+    return "; ".join(messages)
+
+
+def initialize_data_provider(version: int = 1) -> DataProvider:
+    try:
+        app_logger.debug("Initializing data provider", version=version)
+        catalog_files = [
+            data_file("categories.jsonl"),
+            data_file("options.jsonl"),
+            data_file("rules.jsonl"),
+            data_file("settings.jsonl"),
+        ]
+        if settings.CATALOG_SHARED_MEMORY_ENABLED:
+            shared_catalog = open_shared_catalog(
+                settings.CATALOG_SHARED_MEMORY_DIR or data_file("shared"),
+                catalog_files,
+                lambda: DataProvider(*catalog_files, version=version, snapshot_cache=_snapshot_cache()),
+            )
+            data_provider = SharedDataProvider(shared_catalog, version=version)
+        else:
+            data_provider = DataProvider(
+                *catalog_files, version=version, snapshot_cache=_snapshot_cache()
+            )
     except Exception as e:
         app_logger.exception("Failed to initialize DataProvider")
         raise RuntimeError("Failed to initialize DataProvider") from e
+
+    app_logger.info(
+        "Catalog loaded",
+        version=version,
+        load_ms=round(data_provider.load_ms, 3),
+        snapshot_cache_hit=data_provider.snapshot_cache_hit,
+        shared=isinstance(data_provider, SharedDataProvider),
+        options=len(data_provider.options),
+        rules=len(data_provider.rules),
+    )
+    return data_provider
+
+
+def _snapshot_cache() -> Optional[CatalogSnapshotCache]:
+    if not settings.CATALOG_SNAPSHOT_CACHE_ENABLED:
+        return None
+    return CatalogSnapshotCache(settings.CATALOG_SNAPSHOT_CACHE_DIR or data_file("snapshots"))
@@ -0,0 +1,11 @@
+from .base import QuoteRepository
+from .jsonl import JsonlQuoteRepository
+from .sqlite import SqliteQuoteRepository
+from .writer import QuoteWriter
+
+__all__ = [
+    "QuoteRepository",
+    "JsonlQuoteRepository",
+    "SqliteQuoteRepository",
+    "QuoteWriter",
+]
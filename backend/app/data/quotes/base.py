@@ -0,0 +1,116 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from ...core.cache import CacheStats, LRUCache
+from ..models.quote import Quote
+
+
+class QuoteRepository(ABC):
+    """Storage backend for quotes.
+
+    Backends own persistence, id lookups and ordered, resumable listings;
+    decoded quotes are kept in a shared in-memory LRU so hot lookups never
+    reach storage. Listing cursors are opaque strings produced by the backend
+    and decoded with `parse_cursor`.
+    """
+
+    backend: str
+
+    def __init__(self, cache_size: int = 1024) -> None:
+        self._quotes: LRUCache[Quote] = LRUCache(max_size=cache_size)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @property
+    def segment_count(self) -> int:
+        """Number of sealed storage units (files, segments) behind the repository."""
+        return 1
+
+    def cache_stats(self) -> CacheStats:
+        return self._quotes.stats()
+
+    def append(self, quote: Quote) -> None:
+        self.append_many([quote])
+
+    @abstractmethod
+    def append_many(self, quotes: list[Quote], fsync: bool = False) -> None:
+        """Persist quotes as one write, durable on return when `fsync` is set."""
+        pass
+
+    def get_cached(self, quote_id: str) -> Optional[Quote]:
+        """Return a quote only if it is already decoded in memory; never touches storage."""
+        return self._quotes.get(quote_id)
+
+    def get(self, quote_id: str) -> Optional[Quote]:
+        quote = self._quotes.get(quote_id)
+        if quote is not None:
+            return quote
+        return self.fetch(quote_id)
+
+    def fetch(self, quote_id: str) -> Optional[Quote]:
+        """Read a quote from storage, skipping the cache lookup, and cache it."""
+        quote = self._load(quote_id)
+        if quote is not None:
+            self._quotes.put(quote_id, quote)
+        return quote
+
+    @abstractmethod
+    def parse_cursor(self, cursor: Optional[str]) -> Any:
+        """Decode a listing cursor into a backend position; raise ValueError if invalid."""
+        pass
+
+    def iter_quotes(self) -> Iterator[Quote]:
+        """Yield every valid quote in insertion order."""
+        for _, quote in self.iter_records():
+            yield quote
+
+    @abstractmethod
+    def iter_records(
+        self,
+        start: Any = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Iterator[tuple[str, Quote]]:
+        """Yield `(cursor, quote)` pairs in insertion order from a position onwards.
+
+        Only quotes with `created_from <= created_at < created_to` are
+        yielded; both bounds are naive local timestamps. Each cursor resumes
+        the listing right after its quote.
+        """
+        pass
+
+    @abstractmethod
+    def compact(self) -> int:
+        """Reclaim space left by maintenance; returns the number of segments removed."""
+        pass
+
+    @abstractmethod
+    def archive(self, older_than: datetime) -> list[Path]:
+        """Move quotes older than `older_than` out of the live store into gzip archives."""
+        pass
+
+    def close(self) -> None:
+        """Release connections and file handles held by the backend."""
+        pass
+
+    @abstractmethod
+    def _load(self, quote_id: str) -> Optional[Quote]:
+        pass
+
+    def _remember(self, quotes: list[Quote]) -> None:
+        for quote in quotes:
+            self._quotes.put(quote.id, quote)
+
+    @staticmethod
+    def _in_window(
+        quote: Quote, created_from: Optional[datetime], created_to: Optional[datetime]
+    ) -> bool:
+        if created_from is not None and quote.created_at < created_from:
+            return False
+        if created_to is not None and quote.created_at >= created_to:
+            return False
+        return True
@@ -0,0 +1,66 @@
+import hashlib
+import math
+import struct
+from pathlib import Path
+from typing import Iterable
+
+_MAGIC = b"QBLM"
+_HEADER = struct.Struct("<4sIIQ")
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over string keys, persistable as a sidecar file."""
+
+    def __init__(self, bit_count: int, hash_count: int, item_count: int = 0) -> None:
+        self.bit_count = max(8, bit_count)
+        self.hash_count = max(1, hash_count)
+        self.item_count = item_count
+        self._bits = bytearray((self.bit_count + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> "BloomFilter":
+        capacity = max(1, capacity)
+        bit_count = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        hash_count = round(bit_count / capacity * math.log(2))
+        return cls(bit_count, hash_count)
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str], false_positive_rate: float) -> "BloomFilter":
+        keys = list(keys)
+        bloom = cls.for_capacity(len(keys), false_positive_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.item_count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def save(self, path: Path) -> None:
+        header = _HEADER.pack(_MAGIC, self.bit_count, self.hash_count, self.item_count)
+        path.write_bytes(header + bytes(self._bits))
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        data = path.read_bytes()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Truncated bloom filter: {path}")
+        magic, bit_count, hash_count, item_count = _HEADER.unpack_from(data)
+        bloom = cls(bit_count, hash_count, item_count)
+        if magic != _MAGIC or len(data) - _HEADER.size != len(bloom._bits):
+            raise ValueError(f"Invalid bloom filter: {path}")
+        bloom._bits[:] = data[_HEADER.size :]
+        return bloom
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # double hashing: h1 + i * h2 over one 128-bit digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        second |= 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.bit_count
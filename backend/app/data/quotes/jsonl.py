@@ -0,0 +1,600 @@
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from ...core.cache import LRUCache
+from ...core.logger import app_logger
+from ..models.quote import Quote
+from .base import QuoteRepository
+from .bloom import BloomFilter
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+_ID_PREFIX = b'{"id":"'
+
+Offsets = dict[str, tuple[int, int]]
+Position = tuple[int, int]
+
+
+class QuoteSegment:
+    """A sealed, read-only slice of the quote log and its sidecar files.
+
+    `<stem>.<seq>.idx` holds the id -> (offset, length) index and
+    `<stem>.<seq>.bloom` a bloom filter over the ids, so lookups for ids the
+    segment does not contain never touch the segment itself.
+    """
+
+    def __init__(
+        self, seq: int, path: Path, bloom: BloomFilter, signature: tuple[int, int]
+    ) -> None:
+        self.seq = seq
+        self.path = path
+        self.bloom = bloom
+        self.signature = signature
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_suffix(".idx")
+
+    @property
+    def bloom_path(self) -> Path:
+        return self.path.with_suffix(".bloom")
+
+    @property
+    def files(self) -> tuple[Path, Path, Path]:
+        return self.path, self.index_path, self.bloom_path
+
+
+class JsonlQuoteRepository(QuoteRepository):
+    """Segmented, append-only JSONL quote log with indexed lookups.
+
+    New quotes are appended to the active file (`quotes.jsonl`), which is
+    indexed in memory. Once it grows past `segment_max_bytes` or its first
+    record is older than `segment_max_age_seconds`, it is sealed into a
+    numbered segment with sidecar index and bloom filter files, and a fresh
+    active file is started. The active index is extended from the last
+    indexed position after every append and on every lookup miss, and a
+    rotation made by another worker is noticed by the active file's inode
+    changing, so several processes can share one log.
+
+    Listing cursors have the form `<seq>:<offset>`: the segment sequence
+    number (the active file's is the number it will be sealed under) and the
+    byte offset just past the last returned record.
+    """
+
+    backend = "jsonl"
+
+    def __init__(
+        self,
+        file_path: Path,
+        cache_size: int = 1024,
+        segment_max_bytes: int = 0,
+        segment_max_age_seconds: float = 0,
+        bloom_false_positive_rate: float = 0.01,
+        segment_index_cache_size: int = 8,
+    ) -> None:
+        super().__init__(cache_size)
+        self.file_path = file_path
+        self.archive_dir = file_path.parent / "archive"
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age_seconds = segment_max_age_seconds
+        self.bloom_false_positive_rate = bloom_false_positive_rate
+
+        self._segment_pattern = re.compile(
+            rf"^{re.escape(file_path.stem)}\.(\d+){re.escape(file_path.suffix)}$"
+        )
+        self._lock_path = file_path.with_suffix(".lock")
+        self._lock = threading.RLock()
+        self._segments: list[QuoteSegment] = []
+        self._next_seq = 1
+        self._segment_offsets: LRUCache[Offsets] = LRUCache(
+            max_size=segment_index_cache_size
+        )
+        self._offsets: Offsets = {}
+        self._indexed_size = 0
+        self._active_inode: Optional[int] = None
+        self._active_started_at: Optional[datetime] = None
+
+        self._ensure_file_exists()
+        with self._lock:
+            self._refresh_segments()
+            self._index_new_records()
+        app_logger.debug(
+            "Quote log indexed",
+            path=str(file_path),
+            segments=len(self._segments),
+            quotes=len(self),
+        )
+
+    def __len__(self) -> int:
+        sealed = sum(segment.bloom.item_count for segment in self._segments)
+        return sealed + len(self._offsets)
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    def append_many(self, quotes: list[Quote], fsync: bool = False) -> None:
+        """Append quotes with a single write, optionally fsyncing before returning."""
+        data = b"".join(f"{quote.model_dump_json()}\n".encode("utf-8") for quote in quotes)
+        with self._lock:
+            with self._file_lock(exclusive=False):
+                try:
+                    with open(self.file_path, "ab") as file:
+                        file.write(data)
+                        file.flush()
+                        if fsync:
+                            os.fsync(file.fileno())
+                except OSError as e:
+                    raise RuntimeError(f"Failed to save quote: {e}")
+                self._index_new_records()
+
+            if self._should_rotate():
+                self._rotate()
+
+        self._remember(quotes)
+
+    def parse_cursor(self, cursor: Optional[str]) -> Position:
+        """Decode a listing cursor into a `(segment seq, byte offset)` position."""
+        if not cursor:
+            return 0, 0
+        seq, separator, offset = cursor.partition(":")
+        if not separator:
+            # a bare offset predates segmentation and points into the oldest file
+            seq, offset = "", cursor
+        if not offset.isdigit() or (seq and not seq.isdigit()):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if not seq:
+            with self._lock:
+                first_seq = self._segments[0].seq if self._segments else self._next_seq
+            return first_seq, int(offset)
+        return int(seq), int(offset)
+
+    def iter_records(
+        self,
+        start: Optional[Position] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Iterator[tuple[str, Quote]]:
+        """Yield `(cursor, quote)` pairs in log order from a position onwards.
+
+        Each cursor resumes reading right after its quote. Malformed lines and
+        later copies of an id are skipped, and only one line is held in memory
+        at a time.
+        """
+        start_seq, start_offset = start or (0, 0)
+        with self._lock, self._file_lock(exclusive=False):
+            self._index_new_records()
+            sealed = list(self._segments)
+            active_offsets = self._offsets
+            # opened now, under the lock: if the active file is sealed while
+            # earlier segments are read, the handle follows it into its
+            # segment, which keeps this seq, instead of a fresh empty file
+            active_seq = self._next_seq
+            active = None
+            if active_seq >= start_seq:
+                try:
+                    active = open(self.file_path, "rb")
+                except FileNotFoundError:
+                    pass
+
+        try:
+            for position, segment in enumerate(sealed):
+                if segment.seq < start_seq:
+                    continue
+                offset = start_offset if segment.seq == start_seq else 0
+                offsets = self._load_segment_offsets(segment)
+                for next_offset, quote in self._iter_file(segment.path, offset):
+                    if not self._in_window(quote, created_from, created_to):
+                        continue
+                    if self._is_first_write(quote.id, next_offset, offsets, sealed[:position]):
+                        yield f"{segment.seq}:{next_offset}", quote
+
+            if active is not None:
+                offset = start_offset if active_seq == start_seq else 0
+                for next_offset, quote in self._iter_lines(active, offset):
+                    if not self._in_window(quote, created_from, created_to):
+                        continue
+                    if self._is_first_write(quote.id, next_offset, active_offsets, sealed):
+                        yield f"{active_seq}:{next_offset}", quote
+        finally:
+            if active is not None:
+                active.close()
+
+    def compact(self) -> int:
+        """Merge runs of small sealed segments, dropping malformed lines and duplicates.
+
+        Runs are merged up to `segment_max_bytes` (or into a single segment
+        when there is no size limit) and keep the sequence number of their
+        newest member, so cursors into merged segments resume no later than
+        before. Returns the number of segments removed.
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh_segments()
+            limit = self.segment_max_bytes or float("inf")
+
+            runs: list[list[QuoteSegment]] = []
+            run_size = 0
+            for segment in self._segments:
+                size = segment.path.stat().st_size
+                if runs and run_size + size <= limit:
+                    runs[-1].append(segment)
+                    run_size += size
+                else:
+                    runs.append([segment])
+                    run_size = size
+
+            removed = 0
+            for run in runs:
+                if len(run) > 1:
+                    self._merge(run)
+                    removed += len(run) - 1
+
+            self._refresh_segments()
+        app_logger.info("Quote log compacted", removed_segments=removed)
+        return removed
+
+    def archive(self, older_than: datetime) -> list[Path]:
+        """Move sealed segments last written before `older_than` into gzip archives.
+
+        Archived quotes are no longer served by lookups or listings.
+        """
+        cutoff = older_than.timestamp()
+        archived = []
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh_segments()
+            for segment in self._segments:
+                if segment.path.stat().st_mtime >= cutoff:
+                    continue
+                self.archive_dir.mkdir(parents=True, exist_ok=True)
+                destination = self.archive_dir / f"{segment.path.name}.gz"
+                with open(segment.path, "rb") as source, gzip.open(destination, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                for path in segment.files:
+                    path.unlink(missing_ok=True)
+                archived.append(destination)
+
+            self._refresh_segments()
+        if archived:
+            self._quotes.clear()
+        app_logger.info("Quote log archived", archived_segments=len(archived))
+        return archived
+
+    def _load(self, quote_id: str) -> Optional[Quote]:
+        for _ in range(2):
+            location = self._locate(quote_id)
+            if location is None:
+                return None
+            try:
+                quote = self._read_quote(*location)
+            except FileNotFoundError:
+                # the segment was compacted or archived under us; look again
+                with self._lock:
+                    self._refresh_segments()
+                continue
+            return quote
+        return None
+
+    def _locate(self, quote_id: str) -> Optional[tuple[Path, int, int]]:
+        with self._lock:
+            location = self._offsets.get(quote_id)
+            if location is None:
+                self._index_new_records()
+                location = self._offsets.get(quote_id)
+            active = (self.file_path, *location) if location is not None else None
+            segments = list(self._segments)
+
+        # the first write wins, so sealed segments are searched before the active file
+        for segment in segments:
+            if quote_id not in segment.bloom:
+                continue
+            location = self._load_segment_offsets(segment).get(quote_id)
+            if location is not None:
+                return segment.path, *location
+        return active
+
+    def _is_first_write(
+        self, quote_id: str, end: int, offsets: Offsets, earlier: list[QuoteSegment]
+    ) -> bool:
+        """Tell whether the record ending at `end` is the first one written for its id."""
+        location = offsets.get(quote_id)
+        if location is not None and sum(location) != end:
+            return False
+        return not any(
+            quote_id in segment.bloom and quote_id in self._load_segment_offsets(segment)
+            for segment in earlier
+        )
+
+    @staticmethod
+    def _read_quote(path: Path, offset: int, length: int) -> Optional[Quote]:
+        with open(path, "rb") as file:
+            file.seek(offset)
+            line = file.read(length)
+        try:
+            return Quote.model_validate_json(line)
+        except ValueError:
+            return None
+
+    @classmethod
+    def _iter_file(cls, path: Path, start: int) -> Iterator[tuple[int, Quote]]:
+        try:
+            with open(path, "rb") as file:
+                yield from cls._iter_lines(file, start)
+        except FileNotFoundError:
+            return
+
+    @staticmethod
+    def _iter_lines(file: BinaryIO, start: int) -> Iterator[tuple[int, Quote]]:
+        file.seek(start)
+        offset = start
+        for line in file:
+            if not line.strip():
+                offset += len(line)
+                continue
+
+            try:
+                quote = Quote.model_validate_json(line)
+            except ValueError:
+                if not line.endswith(b"\n"):
+                    # a partially written record; stop before it
+                    break
+                offset += len(line)
+                continue
+
+            offset += len(line)
+            yield offset, quote
+
+    def _index_new_records(self) -> None:
+        """Index complete active-file lines written since the last indexed position."""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            # another worker is between sealing and recreating the active file
+            return
+
+        if self._active_inode is not None and (
+            stat.st_ino != self._active_inode or stat.st_size < self._indexed_size
+        ):
+            # the active file was sealed (or replaced) elsewhere
+            self._refresh_segments()
+            self._offsets = {}
+            self._indexed_size = 0
+            self._active_started_at = None
+        self._active_inode = stat.st_ino
+
+        if stat.st_size == self._indexed_size:
+            return
+
+        with open(self.file_path, "rb") as file:
+            file.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # a partially written record; pick it up next time
+                    break
+                if offset == 0:
+                    self._active_started_at = self._extract_created_at(line)
+                quote_id = self._extract_id(line)
+                if quote_id is not None:
+                    self._offsets.setdefault(quote_id, (offset, len(line)))
+                offset += len(line)
+            self._indexed_size = offset
+
+    def _should_rotate(self) -> bool:
+        if self._indexed_size == 0:
+            return False
+        if self.segment_max_bytes and self._indexed_size >= self.segment_max_bytes:
+            return True
+        if self.segment_max_age_seconds and self._active_started_at is not None:
+            age = (datetime.now() - self._active_started_at).total_seconds()
+            return age >= self.segment_max_age_seconds
+        return False
+
+    def _rotate(self) -> None:
+        with self._file_lock(exclusive=True):
+            # another worker may have rotated while we waited for the lock
+            self._index_new_records()
+            if not self._should_rotate():
+                return
+
+            seq = self._next_seq
+            sealed_path = self._segment_path(seq)
+            os.replace(self.file_path, sealed_path)
+            self.file_path.touch()
+
+            segment = self._seal(seq, sealed_path, self._offsets)
+            self._segments.append(segment)
+            self._next_seq = seq + 1
+
+            self._offsets = {}
+            self._indexed_size = 0
+            self._active_inode = os.stat(self.file_path).st_ino
+            self._active_started_at = None
+
+        app_logger.info(
+            "Quote log segment sealed",
+            seq=seq,
+            quotes=segment.bloom.item_count,
+            path=str(sealed_path),
+        )
+
+    def _merge(self, run: list[QuoteSegment]) -> None:
+        target = run[-1]
+        temporary = target.path.with_suffix(".tmp")
+        offsets: Offsets = {}
+        offset = 0
+        with open(temporary, "wb") as output:
+            for segment in run:
+                with open(segment.path, "rb") as source:
+                    for line in source:
+                        if not line.endswith(b"\n"):
+                            line += b"\n"
+                        try:
+                            quote_id = Quote.model_validate_json(line).id
+                        except ValueError:
+                            continue
+                        if quote_id in offsets:
+                            continue
+                        output.write(line)
+                        offsets[quote_id] = (offset, len(line))
+                        offset += len(line)
+            output.flush()
+            os.fsync(output.fileno())
+
+        os.replace(temporary, target.path)
+        self._seal(target.seq, target.path, offsets)
+        for segment in run[:-1]:
+            for path in segment.files:
+                path.unlink(missing_ok=True)
+
+    def _seal(self, seq: int, path: Path, offsets: Offsets) -> QuoteSegment:
+        """Write the sidecar index and bloom filter for a sealed segment."""
+        index_path = path.with_suffix(".idx")
+        temporary = index_path.with_suffix(".idx.tmp")
+        temporary.write_text(json.dumps({"offsets": offsets}), encoding="utf-8")
+        os.replace(temporary, index_path)
+
+        bloom = BloomFilter.from_keys(offsets, self.bloom_false_positive_rate)
+        bloom_path = path.with_suffix(".bloom")
+        temporary = bloom_path.with_suffix(".bloom.tmp")
+        bloom.save(temporary)
+        os.replace(temporary, bloom_path)
+
+        self._segment_offsets.put(seq, offsets)
+        stat = path.stat()
+        return QuoteSegment(seq, path, bloom, (stat.st_ino, stat.st_size))
+
+    def _load_segment(
+        self, seq: int, path: Path, signature: tuple[int, int]
+    ) -> QuoteSegment:
+        try:
+            if not path.with_suffix(".idx").exists():
+                raise FileNotFoundError(path.with_suffix(".idx"))
+            bloom = BloomFilter.load(path.with_suffix(".bloom"))
+            return QuoteSegment(seq, path, bloom, signature)
+        except (FileNotFoundError, ValueError):
+            app_logger.info("Rebuilding quote segment sidecars", path=str(path))
+            return self._seal(seq, path, self._scan_offsets(path))
+
+    def _load_segment_offsets(self, segment: QuoteSegment) -> Offsets:
+        offsets = self._segment_offsets.get(segment.seq)
+        if offsets is not None:
+            return offsets
+        try:
+            data = json.loads(segment.index_path.read_text(encoding="utf-8"))
+            offsets = {
+                quote_id: (location[0], location[1])
+                for quote_id, location in data["offsets"].items()
+            }
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            try:
+                offsets = self._scan_offsets(segment.path)
+            except FileNotFoundError:
+                # compacted or archived under us; not cached, as the seq may live on
+                return {}
+        self._segment_offsets.put(segment.seq, offsets)
+        return offsets
+
+    def _refresh_segments(self) -> None:
+        """Re-read the set of sealed segments from disk."""
+        known = {segment.seq: segment for segment in self._segments}
+        segments = []
+        max_seq = 0
+        for path in self.file_path.parent.iterdir():
+            match = self._segment_pattern.match(path.name)
+            if match is None:
+                continue
+            seq = int(match.group(1))
+            max_seq = max(max_seq, seq)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_ino, stat.st_size)
+            segment = known.get(seq)
+            if segment is None or segment.signature != signature:
+                self._segment_offsets.discard(seq)
+                segment = self._load_segment(seq, path, signature)
+            segments.append(segment)
+
+        if self.archive_dir.is_dir():
+            for path in self.archive_dir.iterdir():
+                match = self._segment_pattern.match(path.name.removesuffix(".gz"))
+                if match is not None:
+                    max_seq = max(max_seq, int(match.group(1)))
+
+        self._segments = sorted(segments, key=lambda segment: segment.seq)
+        self._next_seq = max_seq + 1
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.file_path.with_name(
+            f"{self.file_path.stem}.{seq:06d}{self.file_path.suffix}"
+        )
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        """Coordinate appends (shared) with rotation and maintenance (exclusive)."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a+b") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @classmethod
+    def _scan_offsets(cls, path: Path) -> Offsets:
+        offsets: Offsets = {}
+        with open(path, "rb") as file:
+            offset = 0
+            for line in file:
+                quote_id = cls._extract_id(line)
+                if quote_id is not None:
+                    offsets.setdefault(quote_id, (offset, len(line)))
+                offset += len(line)
+        return offsets
+
+    @staticmethod
+    def _extract_id(line: bytes) -> Optional[str]:
+        # fast path for records written by `append`, which always lead with the id
+        if line.startswith(_ID_PREFIX):
+            end = line.find(b'"', len(_ID_PREFIX))
+            if end != -1:
+                return line[len(_ID_PREFIX) : end].decode("utf-8")
+
+        stripped = line.strip()
+        if not stripped:
+            return None
+        try:
+            quote_id = json.loads(stripped).get("id")
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            return None
+        return quote_id if isinstance(quote_id, str) else None
+
+    @staticmethod
+    def _extract_created_at(line: bytes) -> datetime:
+        try:
+            parsed = datetime.fromisoformat(json.loads(line).get("created_at"))
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError, TypeError, ValueError):
+            return datetime.now()
+        return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+    def _ensure_file_exists(self) -> None:
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            if not self.file_path.exists():
+                self.file_path.touch()
+        except IOError as e:
+            raise RuntimeError(f"Failed to initialize quotes file: {e}")
@@ -0,0 +1,242 @@
+import gzip
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ...core.logger import app_logger
+from ..models.quote import Quote
+from .base import QuoteRepository
+
+# fixed-width, so timestamps compare correctly as text
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS quotes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        contact_email TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        data TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_quotes_contact_email ON quotes (contact_email)",
+    "CREATE INDEX IF NOT EXISTS ix_quotes_created_at ON quotes (created_at)",
+)
+
+_INSERT = (
+    "INSERT OR IGNORE INTO quotes (id, contact_email, created_at, data) "
+    "VALUES (?, ?, ?, ?)"
+)
+_SELECT_BY_ID = "SELECT data FROM quotes WHERE id = ?"
+_COUNT = "SELECT COUNT(*) FROM quotes"
+_COUNT_OLDER_THAN = "SELECT COUNT(*) FROM quotes WHERE created_at < ?"
+_SELECT_OLDER_THAN = "SELECT data FROM quotes WHERE created_at < ? ORDER BY seq"
+_DELETE_OLDER_THAN = "DELETE FROM quotes WHERE created_at < ?"
+
+
+class SqliteQuoteRepository(QuoteRepository):
+    """Quote store backed by an embedded SQLite database in WAL mode.
+
+    Each thread gets its own connection; WAL lets readers proceed while a
+    writer commits, and `busy_timeout` serializes writers across worker
+    processes. Statements are fixed strings, so sqlite3's per-connection
+    statement cache prepares each of them once. `id` is unique (first write
+    wins, as in the JSONL log), and `contact_email` and `created_at` are
+    indexed; `created_at` filters run in SQL.
+
+    Listing cursors are the `seq` rowid of the last returned quote.
+    """
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        file_path: Path,
+        cache_size: int = 1024,
+        busy_timeout_ms: int = 5000,
+        page_size: int = 256,
+    ) -> None:
+        super().__init__(cache_size)
+        self.file_path = file_path
+        self.archive_dir = file_path.parent / "archive"
+        self.busy_timeout_ms = busy_timeout_ms
+        self.page_size = page_size
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = self._connection()
+            with self._transaction(connection):
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+        except (OSError, sqlite3.Error) as e:
+            raise RuntimeError(f"Failed to initialize quotes database: {e}")
+        app_logger.debug("Quote database opened", path=str(file_path), quotes=len(self))
+
+    def __len__(self) -> int:
+        return self._connection().execute(_COUNT).fetchone()[0]
+
+    def append_many(self, quotes: list[Quote], fsync: bool = False) -> None:
+        """Insert quotes in one transaction; `fsync` commits with `synchronous=FULL`."""
+        rows = [
+            (
+                quote.id,
+                quote.contact_email,
+                self._timestamp(quote.created_at),
+                quote.model_dump_json(),
+            )
+            for quote in quotes
+        ]
+        connection = self._connection()
+        try:
+            self._set_synchronous(connection, full=fsync)
+            with self._transaction(connection):
+                connection.executemany(_INSERT, rows)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save quote: {e}")
+        self._remember(quotes)
+
+    def parse_cursor(self, cursor: Optional[str]) -> int:
+        if not cursor:
+            return 0
+        if not cursor.isdigit():
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return int(cursor)
+
+    def iter_records(
+        self,
+        start: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Iterator[tuple[str, Quote]]:
+        """Yield `(cursor, quote)` pairs in insertion order after rowid `start`.
+
+        Rows are fetched in pages of `page_size`, each its own short read, so
+        a slow consumer never pins a WAL snapshot.
+        """
+        query = "SELECT seq, data FROM quotes WHERE seq > ?"
+        bounds: list[str] = []
+        if created_from is not None:
+            query += " AND created_at >= ?"
+            bounds.append(self._timestamp(created_from))
+        if created_to is not None:
+            query += " AND created_at < ?"
+            bounds.append(self._timestamp(created_to))
+        query += " ORDER BY seq LIMIT ?"
+
+        last_seq = start or 0
+        while True:
+            rows = (
+                self._connection()
+                .execute(query, (last_seq, *bounds, self.page_size))
+                .fetchall()
+            )
+            for seq, data in rows:
+                last_seq = seq
+                try:
+                    quote = Quote.model_validate_json(data)
+                except ValueError:
+                    continue
+                yield str(seq), quote
+            if len(rows) < self.page_size:
+                return
+
+    def compact(self) -> int:
+        """Checkpoint and truncate the WAL, then rebuild the database file."""
+        connection = self._connection()
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("VACUUM")
+        app_logger.info("Quote database compacted", path=str(self.file_path))
+        return 0
+
+    def archive(self, older_than: datetime) -> list[Path]:
+        """Move quotes created before `older_than` into one gzip JSONL archive.
+
+        Archived quotes are no longer served by lookups or listings.
+        """
+        cutoff = self._timestamp(older_than)
+        destination = self.archive_dir / (
+            f"{self.file_path.stem}-{datetime.now():%Y%m%d%H%M%S%f}.jsonl.gz"
+        )
+        connection = self._connection()
+        with self._transaction(connection):
+            archived = connection.execute(_COUNT_OLDER_THAN, (cutoff,)).fetchone()[0]
+            if archived:
+                self.archive_dir.mkdir(parents=True, exist_ok=True)
+                try:
+                    with gzip.open(destination, "wt", encoding="utf-8") as target:
+                        for (data,) in connection.execute(_SELECT_OLDER_THAN, (cutoff,)):
+                            target.write(f"{data}\n")
+                except OSError as e:
+                    destination.unlink(missing_ok=True)
+                    raise RuntimeError(f"Failed to archive quotes: {e}")
+                connection.execute(_DELETE_OLDER_THAN, (cutoff,))
+
+        if archived:
+            self._quotes.clear()
+        app_logger.info("Quote database archived", archived_quotes=archived)
+        return [destination] if archived else []
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _load(self, quote_id: str) -> Optional[Quote]:
+        row = self._connection().execute(_SELECT_BY_ID, (quote_id,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return Quote.model_validate_json(row[0])
+        except ValueError:
+            return None
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+
+        # autocommit mode; writes open their own transactions
+        connection = sqlite3.connect(
+            self.file_path, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        self._local.connection = connection
+        self._local.full_sync = False
+        with self._connections_lock:
+            self._connections.append(connection)
+        return connection
+
+    def _set_synchronous(self, connection: sqlite3.Connection, full: bool) -> None:
+        if self._local.full_sync != full:
+            connection.execute(f"PRAGMA synchronous = {'FULL' if full else 'NORMAL'}")
+            self._local.full_sync = full
+
+    @staticmethod
+    @contextmanager
+    def _transaction(connection: sqlite3.Connection) -> Iterator[None]:
+        # IMMEDIATE takes the write lock up front instead of upgrading mid-way
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @staticmethod
+    def _timestamp(value: datetime) -> str:
+        # quotes store naive local timestamps; align aware values with them
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value.strftime(_TIMESTAMP_FORMAT)
@@ -0,0 +1,210 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import NamedTuple, Optional
+
+from ...core.logger import app_logger
+from ..models.quote import Quote, QuoteWriterStats
+from .base import QuoteRepository
+
+
+class _PendingQuote(NamedTuple):
+
+    quote: Quote
+    future: Future
+    enqueued_at: float
+
+
+class QuoteWriter:
+    """Background group-commit writer in front of a quote repository.
+
+    Submitted quotes are queued and written by a single thread in batches:
+    a batch is committed once it holds `batch_size` quotes or once
+    `flush_interval_ms` has passed since its first quote arrived. A quote's
+    future resolves only after its whole batch is written (and fsynced, when
+    enabled), so callers can acknowledge a quote as soon as it is durable.
+    Quotes whose future was cancelled before their batch started are skipped.
+    """
+
+    def __init__(
+        self,
+        repository: QuoteRepository,
+        batch_size: int = 128,
+        flush_interval_ms: float = 2.0,
+        fsync: bool = False,
+    ) -> None:
+        self.repository = repository
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000
+        self.fsync = fsync
+        self._queue: queue.Queue[Optional[_PendingQuote]] = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="quote-writer", daemon=True
+        )
+        self._running = False
+        self._state_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._records = 0
+        self._max_batch_size = 0
+        self._total_commit_latency = 0.0
+        self._max_commit_latency = 0.0
+
+    def start(self) -> None:
+        self._running = True
+        self._thread.start()
+        app_logger.debug(
+            "Quote writer started",
+            batch_size=self.batch_size,
+            flush_interval_ms=self.flush_interval * 1000,
+            fsync=self.fsync,
+        )
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Commit everything already queued, then stop the writer thread.
+
+        Returns False if the thread did not finish within `timeout`; quotes
+        still queued at that point are failed rather than left pending.
+        """
+        with self._state_lock:
+            if not self._running:
+                return not self._thread.is_alive()
+            self._running = False
+            self._queue.put(None)
+        self._thread.join(timeout)
+
+        stopped = not self._thread.is_alive()
+        if not stopped:
+            app_logger.warning("Quote writer did not stop in time", timeout=timeout)
+        self._fail_queued(RuntimeError("Failed to save quote: quote writer stopped"))
+        return stopped
+
+    def submit(self, quote: Quote) -> Future:
+        """Queue a quote; the returned future resolves once it is durable."""
+        future: Future = Future()
+        with self._state_lock:
+            if not self._running:
+                raise RuntimeError("Failed to save quote: quote writer is not running")
+            self._queue.put(_PendingQuote(quote, future, time.perf_counter()))
+        return future
+
+    def write(self, quote: Quote) -> None:
+        """Queue a quote and block until its batch is committed."""
+        self.submit(quote).result()
+
+    def stats(self) -> QuoteWriterStats:
+        with self._stats_lock:
+            batches = self._batches
+            return QuoteWriterStats(
+                batches=batches,
+                records=self._records,
+                pending=self._queue.qsize(),
+                average_batch_size=self._records / batches if batches else 0.0,
+                max_batch_size=self._max_batch_size,
+                average_commit_latency_ms=(
+                    self._total_commit_latency * 1000 / self._records
+                    if self._records
+                    else 0.0
+                ),
+                max_commit_latency_ms=self._max_commit_latency * 1000,
+                fsync=self.fsync,
+            )
+
+    def _run(self) -> None:
+        try:
+            self._drain()
+        except BaseException:
+            app_logger.exception("Quote writer stopped unexpectedly")
+            raise
+        finally:
+            # never leave submitters waiting on a thread that is gone
+            with self._state_lock:
+                self._running = False
+            self._fail_queued(RuntimeError("Failed to save quote: quote writer stopped"))
+
+    def _drain(self) -> None:
+        stopping = False
+        while not stopping:
+            pending = self._queue.get()
+            if pending is None:
+                break
+
+            batch = [pending]
+            deadline = time.perf_counter() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    if remaining > 0:
+                        pending = self._queue.get(timeout=remaining)
+                    else:
+                        pending = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stopping = True
+                    break
+                batch.append(pending)
+
+            self._commit(batch)
+
+        # quotes that raced with `stop` still get committed
+        leftovers = []
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is not None:
+                leftovers.append(pending)
+        if leftovers:
+            self._commit(leftovers)
+
+    def _commit(self, batch: list[_PendingQuote]) -> None:
+        # a future cancelled by its caller (a disconnect, a timeout) is dropped;
+        # the rest can no longer be cancelled once marked running
+        batch = [pending for pending in batch if pending.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            self.repository.append_many(
+                [pending.quote for pending in batch], fsync=self.fsync
+            )
+        except Exception as e:
+            app_logger.exception("Quote batch commit failed", batch_size=len(batch))
+            error = e if isinstance(e, RuntimeError) else RuntimeError(f"Failed to save quote: {e}")
+            for pending in batch:
+                self._resolve(pending.future, error=error)
+            return
+
+        committed_at = time.perf_counter()
+        latencies = [committed_at - pending.enqueued_at for pending in batch]
+        with self._stats_lock:
+            self._batches += 1
+            self._records += len(batch)
+            self._max_batch_size = max(self._max_batch_size, len(batch))
+            self._total_commit_latency += sum(latencies)
+            self._max_commit_latency = max(self._max_commit_latency, max(latencies))
+
+        for pending in batch:
+            self._resolve(pending.future)
+
+    def _fail_queued(self, error: Exception) -> None:
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if pending is not None and pending.future.set_running_or_notify_cancel():
+                self._resolve(pending.future, error=error)
+
+    @staticmethod
+    def _resolve(future: Future, error: Optional[Exception] = None) -> None:
+        try:
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+        except InvalidStateError:
+            pass
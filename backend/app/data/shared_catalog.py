@@ -0,0 +1,497 @@
+import array
+import json
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import zlib
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from ..core.logger import app_logger
+from .availability import AvailabilityIndex
+from .compiler import CompiledRule, compile_rules
+from .indexes import OPTION_CATEGORY, OPTION_VALUES, RuleConditionIndex
+from .models import Category, Option, Rule, RuleContext, Setting
+from .snapshot_cache import catalog_key, model_states, restore_model, restore_models
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+if TYPE_CHECKING:
+    from .provider import DataProvider
+
+# bump whenever the layout changes
+SHARED_CATALOG_FORMAT = 1
+
+_MAGIC = b"CPQCATv\x00"
+_PREFIX_BYTES = len(_MAGIC) + 8
+_SEPARATOR = "\x1f"
+_CATALOG_PREFIX = "catalog-"
+_CATALOG_SUFFIX = ".shared"
+
+
+class SharedCatalog:
+    """A compiled catalog file, mapped read-only and shared by worker processes.
+
+    Options are stored as columns (ids, display names, prices, categories,
+    order, availability flags and availability rule bitsets), grouped per
+    category in display order, with an open-addressing hash table over the
+    ids. Each rule type's condition index is a hash table from bucket keys
+    into one postings array. Every lookup reads through memoryviews of a
+    single mapping, so its pages sit once in the page cache however many
+    processes map the file; models are only built for what a lookup returns.
+
+    Categories, settings and rules are stored pickled and loaded per process,
+    since handlers and compiled predicates need them as objects.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if view[: len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"Not a shared catalog: {path}")
+        header_length = int.from_bytes(view[len(_MAGIC) : _PREFIX_BYTES], "little")
+        header = json.loads(bytes(view[_PREFIX_BYTES : _PREFIX_BYTES + header_length]))
+        if header["format"] != SHARED_CATALOG_FORMAT or header["byteorder"] != sys.byteorder:
+            raise ValueError(f"Shared catalog was written by another format or platform: {path}")
+
+        data_start = _aligned(_PREFIX_BYTES + header_length)
+        self._sections = {
+            name: view[data_start + offset : data_start + offset + length].cast(typecode)
+            for name, (offset, length, typecode) in header["sections"].items()
+        }
+        self._section_starts = {
+            name: data_start + offset for name, (offset, _, _) in header["sections"].items()
+        }
+        self.key: str = header["key"]
+        self.content_hash: str = header["content_hash"]
+        self.option_count: int = header["option_count"]
+        self._mask_bytes: int = header["mask_bytes"]
+        self._rule_types: dict[str, dict[str, list[int]]] = header["rule_types"]
+
+        self._option_ids = self._strings("option_ids")
+        self._option_names = self._strings("option_names")
+        self._option_prices = self._strings("option_prices")
+        self._option_categories = self._sections["option_categories"]
+        self._option_orders = self._sections["option_orders"]
+        self._option_available = self._sections["option_available"]
+        self._option_masks = self._sections["option_masks"]
+        self._option_table = _KeyTable(self._sections["option_table"], self._option_ids)
+        self._category_starts = self._sections["category_starts"]
+        self._category_options = self._sections["category_options"]
+
+        self._bucket_table = _KeyTable(self._sections["bucket_table"], self._strings("bucket_keys"))
+        self._bucket_starts = self._sections["bucket_starts"]
+        self._postings = self._sections["postings"]
+
+        # per process, and small: category ids by position and the reverse
+        self._category_ids = [category.id for category in self.categories()]
+        self._category_positions = {
+            category_id: position for position, category_id in enumerate(self._category_ids)
+        }
+
+    def categories(self) -> list[Category]:
+        return restore_models(Category, pickle.loads(self._sections["categories"]))
+
+    def rules(self) -> list[Rule]:
+        return restore_models(Rule, pickle.loads(self._sections["rules"]))
+
+    def settings(self) -> list[Setting]:
+        return restore_models(Setting, pickle.loads(self._sections["settings"]))
+
+    def option(self, position: int) -> Option:
+        return restore_model(
+            Option,
+            {
+                "id": self._option_ids.get(position),
+                "category_id": self._category_ids[self._option_categories[position]],
+                "display_name": self._option_names.get(position),
+                "price": Decimal(self._option_prices.get(position)),
+                "available": bool(self._option_available[position]),
+                "order": self._option_orders[position],
+            },
+        )
+
+    def option_id(self, position: int) -> str:
+        return self._option_ids.get(position)
+
+    def option_position(self, option_id: str) -> int:
+        """Position of an option in the catalog, or -1 if it is unknown."""
+        return self._option_table.find(option_id.encode())
+
+    def option_price(self, option_id: str) -> Optional[Decimal]:
+        position = self._option_table.find(option_id.encode())
+        if position < 0:
+            return None
+        return Decimal(self._option_prices.get(position))
+
+    def option_mask(self, position: int) -> int:
+        start = position * self._mask_bytes
+        return int.from_bytes(self._option_masks[start : start + self._mask_bytes], "little")
+
+    def options_in_category(self, category_id: str) -> list[Option]:
+        """A category's options, sorted by their order."""
+        category = self._category_positions.get(category_id)
+        if category is None:
+            return []
+        positions = self._category_options[
+            self._category_starts[category] : self._category_starts[category + 1]
+        ]
+        return [self.option(position) for position in positions]
+
+    def availability_index(self) -> AvailabilityIndex:
+        index: AvailabilityIndex = pickle.loads(self._sections["availability"])
+        return index.with_option_masks(SharedOptionMasks(self))
+
+    def rule_index(self, rule_type: str, rules: list[Rule]) -> "SharedRuleConditionIndex":
+        """Condition index over a type's active rules, given in priority order."""
+        return SharedRuleConditionIndex(self, rule_type, compile_rules(rules))
+
+    def unkeyed_positions(self, rule_type: str) -> list[int]:
+        return self._rule_types.get(rule_type, {}).get("unkeyed", [])
+
+    def bucket_lookup(self) -> tuple[Callable[[bytes], int], memoryview, memoryview]:
+        """The condition bucket table's `find`, and where each bucket's postings start.
+
+        Bucket `b` holds `postings[starts[b] : starts[b + 1]]`: rule positions
+        in priority order.
+        """
+        return self._bucket_table.find, self._bucket_starts, self._postings
+
+    def _strings(self, name: str) -> "_Strings":
+        return _Strings(self._mmap, self._section_starts[f"{name}.data"], self._sections[f"{name}.offsets"])
+
+
+class SharedOptions(Sequence[Option]):
+    """The catalog's options in file order, built as they are read."""
+
+    def __init__(self, catalog: SharedCatalog) -> None:
+        self._catalog = catalog
+
+    def __len__(self) -> int:
+        return self._catalog.option_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._catalog.option(position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("option index out of range")
+        return self._catalog.option(index)
+
+
+class SharedOptionMasks(Mapping[str, int]):
+    """Per-option availability rule bitsets, read from a shared catalog."""
+
+    def __init__(self, catalog: SharedCatalog) -> None:
+        self._catalog = catalog
+
+    def get(self, option_id: str, default: Any = None) -> Any:
+        position = self._catalog.option_position(option_id)
+        if position < 0:
+            return default
+        return self._catalog.option_mask(position)
+
+    def __getitem__(self, option_id: str) -> int:
+        position = self._catalog.option_position(option_id)
+        if position < 0:
+            raise KeyError(option_id)
+        return self._catalog.option_mask(position)
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._catalog.option_count):
+            yield self._catalog.option_id(position)
+
+    def __len__(self) -> int:
+        return self._catalog.option_count
+
+
+class SharedRuleConditionIndex:
+    """`RuleConditionIndex.candidates` over the buckets of a shared catalog."""
+
+    def __init__(self, catalog: SharedCatalog, rule_type: str, rules: list[CompiledRule]) -> None:
+        self._catalog = catalog
+        self._rules = rules
+        self._unkeyed = catalog.unkeyed_positions(rule_type)
+        self._field_prefix = _SEPARATOR.join((rule_type, "field", ""))
+        self._category_prefix = _SEPARATOR.join((rule_type, OPTION_CATEGORY, ""))
+        self._option_prefix = _SEPARATOR.join((rule_type, OPTION_VALUES, ""))
+
+    def candidates(self, context: RuleContext) -> list[CompiledRule]:
+        """Return rules that could match the context, in priority order."""
+        keys = [
+            f"{self._field_prefix}{field_name}{_SEPARATOR}{value}"
+            for field_name, value in context.configuration.items()
+        ]
+        option = context.current_option
+        if option is not None:
+            keys.append(self._category_prefix + option.category_id)
+            keys.append(self._option_prefix + option.id)
+
+        positions = set(self._unkeyed)
+        find, starts, postings = self._catalog.bucket_lookup()
+        for key in keys:
+            bucket = find(key.encode())
+            if bucket >= 0:
+                positions.update(postings[starts[bucket] : starts[bucket + 1]])
+
+        return [self._rules[position] for position in sorted(positions)]
+
+
+def open_shared_catalog(
+    directory: Path, files: Sequence[Path], build: Callable[[], "DataProvider"]
+) -> SharedCatalog:
+    """Map the shared catalog for the files' current contents, building it if needed.
+
+    The first process to need a catalog builds it from `build()` under an
+    exclusive file lock while the others wait, and every process then maps
+    the same file. Catalogs for older contents are removed; processes still
+    mapping them keep their mapping.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    with _exclusive_lock(directory / "shared.lock"):
+        while True:
+            key = catalog_key([file_path.read_bytes() for file_path in files])
+            path = directory / f"{_CATALOG_PREFIX}{key[:32]}{_CATALOG_SUFFIX}"
+            if path.exists():
+                try:
+                    return SharedCatalog(path)
+                except Exception as e:
+                    app_logger.warning(
+                        "Rebuilding unreadable shared catalog", path=str(path), error=str(e)
+                    )
+
+            data_provider = build()
+            # the files changed while they were being loaded; key them again
+            if catalog_key([file_path.read_bytes() for file_path in files]) != key:
+                continue
+            write_shared_catalog(data_provider, path, key)
+            for stale in directory.glob(f"{_CATALOG_PREFIX}*{_CATALOG_SUFFIX}"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+            app_logger.info("Shared catalog built", path=str(path), bytes=path.stat().st_size)
+            return SharedCatalog(path)
+
+
+def write_shared_catalog(data_provider: "DataProvider", path: Path, key: str) -> None:
+    """Lay a loaded catalog out as a shared catalog file, written atomically."""
+    writer = _LayoutWriter()
+    categories = data_provider.categories
+    options = data_provider.options
+    category_positions = {category.id: position for position, category in enumerate(categories)}
+
+    writer.add_pickle("categories", model_states(categories))
+    writer.add_pickle("rules", model_states(data_provider.rules))
+    writer.add_pickle("settings", model_states(data_provider.settings))
+
+    option_ids = writer.add_strings("option_ids", [option.id for option in options])
+    writer.add_strings("option_names", [option.display_name for option in options])
+    writer.add_strings("option_prices", [str(option.price) for option in options])
+    writer.add_array(
+        "option_categories", "i", [category_positions[option.category_id] for option in options]
+    )
+    writer.add_array("option_orders", "q", [option.order for option in options])
+    writer.add_array("option_available", "B", [option.available for option in options])
+    writer.add_array("option_table", "q", _key_slots(option_ids))
+
+    by_category: list[list[int]] = [[] for _ in categories]
+    for position, option in enumerate(options):
+        by_category[category_positions[option.category_id]].append(position)
+    category_starts = [0]
+    category_options: list[int] = []
+    for positions in by_category:
+        category_options.extend(sorted(positions, key=lambda position: options[position].order))
+        category_starts.append(len(category_options))
+    writer.add_array("category_starts", "q", category_starts)
+    writer.add_array("category_options", "i", category_options)
+
+    availability_index = data_provider.get_availability_index()
+    masks = [availability_index.option_mask(option.id) for option in options]
+    mask_bytes = max(1, (max((mask.bit_length() for mask in masks), default=0) + 7) // 8)
+    writer.add_bytes("option_masks", b"".join(mask.to_bytes(mask_bytes, "little") for mask in masks))
+    writer.add_pickle("availability", availability_index.with_option_masks({}))
+
+    rule_positions = {id(rule): position for position, rule in enumerate(data_provider.rules)}
+    rule_types: dict[str, dict[str, list[int]]] = {}
+    bucket_keys: list[str] = []
+    bucket_starts = [0]
+    postings: list[int] = []
+    for rule_type in sorted({rule.type for rule in data_provider.rules}):
+        active_rules = data_provider.get_rules_by_type(rule_type)
+        if not active_rules:
+            continue
+        index = RuleConditionIndex(compile_rules(active_rules))
+        rule_types[rule_type] = {
+            "order": [rule_positions[id(rule)] for rule in active_rules],
+            "unkeyed": index.unkeyed_positions(),
+        }
+        for bucket, positions in index.buckets():
+            bucket_keys.append(_SEPARATOR.join((rule_type, *bucket)))
+            postings.extend(positions)
+            bucket_starts.append(len(postings))
+    encoded_keys = writer.add_strings("bucket_keys", bucket_keys)
+    writer.add_array("bucket_starts", "q", bucket_starts)
+    writer.add_array("postings", "i", postings)
+    writer.add_array("bucket_table", "q", _key_slots(encoded_keys))
+
+    writer.write(
+        path,
+        {
+            "format": SHARED_CATALOG_FORMAT,
+            "byteorder": sys.byteorder,
+            "key": key,
+            "content_hash": data_provider.content_hash,
+            "option_count": len(options),
+            "mask_bytes": mask_bytes,
+            "rule_types": rule_types,
+        },
+    )
+
+
+class _Strings:
+    """A column of strings: UTF-8 bytes back to back, and where each one starts."""
+
+    __slots__ = ("_base", "_mmap", "_offsets")
+
+    def __init__(self, mapping: mmap.mmap, base: int, offsets: memoryview) -> None:
+        # slicing the mapping itself copies the bytes out faster than a memoryview
+        self._mmap = mapping
+        self._base = base
+        self._offsets = offsets
+
+    def raw(self, index: int) -> bytes:
+        base = self._base
+        return self._mmap[base + self._offsets[index] : base + self._offsets[index + 1]]
+
+    def get(self, index: int) -> str:
+        base = self._base
+        return self._mmap[base + self._offsets[index] : base + self._offsets[index + 1]].decode()
+
+
+class _KeyTable:
+    """Open-addressing hash table from UTF-8 keys to their position in a column.
+
+    A slot holds 31 bits of the key's CRC-32 above its position, or -1 when
+    empty. At
+    most a quarter of the slots are used, so a lookup seldom probes twice,
+    and keys are only compared once their hashes agree.
+    """
+
+    __slots__ = ("_keys", "_mask", "_slots")
+
+    def __init__(self, slots: memoryview, keys: _Strings) -> None:
+        self._slots = slots
+        self._keys = keys
+        self._mask = len(slots) - 1
+
+    def find(self, key: bytes) -> int:
+        slots, mask = self._slots, self._mask
+        digest = zlib.crc32(key) & 0x7FFFFFFF
+        slot = digest & mask
+        while True:
+            entry = slots[slot]
+            if entry < 0:
+                return -1
+            if entry >> 32 == digest:
+                position = entry & 0xFFFFFFFF
+                if self._keys.raw(position) == key:
+                    return position
+            slot = (slot + 1) & mask
+
+
+def _key_slots(keys: list[bytes]) -> array.array:
+    size = 2
+    while size < 4 * len(keys):
+        size *= 2
+    slots = array.array("q", [-1]) * size
+    mask = size - 1
+    # inserted last to first, so a repeated key finds its last position, as a dict would
+    for position in range(len(keys) - 1, -1, -1):
+        digest = zlib.crc32(keys[position]) & 0x7FFFFFFF
+        slot = digest & mask
+        while slots[slot] >= 0:
+            slot = (slot + 1) & mask
+        slots[slot] = digest << 32 | position
+    return slots
+
+
+class _LayoutWriter:
+
+    def __init__(self) -> None:
+        self._sections: dict[str, tuple[str, bytes]] = {}
+
+    def add_bytes(self, name: str, data: bytes, typecode: str = "B") -> None:
+        self._sections[name] = (typecode, data)
+
+    def add_array(self, name: str, typecode: str, values: Any) -> None:
+        self.add_bytes(name, array.array(typecode, values).tobytes(), typecode)
+
+    def add_pickle(self, name: str, value: Any) -> None:
+        self.add_bytes(name, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def add_strings(self, name: str, values: list[str]) -> list[bytes]:
+        encoded = [value.encode() for value in values]
+        offsets = [0]
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        self.add_array(f"{name}.offsets", "q", offsets)
+        self.add_bytes(f"{name}.data", b"".join(encoded))
+        return encoded
+
+    def write(self, path: Path, header: dict[str, Any]) -> None:
+        sections = {}
+        offset = 0
+        for name, (typecode, data) in self._sections.items():
+            sections[name] = [offset, len(data), typecode]
+            offset = _aligned(offset + len(data))
+        encoded_header = json.dumps({**header, "sections": sections}).encode()
+
+        # written aside and renamed, so no process ever maps a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(_MAGIC)
+                file.write(len(encoded_header).to_bytes(8, "little"))
+                file.write(encoded_header)
+                file.write(bytes(_aligned(file.tell()) - file.tell()))
+                for _, data in self._sections.values():
+                    file.write(data)
+                    file.write(bytes(_aligned(len(data)) - len(data)))
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+@contextmanager
+def _exclusive_lock(lock_path: Path) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, "a+b") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Sequence, TypeVar
+
+import pydantic
+from pydantic import BaseModel
+
+from ..core.logger import app_logger
+from .availability import AvailabilityIndex
+from .models import (
+    AddErrorAction,
+    Category,
+    Option,
+    PercentageDiscountAction,
+    Rule,
+    SetBasePriceAction,
+    Setting,
+    SetUnavailableAction,
+    UnknownAction,
+)
+
+# bump whenever the pickled layout or anything derived at load time changes
+SNAPSHOT_FORMAT = 1
+
+M = TypeVar("M", bound=BaseModel)
+
+_SNAPSHOT_PREFIX = "catalog-"
+_SNAPSHOT_SUFFIX = ".snapshot"
+
+
+class CachedCatalog(NamedTuple):
+
+    categories: list[Category]
+    options: list[Option]
+    rules: list[Rule]
+    settings: list[Setting]
+    content_hash: str
+    availability_index: AvailabilityIndex
+
+
+class CatalogSnapshotCache:
+    """Validated catalogs kept on disk, keyed by the bytes of the catalog files.
+
+    A snapshot holds every model's field values, the catalog content hash and
+    the availability index, so a load with unchanged files restores them
+    without parsing, validating or hashing. The key also covers the snapshot
+    format, the pydantic version and the models' fields; after an upgrade the
+    old snapshot simply misses and is replaced. One snapshot is kept.
+
+    Snapshots are pickles: point the cache at a directory only this service
+    writes to.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def key(self, contents: Sequence[bytes]) -> str:
+        return catalog_key(contents)
+
+    def load(self, key: str) -> Optional[CachedCatalog]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                payload = pickle.load(file)
+            return CachedCatalog(
+                categories=restore_models(Category, payload["categories"]),
+                options=restore_models(Option, payload["options"]),
+                rules=restore_models(Rule, payload["rules"]),
+                settings=restore_models(Setting, payload["settings"]),
+                content_hash=payload["content_hash"],
+                availability_index=payload["availability_index"],
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            app_logger.warning("Ignoring unreadable catalog snapshot", path=str(path), error=str(e))
+            return None
+
+    def store(self, key: str, catalog: CachedCatalog) -> None:
+        payload = {
+            "categories": model_states(catalog.categories),
+            "options": model_states(catalog.options),
+            "rules": model_states(catalog.rules),
+            "settings": model_states(catalog.settings),
+            "content_hash": catalog.content_hash,
+            "availability_index": catalog.availability_index,
+        }
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # written aside and renamed, so concurrent loads never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            for stale in self.directory.glob(f"{_SNAPSHOT_PREFIX}*{_SNAPSHOT_SUFFIX}"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            app_logger.warning("Failed to write catalog snapshot", path=str(path), error=str(e))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{_SNAPSHOT_PREFIX}{key[:32]}{_SNAPSHOT_SUFFIX}"
+
+
+def catalog_key(contents: Sequence[bytes]) -> str:
+    """Key for the catalog files' bytes and the models they are loaded into."""
+    digest = hashlib.sha256(_schema_fingerprint().encode())
+    for content in contents:
+        digest.update(len(content).to_bytes(8, "little"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def model_states(models: Sequence[BaseModel]) -> list[tuple]:
+    """Picklable field values of validated models, for `restore_models`."""
+    # the fields set are stored only when some field was left at its default
+    return [
+        (
+            model.__dict__,
+            model.__pydantic_private__,
+            model.model_fields_set if len(model.model_fields_set) != len(model.__dict__) else None,
+        )
+        for model in models
+    ]
+
+
+def restore_models(model_class: type[M], states: list[tuple]) -> list[M]:
+    return [
+        restore_model(model_class, fields, private, fields_set)
+        for fields, private, fields_set in states
+    ]
+
+
+def restore_model(
+    model_class: type[M],
+    fields: dict[str, Any],
+    private: Optional[dict[str, Any]] = None,
+    fields_set: Optional[set[str]] = None,
+) -> M:
+    """Rebuild a model from already validated field values, skipping validation."""
+    model = model_class.__new__(model_class)
+    model.__setstate__(
+        {
+            "__dict__": fields,
+            "__pydantic_extra__": None,
+            "__pydantic_fields_set__": set(_field_names(model_class) if fields_set is None else fields_set),
+            "__pydantic_private__": private,
+        }
+    )
+    return model
+
+
+@lru_cache
+def _field_names(model_class: type[BaseModel]) -> frozenset[str]:
+    return frozenset(model_class.model_fields)
+
+
+@lru_cache
+def _schema_fingerprint() -> str:
+    models: tuple[type[BaseModel], ...] = (
+        Category, Option, Rule, Setting, SetBasePriceAction, SetUnavailableAction,
+        AddErrorAction, PercentageDiscountAction, UnknownAction,
+    )
+    fields = [
+        [model.__qualname__]
+        + [f"{name}: {field.annotation!r} = {field.default!r}" for name, field in model.model_fields.items()]
+        + sorted(model.__private_attributes__)
+        for model in models
+    ]
+    return repr([SNAPSHOT_FORMAT, pydantic.VERSION, fields])
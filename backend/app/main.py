@@ -9,7 +9,9 @@ from .core.settings import settings
 
 configure_logging(
     enable_json_logging=settings.STRUCTURED_LOGGING_ENABLED,
-    log_level=settings.LOG_LEVEL
+    log_level=settings.LOG_LEVEL,
+    queue_size=settings.LOG_QUEUE_SIZE if settings.LOG_QUEUE_ENABLED else None,
+    drop_policy=settings.LOG_QUEUE_DROP_POLICY,
 )
 
 from .core.app import create_app
@@ -1,17 +1,37 @@
+import random
 import time
 import urllib.parse
 from collections.abc import MutableMapping
 
 import structlog
 from asgi_correlation_id.context import correlation_id
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 access_logger = structlog.stdlib.get_logger("api.access")
 
 
 # Adapted with thanks from: https://gist.github.com/nymous/f138c7f06062b7c43c060bf03759c29e
-class HttpRequestLoggingMiddleware(BaseHTTPMiddleware):
+class HttpRequestLoggingMiddleware:
+    """Access log, request-id binding and timing as a plain ASGI middleware.
+
+    Unlike `BaseHTTPMiddleware` it runs the downstream app in the same task
+    and passes response messages straight through, so it adds no task or
+    stream wrapping per request. The duration covers the whole response,
+    body included.
+
+    Successful requests are logged at `sample_rate`; responses with a status
+    of 400 or above and, unless `slow_request_ms` is 0, requests at least
+    that slow always are.
+    """
+
+    def __init__(
+        self, app: ASGIApp, sample_rate: float = 1.0, slow_request_ms: float = 0.0
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ns = int(slow_request_ms * 1_000_000) if slow_request_ms else None
+
     @staticmethod
     def _get_path_with_query_string(scope: MutableMapping) -> str:
         path_with_query_string = urllib.parse.quote(scope["path"])
@@ -21,39 +41,60 @@ class HttpRequestLoggingMiddleware(BaseHTTPMiddleware):
             )
         return path_with_query_string
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         structlog.contextvars.clear_contextvars()
 
         request_id = correlation_id.get()
         structlog.contextvars.bind_contextvars(request_id=request_id)
 
         start_time = time.perf_counter_ns()
-        response = Response("Internal Server Error", status_code=500)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_status)
         except Exception:
             structlog.stdlib.get_logger("api.error").exception("Unhandled exception.")
             raise
         finally:
-            host = request.client.host
-            port = request.client.port
-            method = request.method
-            version = request.scope["http_version"]
-            status_code = response.status_code
-            url = self._get_path_with_query_string(request.scope)
-
             process_time = time.perf_counter_ns() - start_time
-            event = f"{host}:{port} - '{method} {url} HTTP/{version}' {status_code}"
-            access_logger.info(
-                event,
-                http={
-                    "url": str(request.url),
-                    "status_code": status_code,
-                    "method": method,
-                    "request_id": request_id,
-                    "version": version,
-                },
-                network={"client": {"ip": host, "port": port}},
-                duration=process_time,
-            )
-        return response
+            if self._should_log(status_code, process_time):
+                self._log_access(scope, request_id, status_code, process_time)
+
+    def _should_log(self, status_code: int, process_time: int) -> bool:
+        if self.sample_rate >= 1.0 or status_code >= 400:
+            return True
+        if self.slow_request_ns is not None and process_time >= self.slow_request_ns:
+            return True
+        return random.random() < self.sample_rate
+
+    def _log_access(
+        self, scope: Scope, request_id: str | None, status_code: int, process_time: int
+    ) -> None:
+        host, port = scope.get("client") or (None, None)
+        method = scope["method"]
+        version = scope["http_version"]
+        url = self._get_path_with_query_string(scope)
+
+        event = f"{host}:{port} - '{method} {url} HTTP/{version}' {status_code}"
+        access_logger.info(
+            event,
+            http={
+                "url": str(URL(scope=scope)),
+                "status_code": status_code,
+                "method": method,
+                "request_id": request_id,
+                "version": version,
+            },
+            network={"client": {"ip": host, "port": port}},
+            duration=process_time,
+        )
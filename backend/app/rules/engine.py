@@ -1,10 +1,12 @@
+import time
 from typing import Any
 
 from ..core.logger import app_logger
+from ..core.metrics import RULE_HITS, RULES_MATCHED, RULES_PROCESSING_SECONDS, metrics
 from ..data import DataProvider
 from ..data.models import RuleContext
+from ..data.models.explain import RuleCheck, RuleTypeTrace
 from ..rules.handlers import HandlerRegistry
-from .condition_evaluator import ConditionEvaluator
 
 
 class RulesEngine:
@@ -12,15 +14,13 @@ class RulesEngine:
     def __init__(self, data_provider: DataProvider, handler_registry: HandlerRegistry):
         self.data_provider = data_provider
         self.handler_registry = handler_registry
-        self.condition_evaluator = ConditionEvaluator()
 
     def process_rules(self, rule_type: str, context: RuleContext) -> Any:
-        rules = self.data_provider.get_rules_by_type(rule_type)
+        start = time.perf_counter()
+        candidates = self.data_provider.get_candidate_rules(rule_type, context)
 
         matching_rules = [
-            rule
-            for rule in rules
-            if self.condition_evaluator.matches_conditions(rule.conditions, context)
+            compiled.rule for compiled in candidates if compiled.matches(context)
         ]
 
         app_logger.debug(f"Processing {len(matching_rules)} matching rules for type '{rule_type}'")
@@ -34,11 +34,56 @@ class RulesEngine:
         except Exception:
             app_logger.exception(f"Handler execution failed for rule type '{rule_type}'")
             raise
+        finally:
+            if metrics.enabled:
+                _record_processing(rule_type, matching_rules, time.perf_counter() - start)
+
+    def explain_rules(self, rule_type: str, context: RuleContext) -> tuple[Any, RuleTypeTrace]:
+        """`process_rules`, also returning which rules were checked and matched, with timings.
+
+        A separate path, so `process_rules` pays nothing for the trace.
+        """
+        start = time.perf_counter()
+        candidates = self.data_provider.get_candidate_rules(rule_type, context)
+        matches = [compiled.matches(context) for compiled in candidates]
+        conditions_done = time.perf_counter()
+
+        handler = self.handler_registry.get_handler(rule_type)
+        if not handler:
+            raise ValueError(f"No handler registered for rule type: {rule_type}")
+
+        matching_rules = [
+            compiled.rule for compiled, matched in zip(candidates, matches) if matched
+        ]
+        handler_start = time.perf_counter()
+        result = handler.execute(matching_rules, context)
+        handler_time = time.perf_counter() - handler_start
+
+        trace = RuleTypeTrace(
+            rule_type=rule_type,
+            active_rules=len(self.data_provider.get_rules_by_type(rule_type)),
+            checked=[
+                RuleCheck(rule_id=compiled.rule.id, matched=matched)
+                for compiled, matched in zip(candidates, matches)
+            ],
+            matched=[rule.id for rule in matching_rules],
+            condition_time_ms=(conditions_done - start) * 1000,
+            handler_time_ms=handler_time * 1000,
+        )
+        return result, trace
 
     def add_handler(self, rule_type: str, handler) -> None:
         self.handler_registry.register_handler(rule_type, handler)
 
 
+def _record_processing(rule_type: str, matching_rules: list, elapsed: float) -> None:
+    RULES_PROCESSING_SECONDS.labels(rule_type).observe(elapsed)
+    if matching_rules:
+        RULES_MATCHED.labels(rule_type).inc(len(matching_rules))
+        for rule in matching_rules:
+            RULE_HITS.labels(rule_type, rule.id).inc()
+
+
 def initialize_rule_engine(
     data_provider: DataProvider,
     handler_registry: HandlerRegistry
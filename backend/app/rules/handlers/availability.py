@@ -1,6 +1,6 @@
 from typing import Any, List
 
-from ...data.models import Rule
+from ...data.models import Rule, SetUnavailableAction
 from .base import RuleHandler
 
 
@@ -17,9 +17,4 @@ class AvailabilityHandler(RuleHandler):
 
     @staticmethod
     def _execute_availability_action(rule: Rule, _: tuple) -> bool:
-        action_type = rule.actions.get("type")
-
-        if action_type == "set_unavailable":
-            return False
-
-        return True
+        return not isinstance(rule.action, SetUnavailableAction)
@@ -1,7 +1,7 @@
 from decimal import Decimal
-from typing import Any, Dict, List, Tuple
+from typing import Any, List, Tuple
 
-from ...data.models import Rule
+from ...data.models import PercentageDiscountAction, Rule, RuleContext
 from .base import RuleHandler
 
 
@@ -27,23 +27,19 @@ class DiscountHandler(RuleHandler):
         return total_discount, descriptions
 
     def _execute_discount_action(
-        self, rule: Rule, configuration: Dict[str, str]
+        self, rule: Rule, context: RuleContext
     ) -> Tuple[Decimal, str]:
         """Execute a single discount rule action."""
-        action_type = rule.actions.get("type")
-
-        if action_type == "percentage_discount":
-            category_id = rule.actions.get("category")
-            percentage = Decimal(rule.actions.get("percentage", "0"))
-            description = rule.actions.get("description", "")
+        action = rule.action
 
+        if isinstance(action, PercentageDiscountAction):
             # Get the option ID for this category
-            option_id = configuration.get(category_id)
+            option_id = context.configuration.get(action.category)
             if option_id:
                 # Get option price from the data provider
                 option_price = self.data_provider.get_option_price(option_id)
                 if option_price > 0:
-                    discount_amount = option_price * (percentage / 100)
-                    return discount_amount, description
+                    discount_amount = option_price * action.rate
+                    return discount_amount, action.description
 
         return Decimal("0"), ""
@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, NamedTuple
 
-from ...data.models import Rule
+from ...data.models import AddErrorAction, Rule
 from .base import RuleHandler
 
 
@@ -32,10 +32,9 @@ class ValidationHandler(RuleHandler):
     def _execute_validation_action(rule: Rule, _:  Dict[str, str]
     ) -> List[str]:
         """Execute a single validation rule action."""
-        action_type = rule.actions.get("type")
+        action = rule.action
 
-        if action_type == "add_error":
-            message = rule.actions.get("message", "Validation error")
-            return [message]
+        if isinstance(action, AddErrorAction):
+            return [action.message]
 
         return []
@@ -0,0 +1,382 @@
+import time
+from decimal import Decimal
+from math import prod
+from typing import Any, NamedTuple, Optional
+
+from ..core.logger import app_logger
+from ..data import DataProvider
+from ..data.models import (
+    PercentageDiscountAction,
+    Rule,
+    RuleContext,
+    ServerConfigurationResponse,
+)
+from ..data.models.server import PricedConfiguration
+from ..rules import ConditionEvaluator, RulesEngine
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+# rule matches are recorded as bits of one integer per configuration
+_MAX_RULES_PER_TYPE = 64
+
+
+class PriceMatrixReport(NamedTuple):
+
+    dimensions: tuple[int, ...]
+    cells: int
+    valid_cells: int
+    exact_cells: int
+    nbytes: int
+    build_ms: float
+
+
+class PriceMatrix:
+    """Every fully specified configuration of a catalog snapshot, priced up front.
+
+    The option space is a dense tensor with one axis per category (in
+    category order) and one position per option. For every cell it holds the
+    total price and discount in integer minor units, with the Decimal
+    exponents the rules engine would give them, plus bitmasks of the
+    matched validation and discount rules, so pricing a fully specified
+    configuration is a single tensor lookup. Cells whose discount is not a
+    whole number of minor units are marked inexact and left to the rules
+    engine, as is any configuration that is partial or names unknown options.
+    """
+
+    def __init__(
+        self,
+        data_provider: DataProvider,
+        category_ids: list[str],
+        positions: list[dict[str, int]],
+        scale: int,
+        total: Any,
+        discount: Any,
+        total_exponent: Any,
+        discount_exponent: Any,
+        errors: Any,
+        discounts: Any,
+        exact: Any,
+        error_messages: list[list[str]],
+        discount_descriptions: list[str],
+        report: PriceMatrixReport,
+    ) -> None:
+        self.data_provider = data_provider
+        self.category_ids = category_ids
+        self.report = report
+        self._categories = frozenset(category_ids)
+        self._positions = positions
+        self._scale = scale
+        self._total = total
+        self._discount = discount
+        self._total_exponent = total_exponent
+        self._discount_exponent = discount_exponent
+        self._errors = errors
+        self._discounts = discounts
+        self._exact = exact
+        self._error_messages = error_messages
+        self._discount_descriptions = discount_descriptions
+
+    def lookup(self, configuration: dict[str, str]) -> Optional[PricedConfiguration]:
+        """Price a configuration from the matrix, or return None if it is not covered."""
+        if len(configuration) != len(self.category_ids) or configuration.keys() != self._categories:
+            return None
+        try:
+            cell = tuple(
+                positions[configuration[category_id]]
+                for category_id, positions in zip(self.category_ids, self._positions)
+            )
+        except KeyError:
+            return None
+        if not self._exact[cell]:
+            return None
+
+        errors = int(self._errors[cell])
+        if errors:
+            messages = [
+                message
+                for bit, rule_messages in enumerate(self._error_messages)
+                if errors >> bit & 1
+                for message in rule_messages
+            ]
+            return PricedConfiguration(response=None, error="; ".join(messages))
+
+        discounts = int(self._discounts[cell])
+        total_discount = int(self._discount[cell])
+        response = ServerConfigurationResponse(
+            current_selection=configuration,
+            total_price=self._to_decimal(
+                int(self._total[cell]), int(self._total_exponent[cell])
+            ),
+            total_discount=(
+                self._to_decimal(total_discount, int(self._discount_exponent[cell]))
+                if total_discount > 0
+                else None
+            ),
+            discount_descriptions=[
+                description
+                for bit, description in enumerate(self._discount_descriptions)
+                if discounts >> bit & 1
+            ],
+            is_valid=True,
+        )
+        return PricedConfiguration(response=response, error=None)
+
+    def _to_decimal(self, minor_units: int, exponent: int) -> Decimal:
+        # in the exponent the rules engine's arithmetic gives the same amount,
+        # so it serializes identically ("5.800", not "5.8")
+        return (Decimal(minor_units) / self._scale).quantize(Decimal(1).scaleb(exponent))
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def build_price_matrix(rule_engine: RulesEngine, max_cells: int) -> Optional[PriceMatrix]:
+    """Precompute the price matrix for a catalog snapshot, if it is feasible.
+
+    Returns None (and pricing keeps going through the rules engine) when
+    numpy is not installed, the option space exceeds `max_cells`, or the
+    catalog holds prices or rules the matrix cannot represent exactly.
+    """
+    data_provider = rule_engine.data_provider
+    if np is None:
+        app_logger.info("Price matrix disabled: numpy is not installed")
+        return None
+
+    categories = data_provider.get_all_categories()
+    options = [data_provider.get_options_by_category(category.id) for category in categories]
+    dimensions = tuple(len(category_options) for category_options in options)
+    cells = prod(dimensions)
+    if not categories or cells == 0 or cells > max_cells:
+        app_logger.info(
+            "Price matrix disabled: option space too large",
+            cells=cells,
+            max_cells=max_cells,
+        )
+        return None
+
+    start_time = time.perf_counter()
+    try:
+        matrix = _PriceMatrixBuilder(rule_engine, categories, options, dimensions).build()
+    except _Unsupported as e:
+        app_logger.info("Price matrix disabled", reason=str(e))
+        return None
+
+    build_ms = (time.perf_counter() - start_time) * 1000
+    matrix.report = matrix.report._replace(build_ms=build_ms)
+    app_logger.info("Price matrix built", **matrix.report._asdict())
+    return matrix
+
+
+class _PriceMatrixBuilder:
+
+    def __init__(self, rule_engine: RulesEngine, categories, options, dimensions) -> None:
+        self.rule_engine = rule_engine
+        self.data_provider = rule_engine.data_provider
+        self.category_ids = [category.id for category in categories]
+        self.options = options
+        self.dimensions = dimensions
+        self.evaluator = ConditionEvaluator()
+        # any fully specified configuration; only the presence of categories
+        # matters for conditions that do not key on a category's option
+        self.representative = RuleContext(
+            configuration={
+                category_id: category_options[0].id
+                for category_id, category_options in zip(self.category_ids, options)
+            }
+        )
+        precision = int(self._setting("price_precision", "2"))
+        self.scale = 10**precision
+
+    def build(self) -> PriceMatrix:
+        total, total_exponent = self._base_prices()
+
+        errors, error_messages = self._validation_masks()
+        discount, discount_exponent, discounts, exact, discount_descriptions = (
+            self._discount_totals()
+        )
+        total = total - discount
+        total_exponent = np.minimum(total_exponent, discount_exponent)
+
+        arrays = (total, discount, total_exponent, discount_exponent, errors, discounts, exact)
+        nbytes = sum(array.nbytes for array in arrays)
+        report = PriceMatrixReport(
+            dimensions=self.dimensions,
+            cells=int(total.size),
+            valid_cells=int(np.count_nonzero(errors == 0)),
+            exact_cells=int(np.count_nonzero(exact)),
+            nbytes=nbytes,
+            build_ms=0.0,
+        )
+        return PriceMatrix(
+            data_provider=self.data_provider,
+            category_ids=self.category_ids,
+            positions=[
+                {option.id: position for position, option in enumerate(category_options)}
+                for category_options in self.options
+            ],
+            scale=self.scale,
+            total=total,
+            discount=discount,
+            total_exponent=total_exponent,
+            discount_exponent=discount_exponent,
+            errors=errors,
+            discounts=discounts,
+            exact=exact,
+            error_messages=error_messages,
+            discount_descriptions=discount_descriptions,
+            report=report,
+        )
+
+    def _base_prices(self) -> tuple[Any, Any]:
+        """Undiscounted totals, with the Decimal exponent summing them would give."""
+        base_price = self.data_provider.get_base_price()
+        total = np.full(self.dimensions, self._minor_units(base_price), dtype=np.int64)
+        exponent = np.full(self.dimensions, self._exponent(base_price), dtype=np.int8)
+        for axis, category_options in enumerate(self.options):
+            prices = [self._minor_units(option.price) for option in category_options]
+            exponents = [self._exponent(option.price) for option in category_options]
+            total = total + self._along(axis, np.array(prices, dtype=np.int64))
+            # a Decimal sum keeps the smallest exponent of its terms
+            exponent = np.minimum(exponent, self._along(axis, np.array(exponents, dtype=np.int8)))
+        return total, exponent
+
+    def _validation_masks(self) -> tuple[Any, list[list[str]]]:
+        rules = self.data_provider.get_rules_by_type("validation")
+        handler = self.rule_engine.handler_registry.get_handler("validation")
+        messages_by_rule = []
+        for rule in rules:
+            # validation actions do not depend on the configuration
+            result = handler.execute([rule], self.representative)
+            if result.error_messages:
+                messages_by_rule.append((rule, result.error_messages))
+        if len(messages_by_rule) > _MAX_RULES_PER_TYPE:
+            raise _Unsupported("too many validation rules")
+
+        errors = np.zeros(self.dimensions, dtype=self._bits_dtype(len(messages_by_rule)))
+        for bit, (rule, _) in enumerate(messages_by_rule):
+            mask = self._rule_mask(rule)
+            if mask is not None:
+                errors |= mask.astype(errors.dtype) << errors.dtype.type(bit)
+        return errors, [messages for _, messages in messages_by_rule]
+
+    def _discount_totals(self) -> tuple[Any, Any, Any, Any, list[str]]:
+        rules = self.data_provider.get_rules_by_type("discount")
+        handler = self.rule_engine.handler_registry.get_handler("discount")
+        if len(rules) > _MAX_RULES_PER_TYPE:
+            raise _Unsupported("too many discount rules")
+
+        discount = np.zeros(self.dimensions, dtype=np.int64)
+        # the handler starts from Decimal("0"), whose exponent is 0
+        exponent = np.zeros(self.dimensions, dtype=np.int8)
+        discounts = np.zeros(self.dimensions, dtype=self._bits_dtype(len(rules)))
+        exact = np.ones(self.dimensions, dtype=bool)
+        descriptions = []
+        for bit, rule in enumerate(rules):
+            amounts, amount_exponents, amount_exact, description = self._discount_amounts(
+                rule, handler
+            )
+            descriptions.append(description)
+            mask = self._rule_mask(rule)
+            if mask is None:
+                continue
+            applied = mask & (amounts > 0)
+            discount += np.where(applied, amounts, 0)
+            exponent = np.where(applied, np.minimum(exponent, amount_exponents), exponent)
+            discounts |= applied.astype(discounts.dtype) << discounts.dtype.type(bit)
+            exact &= ~mask | amount_exact
+        return discount, exponent, discounts, exact, descriptions
+
+    def _discount_amounts(self, rule: Rule, handler) -> tuple[Any, Any, Any, str]:
+        """Per-cell discount of one rule, assuming it matches, in minor units."""
+        action = rule.action
+        if (
+            not isinstance(action, PercentageDiscountAction)
+            or action.category not in self.category_ids
+        ):
+            # every other action yields a constant amount
+            amount, descriptions = handler.execute([rule], self.representative)
+            units, is_exact = self._discount_units(amount)
+            return (
+                np.full(self.dimensions, units, dtype=np.int64),
+                np.full(self.dimensions, self._exponent(amount), dtype=np.int8),
+                np.full(self.dimensions, is_exact, dtype=bool),
+                descriptions[0] if descriptions else "",
+            )
+
+        category_id = action.category
+        axis = self.category_ids.index(category_id)
+        units, exponents, exact, description = [], [], [], ""
+        for option in self.options[axis]:
+            context = RuleContext(configuration={category_id: option.id})
+            amount, descriptions = handler.execute([rule], context)
+            option_units, option_exact = self._discount_units(amount)
+            units.append(option_units)
+            exponents.append(self._exponent(amount))
+            exact.append(option_exact)
+            description = description or (descriptions[0] if descriptions else "")
+        return (
+            self._along(axis, np.array(units, dtype=np.int64)),
+            self._along(axis, np.array(exponents, dtype=np.int8)),
+            self._along(axis, np.array(exact, dtype=bool)),
+            description,
+        )
+
+    def _rule_mask(self, rule: Rule) -> Optional[Any]:
+        """Boolean tensor of the cells a rule matches, or None if it matches none."""
+        mask = np.ones(self.dimensions, dtype=bool)
+        for field_name, expected_values in rule.conditions.items():
+            condition = {field_name: expected_values}
+            if field_name not in self.category_ids:
+                if not self.evaluator.matches_conditions(condition, self.representative):
+                    return None
+                continue
+            axis = self.category_ids.index(field_name)
+            matches = [
+                self.evaluator.matches_conditions(
+                    condition, RuleContext(configuration={field_name: option.id})
+                )
+                for option in self.options[axis]
+            ]
+            mask &= self._along(axis, np.array(matches, dtype=bool))
+        return mask
+
+    def _along(self, axis: int, values: Any) -> Any:
+        """Reshape a per-option vector so it broadcasts along one category axis."""
+        shape = [1] * len(self.dimensions)
+        shape[axis] = len(values)
+        return values.reshape(shape)
+
+    def _minor_units(self, amount: Decimal) -> int:
+        units = amount * self.scale
+        if units != units.to_integral_value():
+            raise _Unsupported(f"price {amount} is not a whole number of minor units")
+        return int(units)
+
+    @staticmethod
+    def _exponent(amount: Decimal) -> int:
+        exponent = amount.as_tuple().exponent
+        if not isinstance(exponent, int) or not -128 <= exponent <= 127:
+            raise _Unsupported(f"amount {amount} has no representable exponent")
+        return exponent
+
+    def _discount_units(self, amount: Decimal) -> tuple[int, bool]:
+        units = amount * self.scale
+        integral = units.to_integral_value()
+        return int(integral), units == integral
+
+    def _setting(self, key: str, default: str) -> str:
+        for setting in self.data_provider.settings:
+            if setting.key == key:
+                return setting.value
+        return default
+
+    @staticmethod
+    def _bits_dtype(count: int) -> Any:
+        for dtype in (np.uint8, np.uint16, np.uint32):
+            if count <= np.iinfo(dtype).bits:
+                return dtype
+        return np.uint64
@@ -1,26 +1,133 @@
-import json
-from typing import List, Optional
-
-from ..data.models.quote import Quote, QuoteRequest, QuoteResponse
-from ..data.utilities import data_file
+import asyncio
+import time
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, TypeVar
+
+from ..core.metrics import QUOTE_WRITE_SECONDS, metrics
+from ..data.models.quote import Quote, QuotePage, QuoteRequest, QuoteResponse
+from ..data.quotes import QuoteRepository, QuoteWriter
 from .server import ServerService
 
+T = TypeVar("T")
 
-class QuoteService:
-    """Service for managing quote requests with in-memory JSONL persistence."""
 
-    def __init__(self, server_service: ServerService):
+class QuoteService:
+    """Service for managing quote requests on a pluggable quote repository.
+
+    The `a`-prefixed methods are the async API: blocking storage work runs on
+    the bounded `executor` (or the group-commit writer) instead of the event loop.
+    """
+
+    def __init__(
+        self,
+        server_service: ServerService,
+        quote_repository: QuoteRepository,
+        quote_writer: Optional[QuoteWriter] = None,
+        executor: Optional[Executor] = None,
+    ):
         self.server_service = server_service
-        self.quotes_file_path = data_file("quotes.jsonl")
-        self._ensure_file_exists()
+        self.quote_repository = quote_repository
+        self.quote_writer = quote_writer
+        self.executor = executor
 
     def create_quote(self, request: QuoteRequest) -> QuoteResponse:
+        quote = self._build_quote(request)
+        self._append_quote(quote)
+        return self._to_response(quote)
+
+    async def acreate_quote(self, request: QuoteRequest) -> QuoteResponse:
+        """Create a quote without blocking the event loop on storage I/O."""
+        quote = self._build_quote(request)
+        start = time.perf_counter()
+        if self.quote_writer is not None:
+            await asyncio.wrap_future(self.quote_writer.submit(quote))
+        else:
+            await self._run_io(self.quote_repository.append, quote)
+        self._record_write(time.perf_counter() - start)
+        return self._to_response(quote)
+
+    def get_quote(self, quote_id: str) -> Optional[Quote]:
+        return self.quote_repository.get(quote_id)
+
+    async def aget_quote(self, quote_id: str) -> Optional[Quote]:
+        quote = self.quote_repository.get_cached(quote_id)
+        if quote is not None:
+            return quote
+        # the cache was just checked; go straight to storage
+        return await self._run_io(self.quote_repository.fetch, quote_id)
+
+    def iter_quotes(
+        self,
+        cursor: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Iterator[tuple[str, Quote]]:
+        """Lazily yield `(cursor, quote)` pairs matching the `created_at` window.
+
+        Each cursor resumes the listing right after its quote.
+        """
+        start = self.quote_repository.parse_cursor(cursor)
+        return self.quote_repository.iter_records(
+            start, self._as_local(created_from), self._as_local(created_to)
+        )
+
+    def list_quotes(self) -> List[Quote]:
+        return list(self.quote_repository.iter_quotes())
+
+    def list_quotes_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> QuotePage:
+        """Return one page of quotes, resuming from `cursor` or skipping `offset` matches."""
+        records = self.iter_quotes(cursor, created_from, created_to)
+        if offset:
+            records = islice(records, offset, None)
+
+        items: List[Quote] = []
+        next_cursor = None
+        for record_cursor, quote in records:
+            if len(items) == limit:
+                break
+            items.append(quote)
+            next_cursor = record_cursor
+        else:
+            next_cursor = None
+
+        return QuotePage(items=items, next_cursor=next_cursor)
+
+    async def alist_quotes_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> QuotePage:
+        return await self._run_io(
+            partial(
+                self.list_quotes_page,
+                limit,
+                cursor=cursor,
+                offset=offset,
+                created_from=created_from,
+                created_to=created_to,
+            )
+        )
+
+    def _build_quote(self, request: QuoteRequest) -> Quote:
         try:
             config_response = self.server_service.get_server_configuration(request.configuration)
         except ValueError as e:
             raise ValueError(f"Invalid configuration: {e}")
 
-        quote = Quote(
+        return Quote(
             configuration=request.configuration,
             contact_name=request.contact_name,
             contact_email=request.contact_email,
@@ -29,66 +136,33 @@ class QuoteService:
             total_discount=config_response.total_discount,
         )
 
-        self._append_quote(quote)
-
+    def _append_quote(self, quote: Quote) -> None:
+        start = time.perf_counter()
+        if self.quote_writer is not None:
+            self.quote_writer.write(quote)
+        else:
+            self.quote_repository.append(quote)
+        self._record_write(time.perf_counter() - start)
+
+    def _record_write(self, elapsed: float) -> None:
+        if metrics.enabled:
+            QUOTE_WRITE_SECONDS.labels(self.quote_repository.backend).observe(elapsed)
+
+    async def _run_io(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    @staticmethod
+    def _as_local(value: Optional[datetime]) -> Optional[datetime]:
+        # quotes store naive local timestamps; align aware filters with them
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone().replace(tzinfo=None)
+
+    @staticmethod
+    def _to_response(quote: Quote) -> QuoteResponse:
         return QuoteResponse(
             id=quote.id,
             total_price=quote.total_price,
             created_at=quote.created_at,
         )
-
-    def get_quote(self, quote_id: str) -> Optional[Quote]:
-        try:
-            with open(self.quotes_file_path, "r", encoding="utf-8") as file:
-                for line in file:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        quote_data = json.loads(line)
-                        if quote_data.get("id") == quote_id:
-                            return Quote.model_validate(quote_data)
-                    except (json.JSONDecodeError, ValueError):
-                        continue
-            return None
-        except FileNotFoundError:
-            return None
-
-    def list_quotes(self) -> List[Quote]:
-        quotes = []
-        try:
-            with open(self.quotes_file_path, "r", encoding="utf-8") as file:
-                for line in file:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        quote_data = json.loads(line)
-                        quotes.append(Quote.model_validate(quote_data))
-                    except (json.JSONDecodeError, ValueError):
-                        continue
-        except FileNotFoundError:
-            pass
-
-        return quotes
-
-    def _append_quote(self, quote: Quote) -> None:
-        try:
-            self.quotes_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(self.quotes_file_path, "a", encoding="utf-8") as file:
-                quote_json = quote.model_dump_json()
-                file.write(f"{quote_json}\n")
-                file.flush()
-        except IOError as e:
-            raise RuntimeError(f"Failed to save quote: {e}")
-
-    def _ensure_file_exists(self) -> None:
-        try:
-            self.quotes_file_path.parent.mkdir(parents=True, exist_ok=True)
-            if not self.quotes_file_path.exists():
-                self.quotes_file_path.touch()
-        except IOError as e:
-            raise RuntimeError(f"Failed to initialize quotes file: {e}")
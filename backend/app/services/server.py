@@ -1,17 +1,114 @@
+import time
 from decimal import Decimal
-from typing import List, Optional
+from typing import Callable, List, Optional, TypeVar
 
+from ..core.cache import LRUCache
+from ..core.metrics import PRICE_MATRIX_LOOKUPS, metrics
+from ..data.availability import AvailabilityIndex
 from ..data.models import RuleContext, ServerConfigurationResponse, ServerOption
+from ..data.models.explain import (
+    ConfigurationExplanation,
+    ExplainedServerConfiguration,
+    ExplainedServerOptions,
+    OptionAvailabilityTrace,
+    OptionsExplanation,
+    PriceStep,
+    RuleTypeTrace,
+)
+from ..data.models.server import PricedConfiguration
 from ..rules import RulesEngine
+from ..rules.handlers.availability import AvailabilityHandler
+from .price_matrix import PriceMatrix
+
+T = TypeVar("T")
 
 
 class ServerService:
     """Service for server configuration logic using the pre-configured rules engine."""
 
-    def __init__(self, rule_engine: RulesEngine):
+    def __init__(
+        self,
+        rule_engine: RulesEngine,
+        configuration_cache: Optional[LRUCache[PricedConfiguration]] = None,
+        price_matrix: Optional[PriceMatrix] = None,
+        options_cache: Optional[LRUCache[bytes]] = None,
+    ):
         self.rule_engine = rule_engine
+        self.configuration_cache = configuration_cache
+        self.options_cache = options_cache
+        # only usable while it was built from the snapshot this request runs on
+        if price_matrix is not None and price_matrix.data_provider is not rule_engine.data_provider:
+            price_matrix = None
+        self.price_matrix = price_matrix
 
     def get_server_configuration(self, configuration: dict[str, str]) -> ServerConfigurationResponse:
+        priced = self._get_priced_configuration(configuration)
+        if priced.error is not None:
+            raise ValueError(priced.error)
+        return priced.response
+
+    def get_server_configurations(
+        self, configurations: list[dict[str, str]]
+    ) -> list[PricedConfiguration]:
+        """Price a batch of configurations, one result per item, in input order.
+
+        Identical configurations are priced once per batch, and every distinct
+        one goes through the shared cache, so repeats across batches and
+        single requests reuse the same rule evaluation.
+        """
+        priced_by_key: dict[frozenset, PricedConfiguration] = {}
+        results = []
+        for configuration in configurations:
+            key = frozenset(configuration.items())
+            priced = priced_by_key.get(key)
+            if priced is None:
+                priced = self._get_priced_configuration(configuration)
+                priced_by_key[key] = priced
+            results.append(priced)
+        return results
+
+    def _get_priced_configuration(self, configuration: dict[str, str]) -> PricedConfiguration:
+        if self.price_matrix is not None:
+            priced = self.price_matrix.lookup(configuration)
+            if metrics.enabled:
+                PRICE_MATRIX_LOOKUPS.labels("miss" if priced is None else "hit").inc()
+            if priced is not None:
+                return priced
+
+        return self._cached(
+            self.configuration_cache, configuration, self._try_price_configuration
+        )
+
+    def _cached(
+        self,
+        cache: Optional[LRUCache[T]],
+        configuration: dict[str, str],
+        compute: Callable[[dict[str, str]], T],
+    ) -> T:
+        if cache is None or not cache.enabled:
+            return compute(configuration)
+
+        # the catalog version is part of the key, so a request still running on
+        # a superseded snapshot can never store or read results for the new one
+        version = self.rule_engine.data_provider.version
+        cache.bind(version)
+        key = (version, frozenset(configuration.items()))
+        value = cache.get(key)
+        if value is None:
+            value = compute(configuration)
+            if version == cache.generation:
+                cache.put(key, value)
+        return value
+
+    def _try_price_configuration(self, configuration: dict[str, str]) -> PricedConfiguration:
+        try:
+            return PricedConfiguration(
+                response=self._price_configuration(configuration), error=None
+            )
+        except ValueError as e:
+            return PricedConfiguration(response=None, error=str(e))
+
+    def _price_configuration(self, configuration: dict[str, str]) -> ServerConfigurationResponse:
         validation_context = RuleContext(configuration=configuration)
         validation_result = self.rule_engine.process_rules("validation", validation_context)
         if not validation_result.is_valid:
@@ -27,17 +124,120 @@ class ServerService:
             is_valid=True,
         )
 
+    def explain_server_configuration(
+        self, configuration: dict[str, str]
+    ) -> ExplainedServerConfiguration:
+        """Price a configuration through the rules engine, tracing every step.
+
+        Caches and the price matrix are bypassed, so the trace always shows
+        the rules at work; `price_matrix_hit` tells whether the normal path
+        would have been served by the matrix instead.
+        """
+        start = time.perf_counter()
+        traces: list[RuleTypeTrace] = []
+        steps: list[PriceStep] = []
+        response, error = None, None
+        try:
+            response = self._explain_pricing(configuration, traces, steps)
+        except ValueError as e:
+            error = str(e)
+        total_time = time.perf_counter() - start
+
+        price_matrix_hit = None
+        if self.price_matrix is not None:
+            price_matrix_hit = self.price_matrix.lookup(configuration) is not None
+
+        return ExplainedServerConfiguration(
+            configuration=response,
+            error=error,
+            explain=ConfigurationExplanation(
+                rules=traces,
+                price_steps=steps,
+                price_matrix_hit=price_matrix_hit,
+                total_time_ms=total_time * 1000,
+            ),
+        )
+
+    def _explain_pricing(
+        self,
+        configuration: dict[str, str],
+        traces: list[RuleTypeTrace],
+        steps: list[PriceStep],
+    ) -> ServerConfigurationResponse:
+        """`_price_configuration`, recording rule traces and each price step."""
+        context = RuleContext(configuration=configuration)
+        validation_result, trace = self.rule_engine.explain_rules("validation", context)
+        traces.append(trace)
+        if not validation_result.is_valid:
+            raise ValueError("; ".join(validation_result.error_messages))
+
+        data_provider = self.rule_engine.data_provider
+        total = data_provider.get_base_price()
+        steps.append(PriceStep(kind="base_price", source="base_pricing", amount=total, subtotal=total))
+        for option_id in configuration.values():
+            if option_id:
+                option_price = data_provider.get_option_price(option_id)
+                total += option_price
+                steps.append(
+                    PriceStep(kind="option", source=option_id, amount=option_price, subtotal=total)
+                )
+
+        (total_discount, descriptions), trace = self.rule_engine.explain_rules("discount", context)
+        traces.append(trace)
+
+        # discounts accumulate, so each matched rule's share is what it yields alone
+        handler = self.rule_engine.handler_registry.get_handler("discount")
+        rules_by_id = {rule.id: rule for rule in data_provider.get_rules_by_type("discount")}
+        subtotal = total
+        for rule_id in trace.matched:
+            amount, _ = handler.execute([rules_by_id[rule_id]], context)
+            if amount > 0:
+                subtotal -= amount
+                steps.append(
+                    PriceStep(kind="discount", source=rule_id, amount=-amount, subtotal=subtotal)
+                )
+
+        return ServerConfigurationResponse(
+            current_selection=configuration,
+            total_price=total - total_discount,
+            total_discount=total_discount if total_discount > 0 else None,
+            discount_descriptions=descriptions,
+            is_valid=True,
+        )
+
+    def render_server_options(
+        self,
+        current_configuration: dict[str, str],
+        render: Callable[[dict[str, List[ServerOption]]], bytes],
+    ) -> bytes:
+        """Options listing for a selection, rendered by `render` and cached as bytes.
+
+        Renderings are cached per selection and catalog version, so `render`
+        must depend on nothing but the listing.
+        """
+        return self._cached(
+            self.options_cache,
+            current_configuration,
+            lambda configuration: render(self.get_server_options(configuration)),
+        )
+
     def get_server_options(self, current_configuration: Optional[dict[str, str]] = None) -> dict[str, List[ServerOption]]:
         options_by_category = {}
 
         categories = self.rule_engine.data_provider.get_all_categories()
 
+        availability_index = self._availability_index() if current_configuration else None
+        if availability_index is not None:
+            matching_rules = availability_index.matching_rules(current_configuration)
+
         for category in categories:
             category_options = []
             available_options = self.rule_engine.data_provider.get_available_options_by_category(category.id)
 
             for option in available_options:
-                if current_configuration:
+                if availability_index is not None:
+                    is_available = availability_index.is_available(option.id, matching_rules)
+                elif current_configuration:
                     availability_context = RuleContext(
                         configuration=current_configuration,
                         current_option=option
@@ -57,6 +257,56 @@ class ServerService:
 
         return options_by_category
 
+    def explain_server_options(
+        self, current_configuration: dict[str, str]
+    ) -> ExplainedServerOptions:
+        """`get_server_options` with every availability decision traced through the rules engine."""
+        start = time.perf_counter()
+        data_provider = self.rule_engine.data_provider
+        options_by_category = {}
+        availability = []
+
+        for category in data_provider.get_all_categories():
+            category_options = []
+            for option in data_provider.get_available_options_by_category(category.id):
+                is_available = option.available
+                if current_configuration:
+                    context = RuleContext(
+                        configuration=current_configuration, current_option=option
+                    )
+                    is_available, trace = self.rule_engine.explain_rules("availability", context)
+                    availability.append(
+                        OptionAvailabilityTrace(
+                            option_id=option.id, available=is_available, trace=trace
+                        )
+                    )
+
+                category_options.append(ServerOption(
+                    id=option.id,
+                    display_name=option.display_name,
+                    price=option.price,
+                    available=is_available,
+                ))
+
+            options_by_category[category.id] = category_options
+
+        return ExplainedServerOptions(
+            options=options_by_category,
+            explain=OptionsExplanation(
+                availability=availability,
+                availability_index=self._availability_index() is not None,
+                total_time_ms=(time.perf_counter() - start) * 1000,
+            ),
+        )
+
+    def _availability_index(self) -> Optional[AvailabilityIndex]:
+        # the index encodes AvailabilityHandler's semantics; any other handler
+        # registered for availability goes through the rules engine
+        handler = self.rule_engine.handler_registry.get_handler("availability")
+        if type(handler) is not AvailabilityHandler:
+            return None
+        return self.rule_engine.data_provider.get_availability_index()
+
     def _calculate_pricing(self, configuration: dict[str, str]) -> tuple[Decimal, Decimal, List[str]]:
         total = self.rule_engine.data_provider.get_base_price()
 
@@ -0,0 +1,93 @@
+"""
+Minimal in-process ASGI client used by the HTTP benchmarks.
+
+Requests are dispatched straight into the application callable, so the
+numbers include routing, middleware, validation and serialization but no
+socket or server overhead.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+
+class ASGIResponse:
+
+    def __init__(self, status_code: int, headers: list[tuple[bytes, bytes]], body: bytes):
+        self.status_code = status_code
+        self.headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in headers}
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+async def request(
+    app,
+    method: str,
+    path: str,
+    query: str = "",
+    json_body: Optional[Any] = None,
+    headers: Optional[dict[str, str]] = None,
+) -> ASGIResponse:
+    body = b"" if json_body is None else json.dumps(json_body).encode("utf-8")
+    raw_headers = [(b"host", b"benchmark")]
+    if json_body is not None:
+        raw_headers.append((b"content-type", b"application/json"))
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    for key, value in (headers or {}).items():
+        raw_headers.append((key.lower().encode("latin-1"), value.encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("utf-8"),
+        "root_path": "",
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+        "state": {},
+    }
+
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # like a real client, stay connected until the response is complete;
+        # streaming responses stop as soon as they see a disconnect
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    status_code = 0
+    response_headers: list[tuple[bytes, bytes]] = []
+    chunks: list[bytes] = []
+
+    async def send(message: dict) -> None:
+        nonlocal status_code, response_headers
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(scope, receive, send)
+    return ASGIResponse(status_code, response_headers, b"".join(chunks))
+
+
+@asynccontextmanager
+async def running(app) -> AsyncIterator[None]:
+    """Run the application's lifespan around a benchmark."""
+    async with app.router.lifespan_context(app):
+        yield
@@ -0,0 +1,111 @@
+"""
+Benchmark: pre-rendered `/servers/options` bytes against response_model serialization.
+
+Times the options route, which serves JSON rendered once per selection and
+catalog snapshot, against a copy of the previous route that returns the
+`BaseResponse` model for FastAPI to validate and serialize on every request.
+Both go through the full in-process ASGI stack with warm caches, and their
+bodies are checked to be identical.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.catalog_responses
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+SELECTIONS = (
+    "",
+    "cpu_architecture=arm64",
+    "cpu_architecture=amd_ryzen_9&ram=ram_32gb&os=ubuntu",
+)
+
+
+def _install_model_route(app) -> str:
+    """Register the options route as it was: a model serialized per request."""
+    from typing import Dict, List
+
+    from fastapi import Depends, Request
+
+    from backend.app.api.dependencies import get_server_service2
+    from backend.app.api.routes.servers import extract_configuration
+    from backend.app.data.models import ServerOption
+    from backend.app.data.models.responses import BaseResponse
+    from backend.app.services.server import ServerService
+
+    async def get_server_options_model(
+        request: Request, service: ServerService = Depends(get_server_service2)
+    ):
+        return BaseResponse.success(
+            message="Server options retrieved successfully.",
+            data=service.get_server_options(extract_configuration(request)),
+        )
+
+    path = "/benchmark/servers/options/model"
+    app.add_api_route(
+        path,
+        get_server_options_model,
+        methods=["GET"],
+        response_model=BaseResponse[Dict[str, List[ServerOption]]],
+    )
+    return path
+
+
+async def _measure(app, path: str, requests: int) -> list[float]:
+    from .asgi import request
+
+    latencies = []
+    for i in range(requests):
+        query = SELECTIONS[i % len(SELECTIONS)]
+        start = time.perf_counter()
+        response = await request(app, "GET", path, query)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        assert response.status_code == 200, response.body
+    return latencies
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from backend.app.main import app
+
+    from .asgi import request, running
+
+    model_path = _install_model_route(app)
+    rendered_path = "/api/v1/servers/options"
+    async with running(app):
+        for query in SELECTIONS:
+            rendered = await request(app, "GET", rendered_path, query)
+            model = await request(app, "GET", model_path, query)
+            assert rendered.body == model.body, query
+
+        results = {}
+        for label, path in (("response_model", model_path), ("pre-rendered", rendered_path)):
+            await _measure(app, path, 200)  # warm-up
+            results[label] = await _measure(app, path, args.requests)
+
+    print(f"/servers/options, {args.requests} requests over {len(SELECTIONS)} selections")
+    for label, latencies in results.items():
+        print(
+            f"  {label:<16} p50={statistics.median(latencies):8.1f} us"
+            f"  mean={statistics.fmean(latencies):8.1f} us"
+        )
+    saving = statistics.median(results["response_model"]) - statistics.median(
+        results["pre-rendered"]
+    )
+    print(f"  saving per request: {saving:.1f} us (p50)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Scaling report: catalog load time, memory and request latency by catalog size.
+
+For each size, generates a seeded synthetic catalog (see
+`synthetic_catalog`) into a temporary directory and measures:
+
+- load: parsing, validating and indexing the catalog into a rules engine,
+  plus the price matrix build (which is skipped once the option space
+  exceeds PRICE_MATRIX_MAX_CELLS), best of `--rounds`; then the same with
+  a warm catalog snapshot cache, as after a restart with unchanged files;
+- memory: bytes still allocated once the snapshot is built, and the peak
+  while building it, under tracemalloc (timed separately, as tracing slows
+  allocation down several times);
+- latency: pricing full configurations and listing options for partial
+  selections through `ServerService`, with the response caches off so every
+  request does the work, and opening and id lookups against the generated
+  quote log.
+
+The app itself always serves the bundled store, so requests are measured at
+the service layer; routing and serialization add a constant on top that
+does not grow with the catalog.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.catalog_scaling
+    python -m backend.benchmarks.catalog_scaling --presets small medium --requests 50
+    python -m backend.benchmarks.catalog_scaling --output scaling.json
+"""
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .synthetic_catalog import PRESETS, CatalogSize, generate_catalog
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _build_snapshot(paths: dict[str, Path], snapshot_cache=None):
+    from backend.app.core.catalog import CatalogSnapshot
+    from backend.app.core.settings import settings
+    from backend.app.data.provider import DataProvider
+    from backend.app.rules import initialize_rule_engine
+    from backend.app.rules.handlers import initialize_handler_registry
+    from backend.app.services.price_matrix import build_price_matrix
+
+    data_provider = DataProvider(
+        categories_file=paths["categories.jsonl"],
+        options_file=paths["options.jsonl"],
+        rules_file=paths["rules.jsonl"],
+        settings_file=paths["settings.jsonl"],
+        snapshot_cache=snapshot_cache,
+    )
+    rule_engine = initialize_rule_engine(data_provider, initialize_handler_registry(data_provider))
+    price_matrix = None
+    if settings.PRICE_MATRIX_ENABLED:
+        price_matrix = build_price_matrix(rule_engine, settings.PRICE_MATRIX_MAX_CELLS)
+    return CatalogSnapshot(rule_engine, price_matrix)
+
+
+def _configurations(data_provider, count: int, rng: random.Random, share: float) -> list[dict[str, str]]:
+    """Random selections; each category is picked with probability `share`."""
+    selections = []
+    for _ in range(count):
+        selection = {}
+        for category in data_provider.get_all_categories():
+            if share >= 1 or rng.random() < share:
+                options = data_provider.get_available_options_by_category(category.id)
+                selection[category.id] = rng.choice(options).id
+        selections.append(selection)
+    return selections
+
+
+def _latencies(call: Callable[[Any], Any], inputs: list) -> dict[str, float]:
+    samples = []
+    for value in inputs:
+        start = time.perf_counter()
+        call(value)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {
+        "p50_us": statistics.median(samples),
+        "p95_us": _percentile(samples, 95),
+    }
+
+
+def measure(size: CatalogSize, seed: int = 42, requests: int = 100, rounds: int = 3) -> dict[str, Any]:
+    """Generate a catalog of `size` and measure it; all times are wall-clock."""
+    from backend.app.data.quotes import JsonlQuoteRepository
+    from backend.app.data.snapshot_cache import CatalogSnapshotCache
+    from backend.app.services.server import ServerService
+
+    with tempfile.TemporaryDirectory(prefix="catalog-scaling-") as tmp:
+        start = time.perf_counter()
+        paths = generate_catalog(Path(tmp), size, seed)
+        generate_seconds = time.perf_counter() - start
+        catalog_bytes = sum(
+            path.stat().st_size for name, path in paths.items() if name != "quotes.jsonl"
+        )
+
+        def timed_loads(snapshot_cache=None) -> list[float]:
+            seconds = []
+            for _ in range(rounds):
+                gc.collect()
+                start = time.perf_counter()
+                snapshot = _build_snapshot(paths, snapshot_cache)
+                seconds.append(time.perf_counter() - start)
+                del snapshot
+            return seconds
+
+        load_seconds = timed_loads()
+        snapshot_cache = CatalogSnapshotCache(Path(tmp) / "snapshots")
+        warmed = _build_snapshot(paths, snapshot_cache).rule_engine.data_provider
+        assert warmed.snapshot_cache_hit is False
+        del warmed
+        cached_load_seconds = timed_loads(snapshot_cache)
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            snapshot = _build_snapshot(paths)
+            gc.collect()
+            retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        rng = random.Random(seed)
+        data_provider = snapshot.rule_engine.data_provider
+        service = ServerService(snapshot.rule_engine, price_matrix=snapshot.price_matrix)
+        configure = _latencies(
+            service._try_price_configuration,
+            _configurations(data_provider, requests, rng, share=1.0),
+        )
+        # a selection a few steps into the configurator, across the catalog
+        options = _latencies(
+            service.get_server_options,
+            _configurations(data_provider, requests, rng, share=0.1),
+        )
+
+        with open(paths["quotes.jsonl"], encoding="utf-8") as file:
+            quote_ids = [json.loads(line)["id"] for line in file]
+        start = time.perf_counter()
+        repository = JsonlQuoteRepository(paths["quotes.jsonl"], cache_size=0)
+        quote_open_seconds = time.perf_counter() - start
+        try:
+            quote_lookup = None
+            if quote_ids:
+                quote_lookup = _latencies(repository.get, rng.choices(quote_ids, k=requests))
+        finally:
+            repository.close()
+
+    return {
+        "size": size._asdict(),
+        "catalog_mib": catalog_bytes / 2**20,
+        "generate_ms": generate_seconds * 1000,
+        "load_ms": min(load_seconds) * 1000,
+        "cached_load_ms": min(cached_load_seconds) * 1000,
+        "price_matrix": snapshot.price_matrix is not None,
+        "retained_mib": retained_bytes / 2**20,
+        "peak_mib": peak_bytes / 2**20,
+        "configure": configure,
+        "options": options,
+        "quote_open_ms": quote_open_seconds * 1000,
+        "quote_lookup": quote_lookup,
+    }
+
+
+def _report(result: dict[str, Any]) -> None:
+    size = result["size"]
+    print(
+        f"{size['categories']} categories, {size['options']} options, "
+        f"{size['rules']} rules, {size['quotes']} quotes "
+        f"({result['catalog_mib']:.2f} MiB of catalog JSONL)"
+    )
+    matrix = "with price matrix" if result["price_matrix"] else "no price matrix"
+    print(f"  load:      {result['load_ms']:10.1f} ms ({matrix})")
+    print(f"  cached:    {result['cached_load_ms']:10.1f} ms from the snapshot cache")
+    print(f"  memory:    {result['retained_mib']:10.1f} MiB retained, {result['peak_mib']:.1f} MiB peak")
+    for label, key in (("configure", "configure"), ("options", "options"), ("quote get", "quote_lookup")):
+        latency: Optional[dict[str, float]] = result[key]
+        if latency is not None:
+            print(f"  {label + ':':<10} {latency['p50_us']:10.1f} us p50, {latency['p95_us']:.1f} us p95")
+    print(f"  quote log: {result['quote_open_ms']:10.1f} ms to open and index")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--presets",
+        nargs="+",
+        choices=sorted(PRESETS),
+        default=["shipped", "small", "medium", "large"],
+        help="catalog sizes to measure, in order",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=100, help="requests timed per endpoint")
+    parser.add_argument("--rounds", type=int, default=3, help="catalog loads timed per size")
+    parser.add_argument("--output", type=Path, help="also write the results here as JSON")
+    args = parser.parse_args()
+
+    # configure logging, and keep the price matrix build quiet
+    import backend.app.main  # noqa: F401
+
+    results = []
+    for preset in args.presets:
+        result = measure(PRESETS[preset], args.seed, args.requests, args.rounds)
+        result["preset"] = preset
+        _report(result)
+        results.append(result)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({"seed": args.seed, "results": results}, indent=2) + "\n")
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
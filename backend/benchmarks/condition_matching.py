@@ -0,0 +1,107 @@
+"""
+Micro-benchmark: ConditionEvaluator against compiled rule predicates and
+indexed candidate lookup (`RuleConditionIndex`).
+
+Their equivalence is checked over randomized catalogs in
+tests/test_condition_index.py.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.condition_matching
+"""
+
+import random
+import timeit
+
+from backend.app.data import initialize_data_provider
+from backend.app.data.compiler import compile_rules
+from backend.app.data.indexes import RuleConditionIndex
+from backend.app.data.models import Rule, RuleContext
+from backend.app.rules import ConditionEvaluator
+
+
+def _synthetic_rules(data_provider, count: int, rng: random.Random) -> list[Rule]:
+    category_ids = [category.id for category in data_provider.categories]
+    rules = []
+    for i in range(count):
+        conditions: dict = {}
+        for category_id in rng.sample(category_ids, rng.randint(1, 3)):
+            options = data_provider.get_options_by_category(category_id)
+            conditions[category_id] = [
+                option.id for option in rng.sample(options, rng.randint(1, len(options)))
+            ]
+        if rng.random() < 0.3:
+            conditions["option_category"] = rng.sample(category_ids, 2)
+        if rng.random() < 0.3:
+            conditions["option_values"] = [option.id for option in rng.sample(data_provider.options, 3)]
+        if rng.random() < 0.3:
+            conditions["missing_categories"] = rng.sample(category_ids, 2)
+        rules.append(
+            Rule(
+                id=f"rule_{i}",
+                name=f"Rule {i}",
+                type="validation",
+                conditions=conditions,
+                actions={},
+                priority=i,
+                active=True,
+            )
+        )
+    return rules
+
+
+def _synthetic_contexts(data_provider, count: int, rng: random.Random) -> list[RuleContext]:
+    contexts = []
+    for _ in range(count):
+        configuration = {
+            category.id: rng.choice(data_provider.get_options_by_category(category.id)).id
+            for category in data_provider.categories
+            if rng.random() < 0.9
+        }
+        current_option = rng.choice(data_provider.options) if rng.random() < 0.5 else None
+        contexts.append(RuleContext(configuration=configuration, current_option=current_option))
+    return contexts
+
+
+def main(rule_count: int = 1000, context_count: int = 100, repeat: int = 5) -> None:
+    rng = random.Random(42)
+    data_provider = initialize_data_provider()
+    rules = _synthetic_rules(data_provider, rule_count, rng)
+    contexts = _synthetic_contexts(data_provider, context_count, rng)
+
+    evaluator = ConditionEvaluator()
+    compiled = compile_rules(rules)
+
+    def run_evaluator() -> int:
+        return sum(
+            evaluator.matches_conditions(rule.conditions, context)
+            for context in contexts
+            for rule in rules
+        )
+
+    def run_compiled() -> int:
+        return sum(entry.matches(context) for context in contexts for entry in compiled)
+
+    index = RuleConditionIndex(compiled)
+
+    def run_indexed() -> int:
+        return sum(
+            entry.matches(context)
+            for context in contexts
+            for entry in index.candidates(context)
+        )
+
+    evaluations = rule_count * context_count
+    baseline = min(timeit.repeat(run_evaluator, number=1, repeat=repeat))
+    optimized = min(timeit.repeat(run_compiled, number=1, repeat=repeat))
+    indexed = min(timeit.repeat(run_indexed, number=1, repeat=repeat))
+
+    print(f"{evaluations} rule evaluations ({rule_count} rules x {context_count} contexts)")
+    print(f"  ConditionEvaluator: {baseline * 1e9 / evaluations:8.1f} ns/eval")
+    print(f"  compiled predicate: {optimized * 1e9 / evaluations:8.1f} ns/eval")
+    print(f"  indexed candidates: {indexed * 1e9 / evaluations:8.1f} ns/eval")
+    print(f"  speedup:            {baseline / optimized:8.2f}x compiled, {baseline / indexed:.2f}x indexed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: request throughput with the access-log middleware as plain ASGI
+against the previous `BaseHTTPMiddleware` implementation.
+
+Builds two copies of the application that differ only in that middleware
+and drives `/health` and `/servers/configure` with concurrent in-process
+clients, reporting requests per second for each. The access log is emitted
+as configured (`LOG_LEVEL`), identically in both copies.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.middleware_throughput
+    python -m backend.benchmarks.middleware_throughput --requests 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+ENDPOINTS = (
+    ("/health", ""),
+    (
+        "/api/v1/servers/configure",
+        "cpu_architecture=amd_ryzen_9&cpu_cores=cores_8&ram=ram_32gb&storage=ssd_1tb&os=ubuntu",
+    ),
+)
+
+
+def _base_http_middleware():
+    """The access-log middleware as it was, on top of `BaseHTTPMiddleware`."""
+    import structlog
+    from asgi_correlation_id.context import correlation_id
+    from fastapi import Request, Response
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    from backend.app.middleware.requests import (
+        HttpRequestLoggingMiddleware,
+        access_logger,
+    )
+
+    class BaseHttpRequestLoggingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next) -> Response:
+            structlog.contextvars.clear_contextvars()
+
+            request_id = correlation_id.get()
+            structlog.contextvars.bind_contextvars(request_id=request_id)
+
+            start_time = time.perf_counter_ns()
+            response = Response("Internal Server Error", status_code=500)
+            try:
+                response = await call_next(request)
+            except Exception:
+                structlog.stdlib.get_logger("api.error").exception("Unhandled exception.")
+                raise
+            finally:
+                host = request.client.host
+                port = request.client.port
+                method = request.method
+                version = request.scope["http_version"]
+                status_code = response.status_code
+                url = HttpRequestLoggingMiddleware._get_path_with_query_string(request.scope)
+
+                process_time = time.perf_counter_ns() - start_time
+                event = f"{host}:{port} - '{method} {url} HTTP/{version}' {status_code}"
+                access_logger.info(
+                    event,
+                    http={
+                        "url": str(request.url),
+                        "status_code": status_code,
+                        "method": method,
+                        "request_id": request_id,
+                        "version": version,
+                    },
+                    network={"client": {"ip": host, "port": port}},
+                    duration=process_time,
+                )
+            return response
+
+    return BaseHttpRequestLoggingMiddleware
+
+
+def _build_app(legacy: bool):
+    from starlette.middleware import Middleware
+
+    from backend.app import __version__
+    from backend.app.core.app import create_app
+    from backend.app.middleware.requests import HttpRequestLoggingMiddleware
+
+    app = create_app(version=__version__)
+    if legacy:
+        # the middleware stack is built on first call, so swapping here is enough
+        app.user_middleware = [
+            Middleware(_base_http_middleware())
+            if middleware.cls is HttpRequestLoggingMiddleware
+            else middleware
+            for middleware in app.user_middleware
+        ]
+    return app
+
+
+async def _throughput(app, path: str, query: str, requests: int, concurrency: int) -> float:
+    from .asgi import request
+
+    remaining = [requests]
+
+    async def client() -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            response = await request(app, "GET", path, query)
+            assert response.status_code == 200, response.body
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from .asgi import running
+
+    results: dict[str, dict[str, float]] = {}
+    for label, legacy in (("BaseHTTPMiddleware", True), ("pure ASGI", False)):
+        app = _build_app(legacy)
+        async with running(app):
+            for path, query in ENDPOINTS:
+                await _throughput(app, path, query, args.requests // 10, args.concurrency)
+                rps = await _throughput(app, path, query, args.requests, args.concurrency)
+                results.setdefault(path, {})[label] = rps
+
+    print(
+        f"requests/s, {args.requests} requests per endpoint, "
+        f"{args.concurrency} concurrent clients (in-process ASGI)"
+    )
+    print(f"  {'':28}{'BaseHTTPMiddleware':>20}{'pure ASGI':>12}{'change':>10}")
+    for path, by_label in results.items():
+        before, after = by_label["BaseHTTPMiddleware"], by_label["pure ASGI"]
+        print(f"  {path:28}{before:20.0f}{after:12.0f}{(after / before - 1) * 100:+9.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
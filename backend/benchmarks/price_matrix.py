@@ -0,0 +1,89 @@
+"""
+Benchmark: precomputed price matrix against rules-engine pricing.
+
+Builds the price matrix for the bundled catalog, checks that it prices every
+fully specified configuration exactly as the rules engine does, then times
+`ServerService.get_server_configuration` with and without the matrix (the
+priced-configuration cache is left out of both, so every call does the work).
+
+Run from the repository root:
+
+    python -m backend.benchmarks.price_matrix
+"""
+
+import argparse
+import itertools
+import os
+import random
+import timeit
+
+
+def full_configurations(data_provider) -> list[dict[str, str]]:
+    """Every fully specified configuration of the catalog, one option per category."""
+    categories = data_provider.get_all_categories()
+    options = [data_provider.get_options_by_category(category.id) for category in categories]
+    return [
+        {category.id: option.id for category, option in zip(categories, combination)}
+        for combination in itertools.product(*options)
+    ]
+
+
+def serialized_price(service, configuration: dict[str, str]):
+    """Price a configuration as `(response JSON, None)` or `(None, validation error)`."""
+    try:
+        response = service.get_server_configuration(configuration)
+    except ValueError as e:
+        return None, str(e)
+    # serialized, so prices must match in representation ("5.800"), not just value
+    return response.model_dump_json(), None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from backend.app.core.catalog import build_rule_engine
+    from backend.app.services.price_matrix import build_price_matrix
+    from backend.app.services.server import ServerService
+
+    rule_engine = build_rule_engine()
+    matrix = build_price_matrix(rule_engine, max_cells=10_000_000)
+    if matrix is None:
+        raise SystemExit("price matrix unavailable (is numpy installed?)")
+
+    engine_service = ServerService(rule_engine)
+    matrix_service = ServerService(rule_engine, price_matrix=matrix)
+    configurations = full_configurations(rule_engine.data_provider)
+    for configuration in configurations:
+        expected = serialized_price(engine_service, configuration)
+        assert serialized_price(matrix_service, configuration) == expected, configuration
+        assert matrix.lookup(configuration) is not None, configuration
+
+    rng = random.Random(42)
+    sample = rng.choices(configurations, k=args.lookups)
+
+    def run(service) -> None:
+        for configuration in sample:
+            serialized_price(service, configuration)
+
+    engine = min(timeit.repeat(lambda: run(engine_service), number=1, repeat=args.repeat))
+    matrix_time = min(timeit.repeat(lambda: run(matrix_service), number=1, repeat=args.repeat))
+
+    report = matrix.report
+    print(f"price matrix {'x'.join(map(str, report.dimensions))} = {report.cells} configurations")
+    print(f"  build:        {report.build_ms:10.2f} ms")
+    print(f"  memory:       {report.nbytes:10d} bytes")
+    print(f"  valid cells:  {report.valid_cells:10d}")
+    print(f"  exact cells:  {report.exact_cells:10d}")
+    print(f"  equivalence:  {len(configurations):10d} configurations match the rules engine")
+    print(f"{args.lookups} configure calls (no priced-configuration cache)")
+    print(f"  rules engine: {engine * 1e6 / args.lookups:10.1f} us/call")
+    print(f"  price matrix: {matrix_time * 1e6 / args.lookups:10.1f} us/call")
+    print(f"  speedup:      {engine / matrix_time:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: JSONL and SQLite quote storage backends side by side.
+
+For each backend, measures insert throughput for single-quote commits and
+for group-commit sized batches, then id lookup latency for hits and misses
+(with the decoded-quote cache disabled, so every lookup reaches storage) and
+the time to list every quote. Each backend writes to its own temporary
+directory, never to the bundled data store.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.quote_storage
+    python -m backend.benchmarks.quote_storage --quotes 50000 --fsync
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _quotes(count: int) -> list:
+    from backend.app.data.models.quote import Quote
+
+    return [
+        Quote(
+            configuration={"cpu_architecture": "amd_ryzen_9", "ram": "ram_32gb"},
+            contact_name="Load Test",
+            contact_email=f"load{i % 500}@example.com",
+            company="Example",
+            total_price=1299.0,
+            total_discount=50.0,
+        )
+        for i in range(count)
+    ]
+
+
+def _open(backend: str, directory: Path):
+    from backend.app.data.quotes import JsonlQuoteRepository, SqliteQuoteRepository
+
+    if backend == "sqlite":
+        return SqliteQuoteRepository(directory / "quotes.sqlite3", cache_size=0)
+    return JsonlQuoteRepository(
+        directory / "quotes.jsonl", cache_size=0, segment_max_bytes=8 * 1024 * 1024
+    )
+
+
+def _run(backend: str, args: argparse.Namespace) -> dict[str, float]:
+    directory = Path(tempfile.mkdtemp(prefix=f"quote-storage-{backend}-"))
+    try:
+        repository = _open(backend, directory)
+        singles = _quotes(args.single_inserts)
+        batched = _quotes(args.quotes)
+
+        start = time.perf_counter()
+        for quote in singles:
+            repository.append_many([quote], fsync=args.fsync)
+        single_rate = len(singles) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(0, len(batched), args.batch_size):
+            repository.append_many(batched[i : i + args.batch_size], fsync=args.fsync)
+        batch_rate = len(batched) / (time.perf_counter() - start)
+
+        rng = random.Random(42)
+        ids = [quote.id for quote in singles + batched]
+        hits = []
+        for quote_id in rng.choices(ids, k=args.lookups):
+            start = time.perf_counter()
+            assert repository.get(quote_id) is not None
+            hits.append((time.perf_counter() - start) * 1e6)
+
+        misses = []
+        for i in range(args.lookups):
+            start = time.perf_counter()
+            assert repository.get(f"missing-{i}") is None
+            misses.append((time.perf_counter() - start) * 1e6)
+
+        start = time.perf_counter()
+        listed = sum(1 for _ in repository.iter_records())
+        scan_seconds = time.perf_counter() - start
+        assert listed == len(ids), (listed, len(ids))
+
+        repository.close()
+        return {
+            "single": single_rate,
+            "batch": batch_rate,
+            "hit_p50": statistics.median(hits),
+            "hit_p99": _percentile(hits, 99),
+            "miss_p50": statistics.median(misses),
+            "miss_p99": _percentile(misses, 99),
+            "scan_ms": scan_seconds * 1000,
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--quotes", type=int, default=20000, help="quotes inserted in batches")
+    parser.add_argument("--single-inserts", type=int, default=1000, help="quotes inserted one by one")
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--fsync", action="store_true", help="make every commit durable")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    results = {backend: _run(backend, args) for backend in ("jsonl", "sqlite")}
+
+    durability = "fsync" if args.fsync else "no fsync"
+    print(
+        f"{args.single_inserts} single + {args.quotes} batched inserts "
+        f"(batch {args.batch_size}, {durability}), {args.lookups} lookups"
+    )
+    print(f"  {'':24}{'jsonl':>12}{'sqlite':>12}")
+    rows = [
+        ("single inserts/s", "single", "{:12.0f}"),
+        ("batched inserts/s", "batch", "{:12.0f}"),
+        ("lookup hit p50 (us)", "hit_p50", "{:12.1f}"),
+        ("lookup hit p99 (us)", "hit_p99", "{:12.1f}"),
+        ("lookup miss p50 (us)", "miss_p50", "{:12.1f}"),
+        ("lookup miss p99 (us)", "miss_p99", "{:12.1f}"),
+        ("full listing (ms)", "scan_ms", "{:12.1f}"),
+    ]
+    for label, key, fmt in rows:
+        values = "".join(fmt.format(results[backend][key]) for backend in results)
+        print(f"  {label:24}{values}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Concurrency check: configure-request latency while quotes are written heavily.
+
+Measures `/servers/configure` latency on its own, then again while a pool of
+concurrent clients keeps `POST /quotes/requests` busy at a steady rate with
+an fsync per batch. Fails if the median degrades beyond `--max-slowdown` or
+the p95/p99 tail beyond `--max-tail-slowdown`: event-loop stalls behind a
+disk write show up in the tail first. Quotes go to a temporary file, never
+to the bundled data store. `tests/test_quote_write_contention.py` runs the
+same check under pytest.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.quote_write_contention
+    python -m backend.benchmarks.quote_write_contention --blocking  # old behaviour
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+CONFIGURE_QUERY = (
+    "cpu_architecture=amd_ryzen_9&cpu_cores=cores_8&ram=ram_32gb&storage=ssd_1tb&os=ubuntu"
+)
+QUOTE_REQUEST = {
+    "configuration": {
+        "cpu_architecture": "amd_ryzen_9",
+        "cpu_cores": "cores_8",
+        "ram": "ram_32gb",
+        "storage": "ssd_1tb",
+        "os": "ubuntu",
+    },
+    "contact_name": "Load Test",
+    "contact_email": "load@example.com",
+}
+
+
+TAIL_PERCENTILES = (95, 99)
+
+
+class ContentionResult(NamedTuple):
+
+    idle: list[float]
+    loaded: list[float]
+    quotes_written: int
+    elapsed: float
+
+    def slowdown(self, percentile: float) -> float:
+        return _percentile(self.loaded, percentile) / _percentile(self.idle, percentile)
+
+    def failures(self, max_slowdown: float, max_tail_slowdown: float) -> list[str]:
+        """Describe every percentile whose slowdown exceeds its limit."""
+        limits = [(50, max_slowdown)] + [(p, max_tail_slowdown) for p in TAIL_PERCENTILES]
+        return [
+            f"p{percentile} slowdown {self.slowdown(percentile):.2f}x > {limit:.2f}x"
+            for percentile, limit in limits
+            if self.slowdown(percentile) > limit
+        ]
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _measure_configure(app, requests: int) -> list[float]:
+    from .asgi import request
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await request(app, "GET", "/api/v1/servers/configure", CONFIGURE_QUERY)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.body
+        # yield so the writers get scheduled between probes
+        await asyncio.sleep(0)
+    return latencies
+
+
+def _install_blocking_route(app) -> str:
+    """Register the pre-async quote route: sync storage I/O on the event loop."""
+    from fastapi import Depends
+
+    from backend.app.api.dependencies import get_quote_service
+    from backend.app.data.models import QuoteRequest
+    from backend.app.services.quote import QuoteService
+
+    async def create_quote_blocking(
+        request: QuoteRequest, service: QuoteService = Depends(get_quote_service)
+    ):
+        return service.create_quote(request)
+
+    path = "/benchmark/quotes/blocking"
+    app.add_api_route(path, create_quote_blocking, methods=["POST"], status_code=201)
+    return path
+
+
+async def _write_quotes(
+    app, path: str, stop: asyncio.Event, written: list[int], interval: float, offset: float
+) -> None:
+    from .asgi import request
+
+    # stagger the writers; in lockstep they arrive as one burst per interval
+    await asyncio.sleep(offset)
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await request(app, "POST", path, json_body=QUOTE_REQUEST)
+        assert response.status_code == 201, response.body
+        written[0] += 1
+        # pace each writer so the loop is stressed by I/O, not saturated by CPU
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    print(
+        f"  {label:<22} p50={_percentile(latencies, 50):7.3f} ms"
+        f"  p95={_percentile(latencies, 95):7.3f} ms"
+        f"  p99={_percentile(latencies, 99):7.3f} ms"
+        f"  mean={statistics.fmean(latencies):7.3f} ms"
+    )
+
+
+async def measure_contention(
+    app, requests: int, writers: int, quote_rate: float, path: str = "/api/v1/quotes/requests"
+) -> ContentionResult:
+    """Measure configure latency idle and under a steady concurrent quote load."""
+    from .asgi import running
+
+    async with running(app):
+        await _measure_configure(app, 50)  # warm-up
+        idle = await _measure_configure(app, requests)
+
+        stop = asyncio.Event()
+        written = [0]
+        interval = writers / quote_rate
+        tasks = [
+            asyncio.create_task(
+                _write_quotes(app, path, stop, written, interval, i * interval / writers)
+            )
+            for i in range(writers)
+        ]
+        started = time.perf_counter()
+        loaded = await _measure_configure(app, requests)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    return ContentionResult(idle, loaded, written[0], elapsed)
+
+
+async def _run(args: argparse.Namespace) -> int:
+    from backend.app.main import app
+
+    path = _install_blocking_route(app) if args.blocking else "/api/v1/quotes/requests"
+    result = await measure_contention(
+        app, args.requests, args.writers, args.quote_rate, path=path
+    )
+
+    print(
+        f"configure latency, {args.requests} requests "
+        f"({args.writers} concurrent quote writers, target {args.quote_rate:.0f} quotes/s, "
+        f"{'blocking' if args.blocking else 'async'} quote path)"
+    )
+    _report("idle", result.idle)
+    _report("under quote load", result.loaded)
+    print(
+        f"  quotes written: {result.quotes_written} "
+        f"({result.quotes_written / result.elapsed:.0f}/s)"
+    )
+
+    failures = result.failures(args.max_slowdown, args.max_tail_slowdown)
+    slowdowns = ", ".join(
+        f"p{percentile} {result.slowdown(percentile):.2f}x"
+        for percentile in (50, *TAIL_PERCENTILES)
+    )
+    print(
+        f"  slowdown: {slowdowns} (limits {args.max_slowdown:.2f}x median, "
+        f"{args.max_tail_slowdown:.2f}x tail) {'FAIL' if failures else 'PASS'}"
+    )
+    for failure in failures:
+        print(f"    {failure}")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--quote-rate", type=float, default=100.0, help="target quotes/s")
+    parser.add_argument("--max-slowdown", type=float, default=2.0, help="p50 limit")
+    parser.add_argument("--max-tail-slowdown", type=float, default=3.0, help="p95/p99 limit")
+    parser.add_argument("--no-fsync", action="store_true", help="skip fsync per batch")
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="write quotes through the synchronous service on the event loop, for comparison",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["QUOTES_FILE_PATH"] = str(Path(directory) / "quotes.jsonl")
+        os.environ["QUOTE_WRITER_FSYNC"] = "false" if args.no_fsync else "true"
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Worker memory and lookup latency: a catalog per worker versus one shared catalog.
+
+Generates a seeded synthetic catalog (see `synthetic_catalog`), then starts
+`--workers` processes the way a multi-worker server would, once loading a
+private `DataProvider` in each and once mapping a single `SharedCatalog`
+built beforehand. Every worker reports, while all of them are alive:
+
+- memory: the growth of its proportional set size (PSS, from
+  /proc/self/smaps_rollup) over loading the catalog and building the rules
+  engine. Pages mapped by several processes count a fraction to each, so
+  the sum over workers is what the catalog costs the machine;
+- latency: `get_option_price`, `get_options_by_category`, rule candidates
+  and pricing full configurations through `ServerService`, with the
+  response caches off.
+
+Linux only. Run from the repository root:
+
+    python -m backend.benchmarks.shared_catalog
+    python -m backend.benchmarks.shared_catalog --preset large --workers 8
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from .catalog_scaling import _configurations, _latencies
+from .synthetic_catalog import PRESETS, generate_catalog
+
+FILES = ("categories.jsonl", "options.jsonl", "rules.jsonl", "settings.jsonl")
+
+
+def _pss_kib() -> int:
+    with open("/proc/self/smaps_rollup", encoding="ascii") as file:
+        for line in file:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    raise RuntimeError("no Pss in /proc/self/smaps_rollup")
+
+
+def _worker(directory: str, shared: bool, requests: int, seed: int, barrier, lock, results) -> None:
+    # spawned workers start fresh: configure logging here too
+    import backend.app.main  # noqa: F401
+    from backend.app.data.provider import DataProvider, SharedDataProvider
+    from backend.app.data.shared_catalog import SharedCatalog
+    from backend.app.rules import initialize_rule_engine
+    from backend.app.rules.handlers import initialize_handler_registry
+
+    files = [Path(directory) / filename for filename in FILES]
+    before_kib = _pss_kib()
+    start = time.perf_counter()
+    if shared:
+        [path] = (Path(directory) / "shared").glob("catalog-*.shared")
+        data_provider = SharedDataProvider(SharedCatalog(path))
+    else:
+        data_provider = DataProvider(*files)
+    rule_engine = initialize_rule_engine(data_provider, initialize_handler_registry(data_provider))
+    load_ms = (time.perf_counter() - start) * 1000
+
+    # sample memory only once every worker holds its catalog
+    barrier.wait()
+    catalog_kib = _pss_kib() - before_kib
+    barrier.wait()
+
+    # one worker times at a time, so they do not compete for a core
+    with lock:
+        latencies = _lookups(data_provider, rule_engine, requests, seed)
+    results.put({"load_ms": load_ms, "catalog_mib": catalog_kib / 1024, **latencies})
+
+
+def _lookups(data_provider, rule_engine, requests: int, seed: int) -> dict[str, Any]:
+    from backend.app.data.models import RuleContext
+    from backend.app.services.server import ServerService
+
+    rng = random.Random(seed)
+    service = ServerService(rule_engine)
+    option_ids = [option.id for option in rng.choices(data_provider.options, k=requests)]
+    category_ids = [category.id for category in rng.choices(data_provider.categories, k=requests)]
+    contexts = [
+        RuleContext(configuration=selection, current_option=rng.choice(data_provider.options))
+        for selection in _configurations(data_provider, requests, rng, share=0.5)
+    ]
+    return {
+        "option_price": _latencies(data_provider.get_option_price, option_ids),
+        "options_by_category": _latencies(data_provider.get_options_by_category, category_ids),
+        "candidates": _latencies(
+            lambda context: data_provider.get_candidate_rules("availability", context), contexts
+        ),
+        "configure": _latencies(
+            service._try_price_configuration,
+            _configurations(data_provider, requests, rng, share=1.0),
+        ),
+    }
+
+
+def measure(directory: Path, shared: bool, workers: int, requests: int, seed: int) -> list[dict[str, Any]]:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    lock = context.Lock()
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(str(directory), shared, requests, seed + i, barrier, lock, results))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return reports
+
+
+def _report(label: str, reports: list[dict[str, Any]]) -> None:
+    total = sum(report["catalog_mib"] for report in reports)
+    load = max(report["load_ms"] for report in reports)
+    print(f"{label}: {total:8.1f} MiB over {len(reports)} workers, slowest load {load:.1f} ms")
+    for key in ("option_price", "options_by_category", "candidates", "configure"):
+        p50 = sorted(report[key]["p50_us"] for report in reports)[len(reports) // 2]
+        print(f"  {key + ':':<21} {p50:10.1f} us p50")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200, help="lookups timed per kind and worker")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if not Path("/proc/self/smaps_rollup").exists():
+        sys.exit("needs /proc/self/smaps_rollup (Linux)")
+
+    # configure logging
+    import backend.app.main  # noqa: F401
+    from backend.app.data.provider import DataProvider
+    from backend.app.data.shared_catalog import open_shared_catalog
+
+    with tempfile.TemporaryDirectory(prefix="shared-catalog-") as tmp:
+        directory = Path(tmp)
+        generate_catalog(directory, PRESETS[args.preset], args.seed)
+        files = [directory / filename for filename in FILES]
+        start = time.perf_counter()
+        shared_catalog = open_shared_catalog(directory / "shared", files, lambda: DataProvider(*files))
+        build_ms = (time.perf_counter() - start) * 1000
+        file_mib = shared_catalog.path.stat().st_size / 2**20
+        print(f"{args.preset} catalog: shared file {file_mib:.1f} MiB, built in {build_ms:.1f} ms")
+
+        _report("private", measure(directory, False, args.workers, args.requests, args.seed))
+        _report("shared ", measure(directory, True, args.workers, args.requests, args.seed))
+
+
+if __name__ == "__main__":
+    main()
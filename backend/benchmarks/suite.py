@@ -0,0 +1,549 @@
+"""
+Benchmark suite: micro-benchmarks and in-process HTTP load scenarios, with JSON baselines.
+
+Micro-benchmarks time the condition evaluator, the data provider, the rules
+engine and the server and quote services directly. Load scenarios drive
+configure, options and quote creation through the full ASGI app with
+concurrent in-process clients. Every result names one figure, in
+microseconds, that `compare` checks against a baseline: the median time per
+operation for micro-benchmarks, and the wall time per request (the inverse
+of throughput) for load scenarios, whose latencies mostly measure queueing.
+A figure higher than the baseline by more than `--threshold` is a
+regression and makes the command exit with 1.
+Quotes go to a temporary directory, never to the bundled data store.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.suite run --output baseline.json
+    python -m backend.benchmarks.suite run --baseline baseline.json --output current.json
+    python -m backend.benchmarks.suite compare baseline.json current.json --threshold 0.2
+    python -m backend.benchmarks.suite run --filter engine. --quick
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+SCHEMA_VERSION = 1
+
+QUOTE_REQUEST = {
+    "configuration": {
+        "cpu_architecture": "amd_ryzen_9",
+        "cpu_cores": "cores_8",
+        "ram": "ram_32gb",
+        "storage": "ssd_1tb",
+        "os": "ubuntu",
+    },
+    "contact_name": "Benchmark",
+    "contact_email": "benchmark@example.com",
+}
+
+
+class SuiteOptions(NamedTuple):
+
+    rounds: int
+    min_round_seconds: float
+    requests: int
+    concurrency: int
+    name_filter: str
+
+
+class Comparison(NamedTuple):
+
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline - 1
+
+    def status(self, threshold: float) -> str:
+        if self.baseline is None:
+            return "new"
+        if self.current is None:
+            return "missing"
+        if self.change > threshold:
+            return "REGRESSION"
+        if self.change < -threshold:
+            return "improved"
+        return "ok"
+
+
+# -- micro-benchmarks ---------------------------------------------------------
+#
+# Each factory receives the shared fixtures and returns a zero-argument
+# callable; one call is one operation.
+
+
+class _Fixtures:
+
+    def __init__(self, quotes_dir: Path) -> None:
+        from backend.app.core.catalog import build_catalog_snapshot
+        from backend.app.data.models import RuleContext
+
+        from .price_matrix import full_configurations
+
+        snapshot = build_catalog_snapshot()
+        self.rule_engine = snapshot.rule_engine
+        self.price_matrix = snapshot.price_matrix
+        self.data_provider = self.rule_engine.data_provider
+        self.configurations = full_configurations(self.data_provider)
+        self.quotes_dir = quotes_dir
+        self.repositories: list = []
+
+        # a fully specified selection that matches a discount rule
+        self.configuration = dict(QUOTE_REQUEST["configuration"], cpu_architecture="arm64")
+        self.context = RuleContext(configuration=self.configuration)
+        self.option_contexts = [
+            RuleContext(configuration=self.configuration, current_option=option)
+            for option in self.data_provider.options
+        ]
+
+
+def _cycle(items: list) -> Callable[[], Any]:
+    position = [0]
+
+    def next_item() -> Any:
+        item = items[position[0] % len(items)]
+        position[0] += 1
+        return item
+
+    return next_item
+
+
+def _evaluator_matches(fixtures: _Fixtures) -> Callable[[], Any]:
+    from backend.app.rules import ConditionEvaluator
+
+    evaluator = ConditionEvaluator()
+    conditions = [rule.conditions for rule in fixtures.data_provider.rules]
+    context = fixtures.context
+
+    def run() -> None:
+        for rule_conditions in conditions:
+            evaluator.matches_conditions(rule_conditions, context)
+
+    return run
+
+
+def _provider_load(_: _Fixtures) -> Callable[[], Any]:
+    from backend.app.data import initialize_data_provider
+
+    return initialize_data_provider
+
+
+def _provider_candidates(fixtures: _Fixtures) -> Callable[[], Any]:
+    get_candidate_rules = fixtures.data_provider.get_candidate_rules
+    context = fixtures.context
+    return lambda: get_candidate_rules("discount", context)
+
+
+def _provider_option_prices(fixtures: _Fixtures) -> Callable[[], Any]:
+    get_option_price = fixtures.data_provider.get_option_price
+    option_ids = list(fixtures.configuration.values())
+
+    def run() -> None:
+        for option_id in option_ids:
+            get_option_price(option_id)
+
+    return run
+
+
+def _engine_process_rules(rule_type: str) -> Callable[[_Fixtures], Callable[[], Any]]:
+    def factory(fixtures: _Fixtures) -> Callable[[], Any]:
+        process_rules = fixtures.rule_engine.process_rules
+        if rule_type == "availability":
+            next_context = _cycle(fixtures.option_contexts)
+            return lambda: process_rules(rule_type, next_context())
+        context = fixtures.context
+        return lambda: process_rules(rule_type, context)
+
+    return factory
+
+
+def _server_configuration(with_matrix: bool) -> Callable[[_Fixtures], Callable[[], Any]]:
+    def factory(fixtures: _Fixtures) -> Callable[[], Any]:
+        from backend.app.services.server import ServerService
+
+        # no caches: every call prices, through the matrix or the rules engine
+        service = ServerService(
+            fixtures.rule_engine, price_matrix=fixtures.price_matrix if with_matrix else None
+        )
+        next_configuration = _cycle(fixtures.configurations)
+
+        def run() -> None:
+            try:
+                service.get_server_configuration(next_configuration())
+            except ValueError:
+                pass
+
+        return run
+
+    return factory
+
+
+def _server_options(fixtures: _Fixtures) -> Callable[[], Any]:
+    from backend.app.services.server import ServerService
+
+    service = ServerService(fixtures.rule_engine)
+    configuration = fixtures.configuration
+    return lambda: service.get_server_options(configuration)
+
+
+def _quote_create(fixtures: _Fixtures) -> Callable[[], Any]:
+    from backend.app.data.models import QuoteRequest
+    from backend.app.data.quotes import JsonlQuoteRepository
+    from backend.app.services.quote import QuoteService
+    from backend.app.services.server import ServerService
+
+    repository = JsonlQuoteRepository(fixtures.quotes_dir / "micro-quotes.jsonl")
+    fixtures.repositories.append(repository)
+    service = QuoteService(ServerService(fixtures.rule_engine), repository)
+    quote_request = QuoteRequest.model_validate(QUOTE_REQUEST)
+    return lambda: service.create_quote(quote_request)
+
+
+MICRO_BENCHMARKS: dict[str, Callable[[_Fixtures], Callable[[], Any]]] = {
+    "evaluator.matches_conditions.all_rules": _evaluator_matches,
+    "provider.load": _provider_load,
+    "provider.get_candidate_rules.discount": _provider_candidates,
+    "provider.get_option_price.selection": _provider_option_prices,
+    "engine.process_rules.validation": _engine_process_rules("validation"),
+    "engine.process_rules.discount": _engine_process_rules("discount"),
+    "engine.process_rules.availability": _engine_process_rules("availability"),
+    "server.get_server_configuration.engine": _server_configuration(with_matrix=False),
+    "server.get_server_configuration.matrix": _server_configuration(with_matrix=True),
+    "server.get_server_options.selection": _server_options,
+    "quote.create_quote.jsonl": _quote_create,
+}
+
+
+def _time_micro(operation: Callable[[], Any], options: SuiteOptions) -> dict[str, Any]:
+    # calibrate the iterations so one round takes about `min_round_seconds`
+    iterations = 1
+    while True:
+        elapsed = _time_iterations(operation, iterations)
+        if elapsed >= options.min_round_seconds or iterations >= 1_000_000:
+            break
+        iterations = max(iterations * 2, int(iterations * options.min_round_seconds / max(elapsed, 1e-9)))
+
+    per_operation = [
+        _time_iterations(operation, iterations) / iterations * 1e6 for _ in range(options.rounds)
+    ]
+    return {
+        "kind": "micro",
+        "unit": "us",
+        "metric": "median",
+        "median": statistics.median(per_operation),
+        "min": min(per_operation),
+        "stdev": statistics.stdev(per_operation) if len(per_operation) > 1 else 0.0,
+        "rounds": options.rounds,
+        "iterations": iterations,
+    }
+
+
+def _time_iterations(operation: Callable[[], Any], iterations: int) -> float:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+# -- HTTP load scenarios ------------------------------------------------------
+
+
+class _Scenario(NamedTuple):
+
+    method: str
+    path: str
+    expected_status: int
+    queries: list[str]
+    json_body: Optional[dict]
+
+
+def _load_scenarios(fixtures: _Fixtures) -> dict[str, _Scenario]:
+    from backend.app.data.models import RuleContext
+
+    queries = [
+        "&".join(f"{key}={value}" for key, value in configuration.items())
+        for configuration in fixtures.configurations
+    ]
+    # only selections the validation rules accept, so every request is a 200
+    valid_queries = [
+        query
+        for query, configuration in zip(queries, fixtures.configurations)
+        if fixtures.rule_engine.process_rules(
+            "validation", RuleContext(configuration=configuration)
+        ).is_valid
+    ]
+    return {
+        "http.configure": _Scenario(
+            "GET", "/api/v1/servers/configure", 200, valid_queries, None
+        ),
+        "http.options": _Scenario("GET", "/api/v1/servers/options", 200, queries, None),
+        "http.quote_create": _Scenario(
+            "POST", "/api/v1/quotes/requests", 201, [""], QUOTE_REQUEST
+        ),
+    }
+
+
+async def _run_load(app, scenario: _Scenario, requests: int, concurrency: int) -> dict[str, Any]:
+    from .asgi import request
+
+    latencies: list[float] = []
+    next_query = _cycle(scenario.queries)
+    remaining = [requests]
+
+    async def client() -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            response = await request(
+                app, scenario.method, scenario.path, next_query(), json_body=scenario.json_body
+            )
+            latencies.append((time.perf_counter() - start) * 1e6)
+            assert response.status_code == scenario.expected_status, response.body
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "kind": "load",
+        "unit": "us",
+        "metric": "us_per_request",
+        "us_per_request": elapsed / requests * 1e6,
+        "median": statistics.median(latencies),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+        "throughput_rps": requests / elapsed,
+        "requests": requests,
+        "concurrency": concurrency,
+    }
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run_load_scenarios(
+    app, fixtures: _Fixtures, options: SuiteOptions, report: Callable[[str, dict], None]
+) -> dict[str, dict[str, Any]]:
+    scenarios = {
+        name: scenario
+        for name, scenario in _load_scenarios(fixtures).items()
+        if options.name_filter in name
+    }
+    if not scenarios:
+        return {}
+
+    from backend.app.core.settings import settings
+
+    from .asgi import running
+
+    quotes_file_path = settings.QUOTES_FILE_PATH
+    settings.QUOTES_FILE_PATH = fixtures.quotes_dir / "load-quotes.jsonl"
+    results = {}
+    try:
+        async with running(app):
+            for name, scenario in scenarios.items():
+                await _run_load(app, scenario, max(1, options.requests // 10), options.concurrency)
+                results[name] = await _run_load(
+                    app, scenario, options.requests, options.concurrency
+                )
+                report(name, results[name])
+    finally:
+        settings.QUOTES_FILE_PATH = quotes_file_path
+    return results
+
+
+# -- running and comparing ----------------------------------------------------
+
+
+def run_suite(options: SuiteOptions, report: Callable[[str, dict], None]) -> dict[str, Any]:
+    """Run every selected benchmark and return the results document."""
+    # importing the app configures logging as the service runs it
+    from backend.app.main import app
+
+    with tempfile.TemporaryDirectory(prefix="cpq-bench-") as quotes_dir:
+        fixtures = _Fixtures(Path(quotes_dir))
+
+        results: dict[str, dict[str, Any]] = {}
+        try:
+            for name, factory in MICRO_BENCHMARKS.items():
+                if options.name_filter in name:
+                    results[name] = _time_micro(factory(fixtures), options)
+                    report(name, results[name])
+        finally:
+            for repository in fixtures.repositories:
+                repository.close()
+
+        results.update(asyncio.run(_run_load_scenarios(app, fixtures, options, report)))
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": _environment(),
+        "options": options._asdict(),
+        "results": results,
+    }
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any]) -> list[Comparison]:
+    """Pair up the compared figures of two results documents, baseline order first."""
+    baseline_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    names = list(baseline_results) + [name for name in current_results if name not in baseline_results]
+    return [
+        Comparison(
+            name=name,
+            baseline=_figure(baseline_results.get(name)),
+            current=_figure(current_results.get(name)),
+        )
+        for name in names
+    ]
+
+
+def _figure(result: Optional[dict[str, Any]]) -> Optional[float]:
+    return None if result is None else result[result["metric"]]
+
+
+def _environment() -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _report_result(name: str, result: dict[str, Any]) -> None:
+    line = f"  {name:<44}{_figure(result):12.2f} us"
+    if result["kind"] == "load":
+        line += (
+            f"  ({result['throughput_rps']:.0f} req/s, latency p50 {result['median'] / 1000:.1f} ms"
+            f" p95 {result['p95'] / 1000:.1f} ms)"
+        )
+    else:
+        line += f"  (min {result['min']:.2f}, stdev {result['stdev']:.2f})"
+    print(line, flush=True)
+
+
+def _print_comparison(comparisons: list[Comparison], threshold: float) -> int:
+    print(f"\ncompared to baseline (us per operation, threshold {threshold:.0%})")
+    print(f"  {'':44}{'baseline':>12}{'current':>12}{'change':>10}")
+    regressions = 0
+    for comparison in comparisons:
+        status = comparison.status(threshold)
+        regressions += status == "REGRESSION"
+        baseline = f"{comparison.baseline:12.2f}" if comparison.baseline is not None else f"{'-':>12}"
+        current = f"{comparison.current:12.2f}" if comparison.current is not None else f"{'-':>12}"
+        change = f"{comparison.change:+9.1%}" if comparison.change is not None else f"{'':>9}"
+        print(f"  {comparison.name:<44}{baseline}{current}{change}  {status}")
+    print(f"  {regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def _load(path: Path) -> dict[str, Any]:
+    document = json.loads(path.read_text(encoding="utf-8"))
+    if document.get("schema") != SCHEMA_VERSION:
+        raise SystemExit(f"{path}: unsupported results schema {document.get('schema')!r}")
+    return document
+
+
+def _run_command(args: argparse.Namespace) -> int:
+    quick = args.quick
+    options = SuiteOptions(
+        rounds=args.rounds or (3 if quick else 7),
+        min_round_seconds=0.02 if quick else 0.1,
+        requests=args.requests or (300 if quick else 3000),
+        concurrency=args.concurrency,
+        name_filter=args.filter,
+    )
+    print(f"running benchmarks ({'quick' if quick else 'full'}), us per operation")
+    document = run_suite(options, _report_result)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"results written to {args.output}")
+    if args.baseline:
+        baseline = _load(args.baseline)
+        # a filtered run is only compared with the benchmarks it ran
+        baseline["results"] = {
+            name: result for name, result in baseline["results"].items() if args.filter in name
+        }
+        return _print_comparison(compare_results(baseline, document), args.threshold)
+    return 0
+
+
+def _compare_command(args: argparse.Namespace) -> int:
+    comparisons = compare_results(_load(args.baseline), _load(args.current))
+    return _print_comparison(comparisons, args.threshold)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite, optionally against a baseline")
+    run.add_argument("--output", type=Path, help="write the results document here")
+    run.add_argument("--baseline", type=Path, help="compare the results with this document")
+    run.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown")
+    run.add_argument("--filter", default="", help="only benchmarks whose name contains this")
+    run.add_argument("--quick", action="store_true", help="fewer rounds and requests")
+    run.add_argument("--rounds", type=int, help="timed rounds per micro-benchmark")
+    run.add_argument("--requests", type=int, help="requests per load scenario")
+    run.add_argument("--concurrency", type=int, default=32, help="clients per load scenario")
+    run.set_defaults(handler=_run_command)
+
+    compare = commands.add_parser("compare", help="compare two results documents")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown")
+    compare.set_defaults(handler=_compare_command)
+
+    args = parser.parse_args()
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Seeded generator for large synthetic catalogs.
+
+Writes `categories.jsonl`, `options.jsonl`, `rules.jsonl`, `settings.jsonl`
+and `quotes.jsonl` in the shapes of the bundled data store, at sizes closer
+to a production catalog (hundreds of categories, tens of thousands of
+options, thousands of rules). The same seed and size always produce the
+same files, byte for byte.
+
+Options are spread unevenly across categories, as in a real catalog where a
+few categories (drives, licences) dwarf the rest. Rules mix the shipped
+kinds: the base price, availability rules hiding options of one category
+when another category takes certain values, pairwise validation
+incompatibilities and per-category percentage discounts. Conditions stay
+narrow so most configurations remain valid and priceable.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.synthetic_catalog /tmp/catalog --preset large
+    python -m backend.benchmarks.synthetic_catalog /tmp/catalog --options 50000 --seed 7
+"""
+
+import argparse
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import NamedTuple
+
+
+class CatalogSize(NamedTuple):
+
+    categories: int
+    options: int
+    rules: int
+    quotes: int
+
+
+PRESETS = {
+    "shipped": CatalogSize(categories=5, options=15, rules=4, quotes=100),
+    "small": CatalogSize(categories=20, options=500, rules=100, quotes=1_000),
+    "medium": CatalogSize(categories=100, options=5_000, rules=500, quotes=10_000),
+    "large": CatalogSize(categories=300, options=30_000, rules=3_000, quotes=50_000),
+}
+
+SETTINGS = (
+    {"key": "system_version", "value": "1.0.0", "description": "Configuration schema version"},
+    {"key": "currency", "value": "USD", "description": "Pricing currency"},
+    {"key": "price_precision", "value": "2", "description": "Decimal places for pricing"},
+)
+
+_COMPONENTS = (
+    "cpu", "gpu", "ram", "storage", "nic", "psu", "os", "raid", "chassis",
+    "cooling", "backup", "license", "support", "rack", "bmc", "firmware",
+)
+_PRICE_POINTS = (5, 9, 12, 19, 25, 29, 39, 49, 79, 99, 149, 199, 299, 499, 799, 1299)
+_DISCOUNT_PERCENTAGES = ("5.0", "10.0", "15.0", "20.0", "25.0")
+_QUOTES_EPOCH = datetime(2025, 1, 1)
+
+
+def generate_catalog(directory: Path, size: CatalogSize, seed: int = 42) -> dict[str, Path]:
+    """Write a catalog of `size` into `directory`; returns the paths by file name."""
+    if size.categories < 1 or size.options < 2 * size.categories or size.rules < 1:
+        raise ValueError(
+            "A catalog needs at least one category, two options per category and one rule"
+        )
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    categories = _categories(size.categories, rng)
+    options = _options(categories, size.options, rng)
+    options_by_category: dict[str, list[dict]] = {}
+    for option in options:
+        options_by_category.setdefault(option["category_id"], []).append(option)
+    rules = _rules(categories, options_by_category, size.rules, rng)
+    quotes = _quotes(categories, options_by_category, rules[0], size.quotes, rng)
+
+    paths = {}
+    for filename, records, separators in (
+        ("categories.jsonl", categories, None),
+        ("options.jsonl", options, None),
+        ("rules.jsonl", rules, None),
+        ("settings.jsonl", SETTINGS, None),
+        # quotes are written compactly, as the quote repository writes them
+        ("quotes.jsonl", quotes, (",", ":")),
+    ):
+        path = directory / filename
+        with open(path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, separators=separators))
+                file.write("\n")
+        paths[filename] = path
+    return paths
+
+
+def _categories(count: int, rng: random.Random) -> list[dict]:
+    categories = []
+    for i in range(count):
+        component = _COMPONENTS[i % len(_COMPONENTS)]
+        ordinal = i // len(_COMPONENTS) + 1
+        name = f"{component.upper()} {ordinal}"
+        categories.append(
+            {
+                "id": f"{component}_{ordinal}",
+                "name": name,
+                "description": f"{name} selection",
+                "required": i < 5 or rng.random() < 0.2,
+                "order": i + 1,
+            }
+        )
+    return categories
+
+
+def _options(categories: list[dict], count: int, rng: random.Random) -> list[dict]:
+    # heavy-tailed category sizes, every category keeping at least two options
+    weights = [rng.paretovariate(1.2) for _ in categories]
+    spare = count - 2 * len(categories)
+    total_weight = sum(weights)
+    sizes = [2 + int(spare * weight / total_weight) for weight in weights]
+    for i in range(count - sum(sizes)):
+        sizes[i % len(sizes)] += 1
+
+    options = []
+    for category, option_count in zip(categories, sizes):
+        for j in range(option_count):
+            # the first option of a category is the included default
+            price = Decimal(0) if j == 0 else Decimal(rng.choice(_PRICE_POINTS))
+            options.append(
+                {
+                    "id": f"{category['id']}_{j + 1:04d}",
+                    "category_id": category["id"],
+                    "display_name": f"{category['name']} Option {j + 1}",
+                    "price": f"{price:.2f}",
+                    "available": j == 0 or rng.random() > 0.02,
+                    "order": j + 1,
+                }
+            )
+    return options
+
+
+def _rules(
+    categories: list[dict],
+    options_by_category: dict[str, list[dict]],
+    count: int,
+    rng: random.Random,
+) -> list[dict]:
+    category_ids = [category["id"] for category in categories]
+    names = {category["id"]: category["name"] for category in categories}
+
+    def values(category_id: str, most: int) -> list[str]:
+        options = options_by_category[category_id]
+        return [option["id"] for option in rng.sample(options, min(len(options), rng.randint(1, most)))]
+
+    def pair() -> tuple[str, str]:
+        if len(category_ids) == 1:
+            return category_ids[0], category_ids[0]
+        first, second = rng.sample(category_ids, 2)
+        return first, second
+
+    rules = [
+        {
+            "id": "base_pricing",
+            "name": "Base Server Price",
+            "type": "pricing",
+            "conditions": {},
+            "actions": {"type": "set_base_price", "amount": "50.00"},
+            "priority": 1000,
+            "active": True,
+        }
+    ]
+    for i in range(1, count):
+        kind = rng.choices(("availability", "validation", "discount"), (0.45, 0.25, 0.3))[0]
+        trigger, target = pair()
+        if kind == "availability":
+            # hides the whole target category, or only some of its options
+            conditions: dict = {trigger: values(trigger, 3), "option_category": [target]}
+            if rng.random() < 0.5:
+                conditions["option_values"] = values(target, 5)
+            rule = {
+                "name": f"{names[trigger]} / {names[target]} Availability",
+                "conditions": conditions,
+                "actions": {"type": "set_unavailable", "reason": "incompatible_configuration"},
+            }
+        elif kind == "validation":
+            conditions = {trigger: values(trigger, 2), target: values(target, 2)}
+            rule = {
+                "name": f"{names[trigger]} / {names[target]} Incompatibility",
+                "conditions": conditions,
+                "actions": {
+                    "type": "add_error",
+                    "message": f"{names[trigger]} selection is not compatible with {names[target]}",
+                },
+            }
+        else:
+            percentage = rng.choice(_DISCOUNT_PERCENTAGES)
+            conditions = {trigger: values(trigger, 3), target: values(target, 3)}
+            rule = {
+                "name": f"{names[trigger]} {names[target]} Discount",
+                "conditions": conditions,
+                "actions": {
+                    "type": "percentage_discount",
+                    "category": target,
+                    "percentage": percentage,
+                    "description": f"{percentage.removesuffix('.0')}% off {names[target]}",
+                },
+            }
+        rules.append(
+            {
+                "id": f"{kind}_{i:05d}",
+                "type": kind,
+                **rule,
+                "priority": rng.randint(1, 999),
+                "active": rng.random() > 0.05,
+            }
+        )
+    return rules
+
+
+def _quotes(
+    categories: list[dict],
+    options_by_category: dict[str, list[dict]],
+    base_rule: dict,
+    count: int,
+    rng: random.Random,
+) -> list[dict]:
+    base_price = Decimal(base_rule["actions"]["amount"])
+    quotes = []
+    for i in range(count):
+        configuration = {}
+        total = base_price
+        for category in categories:
+            if category["required"] or rng.random() < 0.3:
+                option = rng.choice(options_by_category[category["id"]])
+                configuration[category["id"]] = option["id"]
+                total += Decimal(option["price"])
+        created_at = _QUOTES_EPOCH + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        quotes.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "configuration": configuration,
+                "contact_name": f"Buyer {i + 1}",
+                "contact_email": f"buyer{i + 1}@customer{i % 997}.example.com",
+                "company": f"Customer {i % 997}" if rng.random() < 0.8 else None,
+                "total_price": f"{total:.2f}",
+                "total_discount": None,
+                "created_at": created_at.isoformat(),
+            }
+        )
+    return quotes
+
+
+def _size(args: argparse.Namespace) -> CatalogSize:
+    preset = PRESETS[args.preset]
+    return CatalogSize(
+        categories=args.categories or preset.categories,
+        options=args.options or preset.options,
+        rules=args.rules or preset.rules,
+        quotes=args.quotes if args.quotes is not None else preset.quotes,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("directory", type=Path, help="where to write the JSONL files")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--categories", type=int, help="override the preset's category count")
+    parser.add_argument("--options", type=int, help="override the preset's option count")
+    parser.add_argument("--rules", type=int, help="override the preset's rule count")
+    parser.add_argument("--quotes", type=int, help="override the preset's quote count")
+    args = parser.parse_args()
+
+    size = _size(args)
+    paths = generate_catalog(args.directory, size, args.seed)
+    print(f"wrote {size} with seed {args.seed}")
+    for filename, path in paths.items():
+        print(f"  {filename:<16} {path.stat().st_size / 1024:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
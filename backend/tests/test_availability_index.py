@@ -0,0 +1,117 @@
+import json
+import random
+import shutil
+
+import pytest
+from backend.app.data import DataProvider, data_file
+from backend.app.data.models import RuleContext
+from backend.app.rules import initialize_rule_engine
+from backend.app.rules.handlers import initialize_handler_registry
+from backend.app.rules.handlers.availability import AvailabilityHandler
+from backend.app.services.server import ServerService
+
+SEEDS = range(20)
+
+
+class _EngineAvailabilityHandler(AvailabilityHandler):
+    """Same semantics, but not the stock handler, so the service skips the index."""
+
+
+def _synthetic_rules(data_provider: DataProvider, rng: random.Random) -> list[dict]:
+    categories = [category.id for category in data_provider.categories]
+    option_ids = [option.id for option in data_provider.options]
+    rules = []
+    for i in range(rng.randint(1, 40)):
+        conditions: dict = {}
+        for category_id in rng.sample(categories, rng.randint(0, 3)):
+            values = [
+                option.id
+                for option in rng.sample(
+                    data_provider.get_options_by_category(category_id),
+                    rng.randint(0, 2),
+                )
+            ]
+            if rng.random() < 0.1:
+                values.append("unknown_option")
+            conditions[category_id] = values
+        if rng.random() < 0.5:
+            conditions["option_category"] = rng.sample(categories, rng.randint(1, 2))
+        if rng.random() < 0.5:
+            conditions["option_values"] = rng.sample(option_ids, rng.randint(1, 4))
+        if rng.random() < 0.2:
+            conditions["missing_categories"] = rng.sample(categories, rng.randint(1, 2))
+        if rng.random() < 0.1:
+            # a bare string keeps substring `in` semantics
+            conditions[rng.choice(categories)] = rng.choice(option_ids)[:3]
+        rules.append(
+            {
+                "id": f"availability_{i}",
+                "name": f"Availability {i}",
+                "type": "availability",
+                "conditions": conditions,
+                "actions": {"type": rng.choice(["set_unavailable"] * 4 + ["set_available"])},
+                "priority": rng.randint(0, 100),
+                "active": rng.random() < 0.9,
+            }
+        )
+    return rules
+
+
+def _synthetic_configurations(data_provider: DataProvider, rng: random.Random) -> list[dict]:
+    configurations = []
+    for _ in range(100):
+        configuration = {}
+        for category in data_provider.categories:
+            roll = rng.random()
+            if roll < 0.7:
+                options = data_provider.get_options_by_category(category.id)
+                configuration[category.id] = rng.choice(options).id
+            elif roll < 0.8:
+                configuration[category.id] = rng.choice(["unknown", ""])
+        if rng.random() < 0.1:
+            configuration["extra"] = "value"
+        configurations.append(configuration)
+    return configurations
+
+
+def _catalog(tmp_path, rules: list[dict]) -> DataProvider:
+    for filename in ("categories.jsonl", "options.jsonl", "settings.jsonl"):
+        shutil.copy(data_file(filename), tmp_path / filename)
+    (tmp_path / "rules.jsonl").write_text("".join(f"{json.dumps(rule)}\n" for rule in rules))
+    return DataProvider(
+        categories_file=tmp_path / "categories.jsonl",
+        options_file=tmp_path / "options.jsonl",
+        rules_file=tmp_path / "rules.jsonl",
+        settings_file=tmp_path / "settings.jsonl",
+    )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_availability_index_matches_the_rules_engine(tmp_path, seed):
+    rng = random.Random(seed)
+    data_provider = _catalog(tmp_path, _synthetic_rules(_catalog(tmp_path, []), rng))
+    rule_engine = initialize_rule_engine(
+        data_provider, initialize_handler_registry(data_provider)
+    )
+    index = data_provider.get_availability_index()
+
+    for configuration in _synthetic_configurations(data_provider, rng):
+        matching = index.matching_rules(configuration)
+        for option in data_provider.options:
+            context = RuleContext(configuration=configuration, current_option=option)
+            expected = rule_engine.process_rules("availability", context)
+            assert index.is_available(option.id, matching) == expected, (configuration, option.id)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_server_options_match_with_and_without_the_index(tmp_path, seed):
+    rng = random.Random(seed)
+    data_provider = _catalog(tmp_path, _synthetic_rules(_catalog(tmp_path, []), rng))
+    indexed = initialize_rule_engine(data_provider, initialize_handler_registry(data_provider))
+    scanned = initialize_rule_engine(data_provider, initialize_handler_registry(data_provider))
+    scanned.add_handler("availability", _EngineAvailabilityHandler())
+
+    for configuration in _synthetic_configurations(data_provider, rng)[:20]:
+        assert ServerService(indexed).get_server_options(configuration) == ServerService(
+            scanned
+        ).get_server_options(configuration)
@@ -0,0 +1,69 @@
+import pytest
+from backend.app.core.settings import settings
+from backend.benchmarks.suite import (
+    SCHEMA_VERSION,
+    Comparison,
+    SuiteOptions,
+    compare_results,
+    run_suite,
+)
+
+
+def _document(**figures: float) -> dict:
+    return {
+        "schema": SCHEMA_VERSION,
+        "results": {
+            name: {"kind": "micro", "metric": "median", "median": figure}
+            for name, figure in figures.items()
+        },
+    }
+
+
+def test_compare_flags_regressions_beyond_the_threshold():
+    baseline = _document(steady=10.0, slower=10.0, faster=10.0, removed=10.0)
+    current = _document(steady=11.0, slower=13.0, faster=5.0, added=1.0)
+
+    statuses = {
+        comparison.name: comparison.status(threshold=0.2)
+        for comparison in compare_results(baseline, current)
+    }
+
+    assert statuses == {
+        "steady": "ok",
+        "slower": "REGRESSION",
+        "faster": "improved",
+        "removed": "missing",
+        "added": "new",
+    }
+    assert Comparison("x", 10.0, 13.0).change == pytest.approx(0.3)
+
+
+def test_load_scenarios_compare_time_per_request():
+    def load(us_per_request: float) -> dict:
+        # latency medians stay put; only time per request moved
+        result = {"metric": "us_per_request", "us_per_request": us_per_request, "median": 1.0}
+        return {"results": {"http.x": result}}
+
+    baseline, current = load(100.0), load(150.0)
+
+    [comparison] = compare_results(baseline, current)
+    assert comparison.status(threshold=0.2) == "REGRESSION"
+
+
+def test_run_suite_produces_a_results_document(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+    options = SuiteOptions(
+        rounds=2, min_round_seconds=0.001, requests=20, concurrency=4, name_filter="configur"
+    )
+    reported = []
+
+    document = run_suite(options, lambda name, result: reported.append(name))
+
+    assert document["schema"] == SCHEMA_VERSION
+    assert set(document["results"]) == set(reported) == {
+        "server.get_server_configuration.engine",
+        "server.get_server_configuration.matrix",
+        "http.configure",
+    }
+    for result in document["results"].values():
+        assert result[result["metric"]] > 0
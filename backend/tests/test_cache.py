@@ -0,0 +1,110 @@
+import time
+
+import pytest
+from backend.app.core.cache import LRUCache
+from backend.app.core.catalog import build_rule_engine
+from backend.app.core.settings import settings
+from backend.app.services.server import ServerService
+
+CONFIGURATION = {
+    "cpu_architecture": "amd_ryzen_9",
+    "cpu_cores": "cores_8",
+    "ram": "ram_32gb",
+    "storage": "ssd_1tb",
+    "os": "ubuntu",
+}
+
+
+@pytest.fixture
+def snapshot_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+
+
+def test_the_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    # re-putting a key refreshes it instead of growing the cache
+    cache.put("a", 10)
+    cache.put("d", 4)
+    assert (cache.get("a"), cache.get("c"), cache.get("d")) == (10, None, 4)
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size, stats.max_size) == (
+        5, 2, 2, 2, 2
+    )
+
+
+def test_a_disabled_cache_stores_nothing():
+    cache = LRUCache(max_size=0)
+    cache.put("a", 1)
+    assert not cache.enabled
+    assert cache.get("a") is None
+    assert cache.stats().size == 0
+
+
+def test_entries_expire_after_the_ttl():
+    cache = LRUCache(max_size=4, ttl_seconds=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations, stats.size) == (1, 1, 1, 0)
+    # a zero ttl means entries never expire
+    assert LRUCache(max_size=4, ttl_seconds=0).ttl_seconds is None
+
+
+def test_binding_a_newer_generation_clears_the_cache():
+    cache = LRUCache(max_size=4)
+    cache.bind(1)
+    cache.put("a", 1)
+    cache.bind(1)
+    assert cache.get("a") == 1
+
+    cache.bind(2)
+    assert cache.generation == 2
+    assert cache.get("a") is None
+    cache.put("b", 2)
+
+    # an older generation neither rebinds nor clears it
+    cache.bind(1)
+    assert cache.generation == 2
+    assert cache.get("b") == 2
+    assert cache.stats().invalidations == 1
+
+
+def test_results_priced_on_a_superseded_catalog_are_not_cached(snapshot_cache_dir):
+    cache = LRUCache(max_size=16)
+    current = ServerService(build_rule_engine(version=2), configuration_cache=cache)
+    superseded = ServerService(build_rule_engine(version=1), configuration_cache=cache)
+
+    priced = current.get_server_configuration(CONFIGURATION)
+    assert superseded.get_server_configuration(CONFIGURATION) == priced
+
+    assert cache.generation == 2
+    assert cache.stats().size == 1
+    assert cache.get((2, frozenset(CONFIGURATION.items()))) is not None
+    assert cache.get((1, frozenset(CONFIGURATION.items()))) is None
+
+
+def test_a_reload_while_pricing_keeps_the_result_out_of_the_cache(snapshot_cache_dir):
+    cache = LRUCache(max_size=16)
+    service = ServerService(build_rule_engine(version=1), configuration_cache=cache)
+
+    def price_during_reload(configuration):
+        # a request on the new catalog binds the cache while this one prices
+        cache.bind(2)
+        return service._try_price_configuration(configuration)
+
+    priced = service._cached(cache, CONFIGURATION, price_during_reload)
+
+    assert priced.error is None
+    assert cache.generation == 2
+    assert cache.stats().size == 0
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import shutil
+from types import SimpleNamespace
+
+import pytest
+from backend.app.core.catalog import (
+    CATALOG_FILES,
+    CatalogReloader,
+    build_catalog_snapshot,
+)
+from backend.app.core.settings import Settings, settings
+from backend.app.data import data_file
+from backend.app.main import app
+from backend.benchmarks.asgi import request, running
+from pydantic import SecretStr
+
+ADMIN_TOKEN = "admin-secret"
+
+
+@pytest.fixture
+def catalog_dir(tmp_path, monkeypatch):
+    """A private copy of the catalog, which also holds quotes and snapshots."""
+    store = tmp_path / "app" / "data" / "store"
+    store.mkdir(parents=True)
+    for filename in CATALOG_FILES:
+        shutil.copy(data_file(filename), store / filename)
+    monkeypatch.setattr(Settings, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(settings, "PRICE_MATRIX_ENABLED", False)
+    return store
+
+
+def _reloader(mode: str = "manual", watch_interval: float = 2.0) -> CatalogReloader:
+    reloader = CatalogReloader(SimpleNamespace(), mode, watch_interval)
+    reloader.install(build_catalog_snapshot())
+    return reloader
+
+
+def test_a_successful_reload_installs_a_new_version(catalog_dir):
+    reloader = _reloader()
+    engine = reloader.state.rule_engine
+
+    status = asyncio.run(reloader.reload())
+
+    assert (status.version, status.reload_count, status.failed_reloads) == (2, 1, 0)
+    assert status.last_error is None
+    assert status.last_reload_latency_ms is not None
+    assert reloader.state.rule_engine is not engine
+    assert reloader.state.data_provider is reloader.state.rule_engine.data_provider
+    assert asyncio.run(reloader.reload()).version == 3
+
+
+def test_a_failed_reload_keeps_the_current_snapshot(catalog_dir):
+    reloader = _reloader()
+    engine = reloader.state.rule_engine
+    rules = (catalog_dir / "rules.jsonl").read_text()
+    (catalog_dir / "rules.jsonl").write_text('{"id": "broken"}\n')
+
+    with pytest.raises(RuntimeError, match="Catalog reload failed"):
+        asyncio.run(reloader.reload())
+
+    assert reloader.state.rule_engine is engine
+    status = reloader.status()
+    assert (status.version, status.reload_count, status.failed_reloads) == (1, 0, 1)
+    assert status.last_error
+
+    # the next good catalog takes the next version
+    (catalog_dir / "rules.jsonl").write_text(rules)
+    status = asyncio.run(reloader.reload())
+    assert (status.version, status.failed_reloads, status.last_error) == (2, 1, None)
+
+
+async def _watch_until_version(
+    reloader: CatalogReloader, version: int, polls: int = 200
+) -> int:
+    watch = asyncio.create_task(reloader.watch())
+    try:
+        for _ in range(polls):
+            if reloader.data_provider.version >= version:
+                break
+            await asyncio.sleep(0.01)
+        return reloader.data_provider.version
+    finally:
+        watch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await watch
+
+
+def test_watch_mode_reloads_when_a_file_changes(catalog_dir):
+    reloader = _reloader(mode="watch", watch_interval=0.01)
+    options = catalog_dir / "options.jsonl"
+
+    # unchanged files are left alone
+    assert asyncio.run(_watch_until_version(reloader, 2, polls=20)) == 1
+
+    # a size change
+    with open(options, "a") as file:
+        file.write("\n")
+    assert asyncio.run(_watch_until_version(reloader, 2)) == 2
+
+    # an mtime change alone
+    stat = options.stat()
+    os.utime(options, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert asyncio.run(_watch_until_version(reloader, 3)) == 3
+    assert reloader.status().reload_count == 2
+
+
+async def _admin_requests(headers: dict) -> list:
+    async with running(app):
+        return [
+            await request(app, "GET", "/api/v1/admin/catalog", headers=headers),
+            await request(app, "POST", "/api/v1/admin/catalog/reload", headers=headers),
+        ]
+
+
+@pytest.mark.parametrize(
+    ("token", "headers", "status_code"),
+    [
+        (None, {"X-Admin-Token": ADMIN_TOKEN}, 404),
+        ("", {"X-Admin-Token": ""}, 404),
+        (ADMIN_TOKEN, {}, 403),
+        (ADMIN_TOKEN, {"X-Admin-Token": "wrong"}, 403),
+    ],
+)
+def test_admin_routes_require_the_configured_token(
+    catalog_dir, monkeypatch, token, headers, status_code
+):
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", None if token is None else SecretStr(token))
+    monkeypatch.setattr(settings, "CATALOG_RELOAD_MODE", "manual")
+
+    responses = asyncio.run(_admin_requests(headers))
+
+    assert [response.status_code for response in responses] == [status_code, status_code]
+
+
+def test_admin_routes_report_and_reload_the_catalog(catalog_dir, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", SecretStr(ADMIN_TOKEN))
+    monkeypatch.setattr(settings, "CATALOG_RELOAD_MODE", "manual")
+
+    status, reloaded = asyncio.run(_admin_requests({"X-Admin-Token": ADMIN_TOKEN}))
+
+    assert status.status_code == 200
+    assert status.json()["data"]["version"] == 1
+    assert reloaded.status_code == 200
+    assert reloaded.json()["data"]["version"] == 2
+    assert reloaded.json()["data"]["reload_count"] == 1
+
+
+def test_manual_reload_is_not_found_when_reloading_is_disabled(catalog_dir, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", SecretStr(ADMIN_TOKEN))
+    monkeypatch.setattr(settings, "CATALOG_RELOAD_MODE", "disabled")
+
+    status, reloaded = asyncio.run(_admin_requests({"X-Admin-Token": ADMIN_TOKEN}))
+
+    assert status.status_code == 200
+    assert reloaded.status_code == 404
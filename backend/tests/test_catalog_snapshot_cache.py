@@ -0,0 +1,141 @@
+import gc
+import random
+import shutil
+import threading
+
+import pytest
+from backend.app.data import DataProvider, data_file
+from backend.app.data.snapshot_cache import CatalogSnapshotCache
+from backend.app.rules import initialize_rule_engine
+from backend.app.rules.handlers import initialize_handler_registry
+from backend.app.services.server import ServerService
+from backend.benchmarks.catalog_scaling import _configurations
+from backend.benchmarks.synthetic_catalog import CatalogSize, generate_catalog
+
+FILES = ("categories.jsonl", "options.jsonl", "rules.jsonl", "settings.jsonl")
+
+
+def _load(directory, snapshot_cache=None) -> DataProvider:
+    return DataProvider(
+        categories_file=directory / "categories.jsonl",
+        options_file=directory / "options.jsonl",
+        rules_file=directory / "rules.jsonl",
+        settings_file=directory / "settings.jsonl",
+        snapshot_cache=snapshot_cache,
+    )
+
+
+def _snapshots(snapshot_cache: CatalogSnapshotCache) -> list:
+    return sorted(snapshot_cache.directory.glob("*.snapshot"))
+
+
+def test_restored_catalog_matches_a_fresh_load(tmp_path):
+    generate_catalog(tmp_path, CatalogSize(categories=10, options=200, rules=80, quotes=0), seed=3)
+    snapshot_cache = CatalogSnapshotCache(tmp_path / "snapshots")
+
+    fresh = _load(tmp_path)
+    stored = _load(tmp_path, snapshot_cache)
+    restored = _load(tmp_path, snapshot_cache)
+
+    assert fresh.snapshot_cache_hit is None
+    assert stored.snapshot_cache_hit is False
+    assert restored.snapshot_cache_hit is True
+    assert len(_snapshots(snapshot_cache)) == 1
+    assert restored.load_ms > 0
+
+    assert restored.categories == fresh.categories
+    assert restored.options == fresh.options
+    assert restored.rules == fresh.rules
+    assert restored.settings == fresh.settings
+    assert [rule.action for rule in restored.rules] == [rule.action for rule in fresh.rules]
+    assert restored.content_hash == fresh.content_hash
+
+    services = [
+        ServerService(initialize_rule_engine(provider, initialize_handler_registry(provider)))
+        for provider in (fresh, restored)
+    ]
+    for selection in _configurations(fresh, 30, random.Random(3), share=0.5):
+        expected, actual = (service._try_price_configuration(selection) for service in services)
+        assert actual == expected
+        expected, actual = (service.get_server_options(selection) for service in services)
+        assert actual == expected
+
+
+def test_changed_or_unreadable_snapshots_are_rebuilt(tmp_path):
+    for filename in FILES:
+        shutil.copy(data_file(filename), tmp_path / filename)
+    snapshot_cache = CatalogSnapshotCache(tmp_path / "snapshots")
+    _load(tmp_path, snapshot_cache)
+    [first] = _snapshots(snapshot_cache)
+
+    options_file = tmp_path / "options.jsonl"
+    options_file.write_text(options_file.read_text().replace('"49.00"', '"59.00"'))
+    changed = _load(tmp_path, snapshot_cache)
+    assert changed.snapshot_cache_hit is False
+    [second] = _snapshots(snapshot_cache)
+    assert second != first
+
+    second.write_bytes(b"truncated")
+    assert _load(tmp_path, snapshot_cache).snapshot_cache_hit is False
+    assert _load(tmp_path, snapshot_cache).snapshot_cache_hit is True
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ('{"key": "a", "value": "1"}', "Invalid data in settings file"),
+        ('{"key": "a", "value": "1", "description": ""} {"key"', "Invalid data in settings file"),
+        (
+            '{"key": "a", "value": "1", "description": ""}, {"key": "b", "value": "2", "description": ""}',
+            "expected one JSON object per line",
+        ),
+    ],
+)
+def test_bulk_validation_rejects_malformed_lines(tmp_path, line, message):
+    for filename in FILES:
+        shutil.copy(data_file(filename), tmp_path / filename)
+    with open(tmp_path / "settings.jsonl", "a", encoding="utf-8") as file:
+        file.write(f"\n{line}\n")
+
+    with pytest.raises(RuntimeError, match=message):
+        _load(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "lines, message",
+    [
+        (["", '{"key": "b", "value": "2"}'], r"line 3: description: Field required"),
+        (["", "", '{"key": "b", nope}'], r"line 4: Invalid JSON: key must be a string"),
+        (['{"key": "b", "value": "2", "description": ""} {"key"'], r"line 2: Invalid JSON"),
+    ],
+)
+def test_bulk_validation_errors_report_file_line_numbers(tmp_path, lines, message):
+    for filename in FILES:
+        shutil.copy(data_file(filename), tmp_path / filename)
+    valid = '{"key": "a", "value": "1", "description": ""}'
+    (tmp_path / "settings.jsonl").write_text("\n".join([valid, *lines]) + "\n")
+
+    with pytest.raises(RuntimeError, match=f"Invalid data in settings file: {message}"):
+        _load(tmp_path)
+
+
+def test_gc_is_paused_only_for_loads_on_the_main_thread(tmp_path, monkeypatch):
+    for filename in FILES:
+        shutil.copy(data_file(filename), tmp_path / filename)
+    gc_enabled = []
+    validate_data = DataProvider._validate_data
+
+    def _recording_validate_data(data_provider) -> None:
+        gc_enabled.append(gc.isenabled())
+        validate_data(data_provider)
+
+    monkeypatch.setattr(DataProvider, "_validate_data", _recording_validate_data)
+
+    _load(tmp_path)
+    # a hot reload builds in a worker thread while requests are served
+    reload = threading.Thread(target=_load, args=(tmp_path,))
+    reload.start()
+    reload.join()
+
+    assert gc_enabled == [False, True]
+    assert gc.isenabled()
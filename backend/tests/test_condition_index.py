@@ -0,0 +1,114 @@
+import json
+import random
+import shutil
+
+import pytest
+from backend.app.data import DataProvider, data_file
+from backend.app.data.compiler import compile_rule
+from backend.app.data.models import RuleContext
+from backend.app.rules import ConditionEvaluator
+
+SEEDS = range(20)
+
+ACTIONS = {
+    "availability": {"type": "set_unavailable"},
+    "validation": {"type": "add_error", "message": "Not allowed"},
+}
+
+
+def _synthetic_rules(data_provider: DataProvider, rng: random.Random) -> list[dict]:
+    categories = [category.id for category in data_provider.categories]
+    option_ids = [option.id for option in data_provider.options]
+    rules = []
+    for i in range(rng.randint(1, 60)):
+        conditions: dict = {}
+        for category_id in rng.sample(categories, rng.randint(0, 3)):
+            options = data_provider.get_options_by_category(category_id)
+            values = [option.id for option in rng.sample(options, rng.randint(0, len(options)))]
+            if rng.random() < 0.1:
+                values.append("unknown_option")
+            conditions[category_id] = values
+        if rng.random() < 0.3:
+            conditions["option_category"] = rng.sample(categories, rng.randint(1, 2))
+        if rng.random() < 0.3:
+            conditions["option_values"] = rng.sample(option_ids, rng.randint(1, 4))
+        if rng.random() < 0.3:
+            conditions["missing_categories"] = rng.sample(categories, rng.randint(1, 2))
+        if rng.random() < 0.1:
+            # a bare string keeps substring `in` semantics
+            conditions[rng.choice(categories)] = rng.choice(option_ids)[:3]
+        rule_type = rng.choice(list(ACTIONS))
+        rules.append(
+            {
+                "id": f"{rule_type}_{i}",
+                "name": f"Rule {i}",
+                "type": rule_type,
+                "conditions": conditions,
+                "actions": ACTIONS[rule_type],
+                "priority": rng.randint(0, 100),
+                "active": rng.random() < 0.9,
+            }
+        )
+    return rules
+
+
+def _synthetic_contexts(data_provider: DataProvider, rng: random.Random) -> list[RuleContext]:
+    contexts = []
+    for _ in range(200):
+        configuration = {}
+        for category in data_provider.categories:
+            roll = rng.random()
+            if roll < 0.8:
+                options = data_provider.get_options_by_category(category.id)
+                configuration[category.id] = rng.choice(options).id
+            elif roll < 0.9:
+                configuration[category.id] = rng.choice(["unknown", ""])
+        current_option = rng.choice(data_provider.options) if rng.random() < 0.5 else None
+        contexts.append(RuleContext(configuration=configuration, current_option=current_option))
+    return contexts
+
+
+def _catalog(tmp_path, rules: list[dict]) -> DataProvider:
+    for filename in ("categories.jsonl", "options.jsonl", "settings.jsonl"):
+        shutil.copy(data_file(filename), tmp_path / filename)
+    (tmp_path / "rules.jsonl").write_text("".join(f"{json.dumps(rule)}\n" for rule in rules))
+    return DataProvider(
+        categories_file=tmp_path / "categories.jsonl",
+        options_file=tmp_path / "options.jsonl",
+        rules_file=tmp_path / "rules.jsonl",
+        settings_file=tmp_path / "settings.jsonl",
+    )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_compiled_predicates_match_the_condition_evaluator(tmp_path, seed):
+    rng = random.Random(seed)
+    data_provider = _catalog(tmp_path, _synthetic_rules(_catalog(tmp_path, []), rng))
+    evaluator = ConditionEvaluator()
+    compiled = [compile_rule(rule) for rule in data_provider.rules]
+
+    for context in _synthetic_contexts(data_provider, rng):
+        for entry in compiled:
+            expected = evaluator.matches_conditions(entry.rule.conditions, context)
+            assert entry.matches(context) == expected, (entry.rule.conditions, context)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_indexed_candidates_select_what_a_full_scan_selects(tmp_path, seed):
+    rng = random.Random(seed)
+    data_provider = _catalog(tmp_path, _synthetic_rules(_catalog(tmp_path, []), rng))
+    evaluator = ConditionEvaluator()
+
+    for context in _synthetic_contexts(data_provider, rng):
+        for rule_type in ACTIONS:
+            expected = [
+                rule.id
+                for rule in data_provider.get_rules_by_type(rule_type)
+                if evaluator.matches_conditions(rule.conditions, context)
+            ]
+            actual = [
+                entry.rule.id
+                for entry in data_provider.get_candidate_rules(rule_type, context)
+                if entry.matches(context)
+            ]
+            assert actual == expected, (rule_type, context)
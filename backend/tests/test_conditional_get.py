@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from backend.app.core.settings import settings
+from backend.app.data import initialize_data_provider
+from backend.app.main import app
+from backend.benchmarks.asgi import request, running
+
+QUERY = "cpu_architecture=arm64"
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+
+
+async def _conditional_requests(path: str) -> list:
+    async with running(app):
+        first = await request(app, "GET", path, QUERY)
+        etag = first.headers["etag"]
+        return [
+            first,
+            await request(app, "GET", path, QUERY, headers={"If-None-Match": etag}),
+            await request(app, "GET", path, QUERY, headers={"If-None-Match": f'"other", W/{etag}'}),
+            await request(app, "GET", path, QUERY, headers={"If-None-Match": '"other"'}),
+        ]
+
+
+def test_catalog_routes_answer_matching_etags_with_304():
+    for path in ("/api/v1/servers/options", "/api/v1/servers/configure"):
+        first, matched, weak, stale = asyncio.run(_conditional_requests(path))
+
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "no-cache"
+        for response in (matched, weak):
+            assert response.status_code == 304
+            assert response.body == b""
+            assert response.headers["etag"] == first.headers["etag"]
+        assert stale.status_code == 200
+        assert stale.body == first.body
+
+
+async def _explained_requests(path: str) -> list:
+    async with running(app):
+        etag = (await request(app, "GET", path, QUERY)).headers["etag"]
+        return [
+            await request(app, "GET", path, f"{QUERY}&{explain}", headers={"If-None-Match": etag})
+            for explain in ("explain=true", "explain=1", "explain=false")
+        ]
+
+
+def test_explained_requests_skip_etag_validation():
+    for path in ("/api/v1/servers/options", "/api/v1/servers/configure"):
+        explained, explained_flag, plain = asyncio.run(_explained_requests(path))
+
+        for response in (explained, explained_flag):
+            assert response.status_code == 200
+            assert response.headers["cache-control"] == "no-store"
+            assert "etag" not in response.headers
+            assert "explain" in response.json()["data"]
+        assert plain.status_code == 304
+
+
+def test_content_hash_follows_catalog_content_not_reloads():
+    first = initialize_data_provider(version=1)
+    reloaded = initialize_data_provider(version=2)
+    assert first.content_hash == reloaded.content_hash
+
+    reloaded.rules = reloaded.rules[1:]
+    assert first.content_hash != reloaded._content_hash()
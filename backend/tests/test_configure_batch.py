@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from backend.app.core.settings import settings
+from backend.app.main import app
+from backend.benchmarks.asgi import request, running
+
+AMD = {
+    "cpu_architecture": "amd_ryzen_9",
+    "cpu_cores": "cores_8",
+    "ram": "ram_32gb",
+    "storage": "ssd_1tb",
+    "os": "ubuntu",
+}
+ARM = {"cpu_architecture": "arm64", "ram": "ram_32gb"}
+ARM_WINDOWS = {"cpu_architecture": "arm64", "os": "windows_11"}
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+    # price through the rules engine and its cache, not the precomputed matrix
+    monkeypatch.setattr(settings, "PRICE_MATRIX_ENABLED", False)
+
+
+async def _batches(*batches: list) -> tuple[list, object]:
+    async with running(app):
+        responses = [
+            await request(
+                app,
+                "POST",
+                "/api/v1/servers/configure/batch",
+                json_body={"configurations": configurations},
+            )
+            for configurations in batches
+        ]
+        singles = [
+            await request(
+                app,
+                "GET",
+                "/api/v1/servers/configure",
+                "&".join(f"{key}={value}" for key, value in configuration.items()),
+            )
+            for configuration in (AMD, ARM)
+        ]
+        return responses + singles, app.state.configuration_cache.stats()
+
+
+def test_items_come_back_in_input_order_with_per_item_errors():
+    (batch, amd, arm), _ = asyncio.run(_batches([AMD, ARM_WINDOWS, ARM, AMD]))
+
+    assert batch.status_code == 200
+    items = batch.json()["data"]
+    assert [item["index"] for item in items] == [0, 1, 2, 3]
+    assert items[0]["configuration"] == amd.json()["data"]
+    assert items[2]["configuration"] == arm.json()["data"]
+    assert items[3] == {**items[0], "index": 3}
+    assert items[1]["configuration"] is None
+    assert "not available with ARM64" in items[1]["error"]
+    assert [item["error"] for item in items if item["index"] != 1] == [None, None, None]
+    assert items[2]["configuration"]["discount_descriptions"] == ["20% off RAM for ARM64"]
+
+
+def test_repeated_configurations_are_priced_once():
+    # a blank value is dropped, so the last item repeats the first
+    batch = [AMD, ARM_WINDOWS, ARM, AMD, {**ARM, "os": " "}]
+
+    (first, second, _, _), stats = asyncio.run(_batches(batch, [ARM]))
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["data"][4]["configuration"] == first.json()["data"][2]["configuration"]
+    # three distinct configurations priced by the batch; the next batch and
+    # the single GETs for the same configurations all hit the shared cache
+    assert (stats.misses, stats.size) == (3, 3)
+    assert stats.hits == 3
+
+
+def test_batches_are_limited_in_size(monkeypatch):
+    monkeypatch.setattr(settings, "CONFIGURE_BATCH_MAX_SIZE", 2)
+
+    (at_limit, over_limit, empty, _, _), _ = asyncio.run(
+        _batches([AMD, ARM], [AMD, ARM, AMD], [])
+    )
+
+    assert at_limit.status_code == 200
+    assert len(at_limit.json()["data"]) == 2
+    assert over_limit.status_code == 400
+    assert "at most 2 configurations" in over_limit.body.decode()
+    assert empty.status_code == 422
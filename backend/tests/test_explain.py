@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+from backend.app.core.catalog import build_rule_engine
+from backend.app.core.settings import settings
+from backend.app.main import app
+from backend.app.services.server import ServerService
+from backend.benchmarks.asgi import request, running
+from backend.benchmarks.price_matrix import full_configurations
+
+SELECTION = "cpu_architecture=arm64&cpu_cores=cores_8&ram=ram_32gb&storage=ssd_1tb&os=ubuntu"
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+
+
+async def _get_pairs(path: str, queries: list[str]) -> list[tuple]:
+    async with running(app):
+        pairs = []
+        for query in queries:
+            plain = await request(app, "GET", path, query)
+            explained = await request(app, "GET", path, f"{query}&explain=true")
+            pairs.append((plain, explained))
+        return pairs
+
+
+def test_configure_explain_traces_rules_and_price_steps():
+    [(plain, explained)] = asyncio.run(_get_pairs("/api/v1/servers/configure", [SELECTION]))
+
+    assert explained.status_code == 200
+    assert explained.headers["cache-control"] == "no-store"
+    assert "etag" not in explained.headers
+    data = json.loads(explained.body)["data"]
+    # the explained result is the one the normal path serves
+    assert data["configuration"] == json.loads(plain.body)["data"]
+
+    explain = data["explain"]
+    assert [trace["rule_type"] for trace in explain["rules"]] == ["validation", "discount"]
+    discount = explain["rules"][1]
+    assert discount["matched"] == ["arm64_ram_discount"]
+    assert {"rule_id": "arm64_ram_discount", "matched": True} in discount["checked"]
+
+    steps = explain["price_steps"]
+    assert [step["kind"] for step in steps] == ["base_price"] + ["option"] * 5 + ["discount"]
+    assert steps[-1]["source"] == "arm64_ram_discount"
+    assert steps[-1]["subtotal"] == data["configuration"]["total_price"]
+
+
+def test_configure_explain_reports_validation_errors_with_the_trace():
+    [(plain, explained)] = asyncio.run(
+        _get_pairs("/api/v1/servers/configure", ["cpu_architecture=arm64&os=windows_11"])
+    )
+
+    assert plain.status_code == 400
+    data = json.loads(explained.body)["data"]
+    assert data["configuration"] is None
+    assert data["error"] == json.loads(plain.body)["message"]
+    assert data["explain"]["rules"][0]["matched"] == ["arm64_windows_validation"]
+    assert data["explain"]["price_steps"] == []
+
+
+def test_options_explain_matches_the_listing():
+    pairs = asyncio.run(
+        _get_pairs("/api/v1/servers/options", ["cpu_architecture=arm64", "ram=ram_32gb"])
+    )
+
+    for plain, explained in pairs:
+        data = json.loads(explained.body)["data"]
+        assert data["options"] == json.loads(plain.body)["data"]
+        assert data["explain"]["availability_index"] is True
+        traced = {trace["option_id"]: trace["available"] for trace in data["explain"]["availability"]}
+        listed = {
+            option["id"]: option["available"]
+            for options in data["options"].values()
+            for option in options
+        }
+        assert traced == listed
+
+
+def test_explained_pricing_matches_the_rules_engine_everywhere():
+    rule_engine = build_rule_engine()
+    service = ServerService(rule_engine)
+
+    for configuration in full_configurations(rule_engine.data_provider):
+        explained = service.explain_server_configuration(configuration)
+        priced = service._try_price_configuration(configuration)
+        assert explained.error == priced.error
+        if explained.configuration is None:
+            assert priced.response is None
+        else:
+            assert explained.configuration.model_dump_json() == priced.response.model_dump_json()
+            assert explained.explain.price_steps[-1].subtotal == priced.response.total_price
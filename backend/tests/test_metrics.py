@@ -0,0 +1,94 @@
+import asyncio
+import re
+
+import pytest
+from backend.app.core.metrics import MetricsRegistry
+from backend.app.core.settings import settings
+from backend.app.main import app
+from backend.benchmarks.asgi import request, running
+
+CONFIGURATION = {
+    "cpu_architecture": "arm64",
+    "cpu_cores": "cores_8",
+    "ram": "ram_32gb",
+    "storage": "ssd_1tb",
+    "os": "ubuntu",
+}
+
+
+def _value(text: str, sample: str) -> float:
+    match = re.search(rf"^{re.escape(sample)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+async def _scrape_around(calls) -> tuple[str, str]:
+    async with running(app):
+        before = (await request(app, "GET", "/metrics")).body.decode()
+        for method, path, query, body in calls:
+            response = await request(app, method, path, query, json_body=body)
+            assert response.status_code < 400, response.body
+        after = await request(app, "GET", "/metrics")
+        assert after.headers["content-type"].startswith("text/plain; version=0.0.4")
+        return before, after.body.decode()
+
+
+def test_metrics_cover_rules_caches_and_quote_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+    query = "&".join(f"{key}={value}" for key, value in CONFIGURATION.items())
+    quote = {
+        "configuration": CONFIGURATION,
+        "contact_name": "Ada",
+        "contact_email": "ada@example.com",
+    }
+
+    before, after = asyncio.run(
+        _scrape_around(
+            [
+                ("GET", "/api/v1/servers/options", "cpu_architecture=arm64", None),
+                ("GET", "/api/v1/servers/options", "cpu_architecture=arm64", None),
+                ("GET", "/api/v1/servers/configure", query, None),
+                ("POST", "/api/v1/quotes/requests", "", quote),
+            ]
+        )
+    )
+
+    def delta(sample: str) -> float:
+        return _value(after, sample) - _value(before, sample)
+
+    # the configure call and the quote are both priced from the matrix, so the
+    # rules engine never runs for them
+    assert delta('cpq_price_matrix_lookups_total{result="hit"}') == 2
+    assert delta('cpq_rules_processing_seconds_count{rule_type="discount"}') == 0
+    assert delta('cpq_quote_write_seconds_count{backend="jsonl"}') == 1
+    assert delta('cpq_cache_hits_total{cache="options"}') == 1
+    assert delta('cpq_cache_misses_total{cache="options"}') == 1
+    assert "# TYPE cpq_rules_processing_seconds histogram" in after
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs run", ["queue"])
+    histogram = registry.histogram("job_seconds", "Job time", buckets=(0.1, 1.0))
+
+    counter.labels('a"b').inc()
+    counter.labels('a"b').inc(2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP jobs_total Jobs run",
+        "# TYPE jobs_total counter",
+        'jobs_total{queue="a\\"b"} 3',
+        "# HELP job_seconds Job time",
+        "# TYPE job_seconds histogram",
+        'job_seconds_bucket{le="0.1"} 2',
+        'job_seconds_bucket{le="1"} 3',
+        'job_seconds_bucket{le="+Inf"} 4',
+        "job_seconds_sum 3.65",
+        "job_seconds_count 4",
+    ]
+    # registering the same metric again returns it; a conflicting shape does not
+    assert registry.counter("jobs_total", "Jobs run", ["queue"]) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("jobs_total", "Jobs run", ["queue"])
@@ -0,0 +1,55 @@
+import pytest
+from backend.app.core.catalog import build_rule_engine
+from backend.app.core.settings import settings
+from backend.app.services.price_matrix import build_price_matrix
+from backend.app.services.server import ServerService
+from backend.benchmarks.price_matrix import full_configurations, serialized_price
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture(scope="module")
+def rule_engine(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path_factory.mktemp("snapshots")
+        )
+        yield build_rule_engine()
+
+
+@pytest.fixture(scope="module")
+def matrix(rule_engine):
+    matrix = build_price_matrix(rule_engine, max_cells=10_000_000)
+    assert matrix is not None
+    return matrix
+
+
+def test_matrix_prices_every_configuration_like_the_rules_engine(rule_engine, matrix):
+    engine_service = ServerService(rule_engine)
+    matrix_service = ServerService(rule_engine, price_matrix=matrix)
+
+    configurations = full_configurations(rule_engine.data_provider)
+    assert len(configurations) == matrix.report.cells
+    for configuration in configurations:
+        assert matrix.lookup(configuration) is not None
+        assert serialized_price(matrix_service, configuration) == serialized_price(engine_service, configuration)
+
+
+def test_matrix_leaves_partial_and_unknown_configurations_to_the_engine(rule_engine, matrix):
+    configuration = full_configurations(rule_engine.data_provider)[0]
+    category_id = next(iter(configuration))
+
+    partial = {key: value for key, value in configuration.items() if key != category_id}
+    assert matrix.lookup(partial) is None
+    assert matrix.lookup({**configuration, category_id: "unknown"}) is None
+    assert matrix.lookup({**configuration, "unknown": "unknown"}) is None
+
+
+def test_matrix_from_another_snapshot_is_ignored(tmp_path, monkeypatch, rule_engine, matrix):
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+    service = ServerService(build_rule_engine(version=2), price_matrix=matrix)
+    assert service.price_matrix is None
+
+
+def test_build_respects_max_cells(rule_engine):
+    assert build_price_matrix(rule_engine, max_cells=1) is None
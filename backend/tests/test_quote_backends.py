@@ -0,0 +1,195 @@
+import asyncio
+import gzip
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from backend.app.core.settings import settings
+from backend.app.data.models.quote import Quote
+from backend.app.data.quotes import (
+    JsonlQuoteRepository,
+    QuoteWriter,
+    SqliteQuoteRepository,
+)
+from backend.app.main import app
+from backend.app.services.quote import QuoteService
+from backend.benchmarks.asgi import request, running
+
+START = datetime(2026, 1, 1)
+BACKENDS = ["jsonl", "sqlite"]
+
+
+def _quote(index: int, **update) -> Quote:
+    quote = Quote(
+        id=f"quote-{index:03d}",
+        configuration={"cpu_architecture": "arm64"},
+        contact_name=f"Contact {index}",
+        contact_email=f"contact{index}@example.com",
+        total_price=Decimal("100.00") + index,
+        created_at=START + timedelta(hours=index),
+    )
+    return quote.model_copy(update=update)
+
+
+def _record_size() -> int:
+    return len(_quote(0).model_dump_json()) + 1
+
+
+def _repository(backend: str, tmp_path):
+    if backend == "sqlite":
+        # small pages, so listings cross page boundaries
+        return SqliteQuoteRepository(tmp_path / "quotes.sqlite3", page_size=2)
+    return JsonlQuoteRepository(tmp_path / "quotes.jsonl", segment_max_bytes=2 * _record_size())
+
+
+def _ids(quotes) -> list[str]:
+    return [quote.id for quote in quotes]
+
+
+def _pages(service: QuoteService, **filters) -> list[list[str]]:
+    pages = [service.list_quotes_page(limit=3, **filters)]
+    while pages[-1].next_cursor is not None:
+        pages.append(
+            service.list_quotes_page(limit=3, cursor=pages[-1].next_cursor, **filters)
+        )
+    return [_ids(page.items) for page in pages]
+
+
+def _operations(repository) -> dict:
+    """Run the same reads and writes against a backend and collect what it returns."""
+    quotes = [_quote(index) for index in range(7)]
+    repository.append_many(quotes[:3])
+    for quote in quotes[3:]:
+        repository.append(quote)
+    # the first write of an id wins
+    repository.append(_quote(2, contact_name="Later"))
+    service = QuoteService(server_service=None, quote_repository=repository)
+
+    results = {
+        "lookups": [repository.fetch(quote.id) for quote in quotes],
+        "duplicate": repository.fetch("quote-002").contact_name,
+        "unknown": repository.get("no-such-quote"),
+        "pages": _pages(service, created_to=START + timedelta(hours=7)),
+        "offset": _ids(service.list_quotes_page(limit=2, offset=3).items),
+        "window": _pages(
+            service,
+            created_from=START + timedelta(hours=2),
+            created_to=(START + timedelta(hours=5)).astimezone(),
+        ),
+        "empty": _pages(service, created_from=START + timedelta(days=1)),
+    }
+    repository.close()
+    return results
+
+
+def test_backends_return_the_same_results_for_the_same_operations(tmp_path):
+    jsonl, sqlite = (
+        _operations(_repository(backend, tmp_path / backend)) for backend in BACKENDS
+    )
+
+    assert jsonl == sqlite
+    assert sqlite["lookups"] == [_quote(index) for index in range(7)]
+    assert sqlite["duplicate"] == "Contact 2"
+    assert sqlite["pages"] == [
+        ["quote-000", "quote-001", "quote-002"],
+        ["quote-003", "quote-004", "quote-005"],
+        ["quote-006"],
+    ]
+    assert sqlite["offset"] == ["quote-003", "quote-004"]
+    assert sqlite["window"] == [["quote-002", "quote-003", "quote-004"]]
+    assert sqlite["empty"] == [[]]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_reject_malformed_cursors(tmp_path, backend):
+    repository = _repository(backend, tmp_path)
+    service = QuoteService(server_service=None, quote_repository=repository)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        service.list_quotes_page(limit=1, cursor="bogus")
+    repository.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_persist_batches_from_the_quote_writer(tmp_path, backend):
+    repository = _repository(backend, tmp_path)
+    writer = QuoteWriter(repository, batch_size=4, flush_interval_ms=20)
+    writer.start()
+    futures = [writer.submit(_quote(index)) for index in range(6)]
+    assert writer.stop()
+    for future in futures:
+        future.result(timeout=0)
+    repository.close()
+
+    reopened = _repository(backend, tmp_path)
+    assert len(reopened) == 6
+    assert list(reopened.iter_quotes()) == [_quote(index) for index in range(6)]
+    reopened.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_archive_old_quotes_out_of_lookups_and_listings(tmp_path, backend):
+    repository = _repository(backend, tmp_path)
+    quotes = [_quote(index) for index in range(5)]
+    for quote in quotes:
+        repository.append(quote)
+    cutoff = START + timedelta(hours=2)
+    if backend == "jsonl":
+        # segments are archived by when they were last written
+        sealed_at = (START + timedelta(hours=1)).timestamp()
+        os.utime(tmp_path / "quotes.000001.jsonl", (sealed_at, sealed_at))
+
+    archived = repository.archive(cutoff)
+
+    assert len(archived) == 1
+    with gzip.open(archived[0], "rt", encoding="utf-8") as file:
+        assert [Quote.model_validate_json(line) for line in file] == quotes[:2]
+    assert [repository.get(quote.id) for quote in quotes] == [None, None, *quotes[2:]]
+    assert list(repository.iter_quotes()) == quotes[2:]
+    assert repository.archive(cutoff) == []
+    repository.close()
+
+
+async def _create_list_and_get() -> list:
+    async with running(app):
+        created = await request(
+            app,
+            "POST",
+            "/api/v1/quotes/requests",
+            json_body={
+                "configuration": {
+                    "cpu_architecture": "amd_ryzen_9",
+                    "cpu_cores": "cores_8",
+                    "ram": "ram_32gb",
+                    "storage": "ssd_1tb",
+                    "os": "ubuntu",
+                },
+                "contact_name": "Test Contact",
+                "contact_email": "contact@example.com",
+            },
+        )
+        quote_id = created.json()["data"]["id"]
+        return [
+            created,
+            await request(app, "GET", f"/api/v1/quotes/{quote_id}"),
+            await request(app, "GET", "/api/v1/quotes", "limit=5"),
+        ]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_quote_routes_behave_the_same_on_either_backend(tmp_path, monkeypatch, backend):
+    monkeypatch.setattr(settings, "QUOTE_STORAGE_BACKEND", backend)
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "QUOTES_DATABASE_PATH", tmp_path / "quotes.sqlite3")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+
+    created, found, listed = asyncio.run(_create_list_and_get())
+
+    assert created.status_code == 201
+    assert found.status_code == 200
+    assert found.json()["data"]["id"] == created.json()["data"]["id"]
+    assert found.json()["data"]["total_price"] == created.json()["data"]["total_price"]
+    assert [item["id"] for item in listed.json()["data"]["items"]] == [
+        created.json()["data"]["id"]
+    ]
+    assert listed.json()["data"]["next_cursor"] is None
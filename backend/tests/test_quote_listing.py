@@ -0,0 +1,129 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from backend.app.core.settings import settings
+from backend.app.data.models.quote import Quote
+from backend.app.data.quotes import JsonlQuoteRepository
+from backend.app.main import app
+from backend.app.services.quote import QuoteService
+from backend.benchmarks.asgi import request, running
+
+START = datetime(2026, 1, 1)
+
+
+def _quote(index: int) -> Quote:
+    return Quote(
+        id=f"quote-{index:03d}",
+        configuration={"cpu_architecture": "arm64"},
+        contact_name=f"Contact {index}",
+        contact_email=f"contact{index}@example.com",
+        total_price=Decimal("100.00") + index,
+        created_at=START + timedelta(hours=index),
+    )
+
+
+def _service(repository) -> QuoteService:
+    # listings never price a configuration
+    return QuoteService(server_service=None, quote_repository=repository)
+
+
+def _ids(quotes) -> list[str]:
+    return [quote.id for quote in quotes]
+
+
+@pytest.mark.parametrize("segment_max_bytes", [0, 1000])
+def test_cursor_pages_cover_the_log_once_in_order(tmp_path, segment_max_bytes):
+    repository = JsonlQuoteRepository(tmp_path / "quotes.jsonl", segment_max_bytes=segment_max_bytes)
+    quotes = [_quote(index) for index in range(7)]
+    for quote in quotes:
+        repository.append(quote)
+    service = _service(repository)
+
+    pages = [service.list_quotes_page(limit=3)]
+    while pages[-1].next_cursor is not None:
+        pages.append(service.list_quotes_page(limit=3, cursor=pages[-1].next_cursor))
+
+    assert [len(page.items) for page in pages] == [3, 3, 1]
+    assert _ids(item for page in pages for item in page.items) == _ids(quotes)
+    # a page ending exactly on the last quote still has no next page
+    assert service.list_quotes_page(limit=7).next_cursor is None
+
+
+def test_offset_pages_skip_matching_quotes(tmp_path):
+    repository = JsonlQuoteRepository(tmp_path / "quotes.jsonl")
+    quotes = [_quote(index) for index in range(7)]
+    repository.append_many(quotes)
+    service = _service(repository)
+
+    page = service.list_quotes_page(limit=3, offset=2)
+    assert _ids(page.items) == _ids(quotes[2:5])
+    resumed = service.list_quotes_page(limit=3, cursor=page.next_cursor)
+    assert _ids(resumed.items) == _ids(quotes[5:])
+    assert service.list_quotes_page(limit=3, offset=10).items == []
+
+
+def test_created_at_filters_select_a_half_open_window(tmp_path):
+    repository = JsonlQuoteRepository(tmp_path / "quotes.jsonl")
+    quotes = [_quote(index) for index in range(7)]
+    repository.append_many(quotes)
+    service = _service(repository)
+
+    window = service.list_quotes_page(
+        limit=10, created_from=START + timedelta(hours=2), created_to=START + timedelta(hours=5)
+    )
+    assert _ids(window.items) == _ids(quotes[2:5])
+
+    # aware bounds are compared in local time, as quotes are stored
+    aware = service.list_quotes_page(
+        limit=10, created_from=(START + timedelta(hours=4)).astimezone()
+    )
+    assert _ids(aware.items) == _ids(quotes[4:])
+
+    filtered = service.list_quotes_page(limit=1, offset=1, created_from=START + timedelta(hours=3))
+    assert _ids(filtered.items) == _ids(quotes[4:5])
+
+
+def test_invalid_cursors_are_rejected(tmp_path):
+    service = _service(JsonlQuoteRepository(tmp_path / "quotes.jsonl"))
+    for cursor in ("abc", "1:x", "x:1"):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            service.list_quotes_page(limit=1, cursor=cursor)
+
+
+async def _listing_requests() -> list:
+    async with running(app):
+        first = await request(app, "GET", "/api/v1/quotes", "limit=2")
+        cursor = first.json()["data"]["next_cursor"]
+        return [
+            first,
+            await request(app, "GET", "/api/v1/quotes", f"limit=2&cursor={cursor}"),
+            await request(app, "GET", "/api/v1/quotes", "cursor=bogus"),
+            await request(app, "GET", "/api/v1/quotes/stream"),
+            await request(app, "GET", "/api/v1/quotes/stream", f"cursor={cursor}"),
+            await request(
+                app, "GET", "/api/v1/quotes/stream", "created_from=2026-01-01T03:00:00"
+            ),
+        ]
+
+
+def test_listing_routes_page_and_stream_ndjson(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+    quotes = [_quote(index) for index in range(5)]
+    JsonlQuoteRepository(tmp_path / "quotes.jsonl").append_many(quotes)
+
+    first, second, invalid, stream, resumed, windowed = asyncio.run(_listing_requests())
+
+    assert [item["id"] for item in first.json()["data"]["items"]] == _ids(quotes[:2])
+    assert [item["id"] for item in second.json()["data"]["items"]] == _ids(quotes[2:4])
+    assert invalid.status_code == 400
+
+    assert stream.status_code == 200
+    assert stream.headers["content-type"] == "application/x-ndjson"
+    lines = stream.body.decode().splitlines()
+    assert [Quote.model_validate_json(line) for line in lines] == quotes
+    assert [json.loads(line)["id"] for line in resumed.body.decode().splitlines()] == _ids(quotes[2:])
+    assert [json.loads(line)["id"] for line in windowed.body.decode().splitlines()] == _ids(quotes[3:])
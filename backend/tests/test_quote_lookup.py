@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from backend.app.core.settings import settings
+from backend.app.data.models.quote import Quote
+from backend.app.data.quotes import JsonlQuoteRepository
+from backend.app.main import app
+from backend.benchmarks.asgi import request, running
+
+QUOTE_REQUEST = {
+    "configuration": {
+        "cpu_architecture": "amd_ryzen_9",
+        "cpu_cores": "cores_8",
+        "ram": "ram_32gb",
+        "storage": "ssd_1tb",
+        "os": "ubuntu",
+    },
+    "contact_name": "Test Contact",
+    "contact_email": "contact@example.com",
+}
+
+
+def _quote(index: int) -> Quote:
+    return Quote(
+        id=f"quote-{index:03d}",
+        configuration={"cpu_architecture": "arm64"},
+        contact_name=f"Contact {index}",
+        contact_email=f"contact{index}@example.com",
+        total_price=Decimal("100.00") + index,
+        created_at=datetime(2026, 1, 1) + timedelta(hours=index),
+    )
+
+
+def test_lookups_read_one_record_through_the_offset_index(tmp_path):
+    path = tmp_path / "quotes.jsonl"
+    quotes = [_quote(index) for index in range(5)]
+    JsonlQuoteRepository(path).append_many(quotes)
+    # a malformed line and a duplicate id do not disturb the index
+    with open(path, "ab") as file:
+        file.write(b"not json\n")
+        file.write(f"{_quote(2).model_copy(update={'contact_name': 'Later'}).model_dump_json()}\n".encode())
+
+    repository = JsonlQuoteRepository(path, cache_size=2)
+    assert len(repository) == 5
+    for quote in quotes:
+        assert repository.get(quote.id) == quote
+    assert repository.get("quote-002").contact_name == "Contact 2"
+    assert repository.get("no-such-quote") is None
+
+
+def test_lookup_cache_evicts_the_least_recently_used_quote(tmp_path):
+    path = tmp_path / "quotes.jsonl"
+    JsonlQuoteRepository(path).append_many([_quote(index) for index in range(3)])
+    repository = JsonlQuoteRepository(path, cache_size=2)
+
+    assert repository.get_cached("quote-000") is None
+    repository.get("quote-000")
+    repository.get("quote-001")
+    assert repository.get_cached("quote-000") is not None
+    repository.get("quote-002")
+
+    # quote-000 was used more recently than quote-001
+    assert repository.get_cached("quote-001") is None
+    assert repository.get_cached("quote-000") is not None
+    stats = repository.cache_stats()
+    assert (stats.size, stats.max_size, stats.evictions) == (2, 2, 1)
+    # an evicted quote is still read from the log
+    assert repository.get("quote-001") == _quote(1)
+
+
+def test_lookups_find_quotes_appended_by_another_process(tmp_path):
+    path = tmp_path / "quotes.jsonl"
+    reader = JsonlQuoteRepository(path)
+    writer = JsonlQuoteRepository(path)
+    writer.append(_quote(7))
+
+    assert reader.get("quote-007") == _quote(7)
+    assert len(reader) == 1
+
+
+async def _create_and_get() -> list:
+    async with running(app):
+        created = await request(app, "POST", "/api/v1/quotes/requests", json_body=QUOTE_REQUEST)
+        quote_id = created.json()["data"]["id"]
+        return [
+            created,
+            await request(app, "GET", f"/api/v1/quotes/{quote_id}"),
+            await request(app, "GET", "/api/v1/quotes/no-such-quote"),
+        ]
+
+
+def test_quote_route_returns_a_stored_quote_and_404_for_an_unknown_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+
+    created, found, missing = asyncio.run(_create_and_get())
+
+    assert created.status_code == 201
+    assert found.status_code == 200
+    quote = found.json()["data"]
+    assert quote["id"] == created.json()["data"]["id"]
+    assert quote["configuration"] == QUOTE_REQUEST["configuration"]
+    assert quote["total_price"] == created.json()["data"]["total_price"]
+    assert missing.status_code == 404
@@ -0,0 +1,178 @@
+import gzip
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from backend.app.data.models.quote import Quote
+from backend.app.data.quotes import JsonlQuoteRepository
+from backend.app.data.quotes.bloom import BloomFilter
+
+
+def _quote(index: int) -> Quote:
+    return Quote(
+        id=f"quote-{index:03d}",
+        configuration={"cpu_architecture": "arm64"},
+        contact_name=f"Contact {index}",
+        contact_email=f"contact{index}@example.com",
+        total_price=Decimal("100.00") + index,
+        created_at=datetime(2026, 1, 1) + timedelta(hours=index),
+    )
+
+
+def _record_size() -> int:
+    return len(_quote(0).model_dump_json()) + 1
+
+
+def test_rotation_during_iteration_keeps_the_sealed_records(tmp_path):
+    # seal a segment every three records
+    repository = JsonlQuoteRepository(
+        tmp_path / "quotes.jsonl", segment_max_bytes=3 * _record_size()
+    )
+    quotes = [_quote(index) for index in range(5)]
+    repository.append_many(quotes[:3])
+    repository.append_many(quotes[3:5])
+    assert repository.segment_count == 1
+
+    records = repository.iter_records()
+    first_cursor, first = next(records)
+    assert first == quotes[0]
+
+    # the active file, holding quotes 3 and 4, is sealed mid-listing
+    later = [_quote(index) for index in range(5, 7)]
+    repository.append(later[0])
+    assert repository.segment_count == 2
+    repository.append(later[1])
+
+    rest = list(records)
+    assert [quote.id for _, quote in rest] == [quote.id for quote in quotes[1:] + later[:1]]
+    cursors = [first_cursor] + [cursor for cursor, _ in rest]
+    assert [cursor.split(":")[0] for cursor in cursors] == ["1", "1", "1", "2", "2", "2"]
+
+    # cursors taken before the rotation resume inside the sealed segment
+    resumed = repository.iter_records(repository.parse_cursor(cursors[3]))
+    assert [quote.id for _, quote in resumed] == [quote.id for quote in quotes[4:] + later]
+    repository.close()
+
+
+def _ids(records) -> list[str]:
+    return [quote.id for _, quote in records]
+
+
+def test_full_active_files_are_sealed_with_sidecars_and_stay_searchable(tmp_path):
+    path = tmp_path / "quotes.jsonl"
+    repository = JsonlQuoteRepository(path, segment_max_bytes=2 * _record_size())
+    quotes = [_quote(index) for index in range(5)]
+    for quote in quotes:
+        repository.append(quote)
+
+    assert repository.segment_count == 2
+    for seq in (1, 2):
+        for suffix in (".jsonl", ".idx", ".bloom"):
+            assert (tmp_path / f"quotes.{seq:06d}{suffix}").exists()
+    assert len(repository) == 5
+
+    # a fresh instance finds quotes in every segment and in the active file
+    reopened = JsonlQuoteRepository(path, segment_max_bytes=2 * _record_size())
+    assert reopened.segment_count == 2
+    for quote in quotes:
+        assert reopened.get(quote.id) == quote
+    assert [cursor.split(":")[0] for cursor, _ in reopened.iter_records()] == [
+        "1", "1", "2", "2", "3"
+    ]
+
+
+def test_bloom_filters_rule_out_segments_without_the_id(tmp_path, monkeypatch):
+    path = tmp_path / "quotes.jsonl"
+    repository = JsonlQuoteRepository(path, segment_max_bytes=2 * _record_size())
+    for index in range(4):
+        repository.append(_quote(index))
+    first, second = repository._segments
+
+    assert all(quote_id in first.bloom for quote_id in ("quote-000", "quote-001"))
+    assert "quote-002" not in first.bloom
+    assert "quote-000" not in second.bloom
+
+    consulted = []
+    load_offsets = repository._load_segment_offsets
+    monkeypatch.setattr(
+        repository,
+        "_load_segment_offsets",
+        lambda segment: consulted.append(segment.seq) or load_offsets(segment),
+    )
+    assert repository.fetch("quote-003") == _quote(3)
+    assert repository.fetch("missing-0") is None
+    assert consulted == [2]
+
+
+def test_bloom_filters_round_trip_through_their_sidecar(tmp_path):
+    bloom = BloomFilter.from_keys([f"quote-{index:03d}" for index in range(100)], 0.01)
+    bloom.save(tmp_path / "quotes.bloom")
+
+    loaded = BloomFilter.load(tmp_path / "quotes.bloom")
+    assert loaded.item_count == 100
+    assert all(f"quote-{index:03d}" in loaded for index in range(100))
+    absent = [f"missing-{index}" for index in range(1000)]
+    assert [key in loaded for key in absent] == [key in bloom for key in absent]
+    assert sum(key in loaded for key in absent) < 50
+
+    (tmp_path / "truncated.bloom").write_bytes(b"QB")
+    with pytest.raises(ValueError, match="Truncated bloom filter"):
+        BloomFilter.load(tmp_path / "truncated.bloom")
+
+
+def test_compaction_merges_segments_and_drops_duplicates_and_malformed_lines(tmp_path):
+    path = tmp_path / "quotes.jsonl"
+    repository = JsonlQuoteRepository(path, segment_max_bytes=2 * _record_size())
+    quotes = [_quote(index) for index in range(5)]
+    for quote in quotes[:4]:
+        repository.append(quote)
+    with open(path, "ab") as file:
+        file.write(b"not json\n")
+        file.write(f"{_quote(1).model_copy(update={'contact_name': 'Later'}).model_dump_json()}\n".encode())
+    repository.append(quotes[4])
+    assert repository.segment_count == 3
+    cursor = next(cursor for cursor, quote in repository.iter_records() if quote.id == "quote-002")
+
+    # without a size limit every sealed segment is merged into the newest
+    compacting = JsonlQuoteRepository(path)
+    assert compacting.compact() == 2
+    assert compacting.segment_count == 1
+    assert not (tmp_path / "quotes.000001.jsonl").exists()
+    assert (tmp_path / "quotes.000003.jsonl").exists()
+    assert _ids(compacting.iter_records()) == [quote.id for quote in quotes]
+    assert compacting.compact() == 0
+
+    # the instance that wrote the segments follows them into the merged one
+    assert repository.fetch("quote-001") == quotes[1]
+    assert repository.fetch("quote-004") == quotes[4]
+    # a cursor into a merged segment resumes no later than before
+    resumed = _ids(repository.iter_records(repository.parse_cursor(cursor)))
+    assert resumed[-2:] == ["quote-003", "quote-004"]
+
+
+def test_archive_moves_old_segments_out_of_lookups_and_listings(tmp_path):
+    path = tmp_path / "quotes.jsonl"
+    repository = JsonlQuoteRepository(path, segment_max_bytes=2 * _record_size())
+    quotes = [_quote(index) for index in range(5)]
+    for quote in quotes:
+        repository.append(quote)
+    old = (datetime.now() - timedelta(days=30)).timestamp()
+    os.utime(tmp_path / "quotes.000001.jsonl", (old, old))
+
+    archived = repository.archive(datetime.now() - timedelta(days=7))
+
+    assert archived == [repository.archive_dir / "quotes.000001.jsonl.gz"]
+    with gzip.open(archived[0], "rt", encoding="utf-8") as file:
+        assert [Quote.model_validate_json(line) for line in file] == quotes[:2]
+    assert not any(tmp_path.glob("quotes.000001.*"))
+    assert repository.segment_count == 1
+    assert repository.get("quote-000") is None
+    assert JsonlQuoteRepository(path).get("quote-001") is None
+    assert repository.get("quote-002") == quotes[2]
+    assert _ids(repository.iter_records()) == [quote.id for quote in quotes[2:]]
+
+    # sequence numbers are not reused once the archived segment is gone
+    repository.append(_quote(5))
+    assert (tmp_path / "quotes.000003.jsonl").exists()
+    assert repository.archive(datetime.now() - timedelta(days=7)) == []
@@ -0,0 +1,25 @@
+import asyncio
+
+from backend.app.core.settings import settings
+from backend.app.main import app
+from backend.benchmarks.quote_write_contention import measure_contention
+
+ATTEMPTS = 2
+
+
+def test_quote_writes_do_not_stall_configure_requests(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+    monkeypatch.setattr(settings, "QUOTE_WRITER_FSYNC", True)
+
+    # a timing check: one noisy run (a cold start, a GC pause) gets a retry
+    for _ in range(ATTEMPTS):
+        result = asyncio.run(
+            measure_contention(app, requests=300, writers=16, quote_rate=100)
+        )
+        failures = result.failures(max_slowdown=2.0, max_tail_slowdown=3.0)
+        if not failures:
+            break
+
+    assert result.quotes_written > 0
+    assert not failures, failures
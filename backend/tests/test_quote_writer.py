@@ -0,0 +1,101 @@
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from backend.app.data.models.quote import Quote
+from backend.app.data.quotes import JsonlQuoteRepository, QuoteWriter
+
+
+class _RecordingRepository(JsonlQuoteRepository):
+
+    def __init__(self, *args, fail: bool = False, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.fail = fail
+        self.batches: list[list[str]] = []
+
+    def append_many(self, quotes: list[Quote], fsync: bool = False) -> None:
+        if self.fail:
+            raise OSError("disk full")
+        self.batches.append([quote.id for quote in quotes])
+        super().append_many(quotes, fsync)
+
+
+def _quote(index: int) -> Quote:
+    return Quote(
+        id=f"quote-{index:03d}",
+        configuration={"cpu_architecture": "arm64"},
+        contact_name=f"Contact {index}",
+        contact_email=f"contact{index}@example.com",
+        total_price=Decimal("100.00") + index,
+        created_at=datetime(2026, 1, 1) + timedelta(hours=index),
+    )
+
+
+def test_queued_quotes_are_committed_in_batches_of_at_most_batch_size(tmp_path):
+    repository = _RecordingRepository(tmp_path / "quotes.jsonl")
+    writer = QuoteWriter(repository, batch_size=3, flush_interval_ms=200)
+    writer.start()
+    try:
+        futures = [writer.submit(_quote(index)) for index in range(7)]
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        writer.stop()
+
+    assert [len(batch) for batch in repository.batches] == [3, 3, 1]
+    assert [quote_id for batch in repository.batches for quote_id in batch] == [
+        f"quote-{index:03d}" for index in range(7)
+    ]
+    stats = writer.stats()
+    assert (stats.batches, stats.records, stats.max_batch_size, stats.pending) == (3, 7, 3, 0)
+    assert stats.average_batch_size == pytest.approx(7 / 3)
+
+
+def test_a_partial_batch_is_committed_once_the_flush_interval_passes(tmp_path):
+    repository = _RecordingRepository(tmp_path / "quotes.jsonl")
+    writer = QuoteWriter(repository, batch_size=100, flush_interval_ms=20)
+    writer.start()
+    try:
+        writer.write(_quote(1))
+        assert repository.get("quote-001") == _quote(1)
+    finally:
+        writer.stop()
+    assert repository.batches == [["quote-001"]]
+
+
+def test_stop_commits_queued_quotes_and_later_submits_fail(tmp_path):
+    repository = _RecordingRepository(tmp_path / "quotes.jsonl")
+    # a batch would otherwise wait a minute for more quotes
+    writer = QuoteWriter(repository, batch_size=100, flush_interval_ms=60_000)
+    writer.start()
+    futures = [writer.submit(_quote(index)) for index in range(3)]
+
+    start = time.perf_counter()
+    assert writer.stop()
+    assert time.perf_counter() - start < 5
+    for future in futures:
+        assert future.result(timeout=0) is None
+    assert len(JsonlQuoteRepository(tmp_path / "quotes.jsonl")) == 3
+
+    with pytest.raises(RuntimeError, match="quote writer is not running"):
+        writer.submit(_quote(4))
+    # stopping twice is harmless
+    assert writer.stop()
+
+
+def test_a_failed_commit_fails_every_quote_in_its_batch(tmp_path):
+    repository = _RecordingRepository(tmp_path / "quotes.jsonl", fail=True)
+    writer = QuoteWriter(repository, batch_size=10, flush_interval_ms=20)
+    writer.start()
+    try:
+        futures = [writer.submit(_quote(index)) for index in range(2)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="Failed to save quote: disk full"):
+                future.result(timeout=5)
+        # the writer keeps running after a failed batch
+        repository.fail = False
+        writer.write(_quote(3))
+    finally:
+        writer.stop()
+    assert repository.batches == [["quote-003"]]
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import queue
+
+import pytest
+from backend.app.core.logger import BoundedQueueHandler
+from backend.app.core.settings import settings
+from backend.app.main import app
+from backend.app.middleware.requests import HttpRequestLoggingMiddleware
+from backend.benchmarks.asgi import request, running
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "QUOTES_FILE_PATH", tmp_path / "quotes.jsonl")
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+
+
+async def _requests() -> list:
+    async with running(app):
+        return [
+            await request(app, "GET", "/health", headers={"X-Request-ID": "a" * 32}),
+            await request(app, "GET", "/api/v1/servers/configure", "ram=unknown"),
+        ]
+
+
+def _access_events(records) -> list[dict]:
+    return [record.msg for record in records if record.name == "api.access"]
+
+
+def test_access_log_records_status_and_request_fields(caplog):
+    with caplog.at_level(logging.INFO, logger="api.access"):
+        health, invalid = asyncio.run(_requests())
+
+    events = _access_events(caplog.records)
+    assert [event["http"]["status_code"] for event in events] == [
+        health.status_code,
+        invalid.status_code,
+    ]
+    assert invalid.status_code == 400
+
+    health_event, invalid_event = events
+    assert health_event["http"]["request_id"] == "a" * 32
+    assert health_event["http"]["url"] == "http://benchmark/health"
+    assert health_event["network"] == {"client": {"ip": "127.0.0.1", "port": 50000}}
+    assert invalid_event["event"].endswith("'GET /api/v1/servers/configure?ram=unknown HTTP/1.1' 400")
+    assert invalid_event["duration"] > 0
+
+
+async def _plain_app(scope, receive, send) -> None:
+    status = int(scope["path"].strip("/"))
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _sampled_requests(middleware, paths: list[str]) -> None:
+    for path in paths:
+        await request(middleware, "GET", path)
+
+
+def test_sampling_keeps_errors_and_slow_requests(caplog):
+    unsampled = HttpRequestLoggingMiddleware(_plain_app, sample_rate=0.0)
+    all_slow = HttpRequestLoggingMiddleware(_plain_app, sample_rate=0.0, slow_request_ms=1e-6)
+
+    with caplog.at_level(logging.INFO, logger="api.access"):
+        asyncio.run(_sampled_requests(unsampled, ["/200", "/304", "/404", "/500"]))
+        logged = [event["http"]["status_code"] for event in _access_events(caplog.records)]
+        caplog.clear()
+        asyncio.run(_sampled_requests(all_slow, ["/200"]))
+        slow = [event["http"]["status_code"] for event in _access_events(caplog.records)]
+
+    assert logged == [404, 500]
+    assert slow == [200]
+
+
+def test_bounded_queue_handler_drops_and_reports():
+    records = [logging.makeLogRecord({"msg": str(i)}) for i in range(4)]
+
+    newest = BoundedQueueHandler(queue.Queue(maxsize=2), "drop_newest")
+    for record in records[:3]:
+        newest.handle(record)
+    assert newest.dropped == 1
+    assert [newest.queue.get_nowait().msg for _ in range(2)] == ["0", "1"]
+    # the next record that fits is followed by a report of the drops
+    newest.handle(records[3])
+    assert newest.queue.get_nowait().msg == "3"
+    assert newest.queue.get_nowait().msg == "Dropped 1 log records: logging queue full"
+
+    oldest = BoundedQueueHandler(queue.Queue(maxsize=2), "drop_oldest")
+    for record in records[:3]:
+        oldest.handle(record)
+    assert oldest.dropped == 1
+    assert [oldest.queue.get_nowait().msg for _ in range(2)] == ["1", "2"]
@@ -0,0 +1,117 @@
+import json
+import shutil
+from decimal import Decimal
+
+import pytest
+from backend.app.core.catalog import build_rule_engine
+from backend.app.core.settings import settings
+from backend.app.data import DataProvider, data_file
+from backend.app.data.models import (
+    PercentageDiscountAction,
+    RuleContext,
+    SetBasePriceAction,
+    UnknownAction,
+)
+from backend.app.rules.handlers.discount import DiscountHandler
+from backend.app.services.server import ServerService
+
+
+def _catalog(tmp_path, rules: list[dict]) -> DataProvider:
+    for filename in ("categories.jsonl", "options.jsonl", "settings.jsonl"):
+        shutil.copy(data_file(filename), tmp_path / filename)
+    (tmp_path / "rules.jsonl").write_text("".join(f"{json.dumps(rule)}\n" for rule in rules))
+    return DataProvider(
+        categories_file=tmp_path / "categories.jsonl",
+        options_file=tmp_path / "options.jsonl",
+        rules_file=tmp_path / "rules.jsonl",
+        settings_file=tmp_path / "settings.jsonl",
+    )
+
+
+def _rule(rule_id: str, rule_type: str, actions: dict, active: bool = True) -> dict:
+    return {
+        "id": rule_id,
+        "name": rule_id,
+        "type": rule_type,
+        "conditions": {},
+        "actions": actions,
+        "priority": 1,
+        "active": active,
+    }
+
+
+def test_actions_are_parsed_once_on_load(tmp_path):
+    data_provider = _catalog(
+        tmp_path,
+        [
+            _rule("base_pricing", "pricing", {"type": "set_base_price", "amount": "42.50"}),
+            _rule(
+                "ram_discount",
+                "discount",
+                {"type": "percentage_discount", "category": "ram", "percentage": 12.5},
+            ),
+            _rule("future", "discount", {"type": "tiered_discount", "tiers": [1, 2]}),
+        ],
+    )
+    base, discount, future = data_provider.rules
+
+    assert isinstance(base.action, SetBasePriceAction)
+    assert data_provider.get_base_price() == Decimal("42.50")
+    assert isinstance(discount.action, PercentageDiscountAction)
+    assert discount.action.rate == Decimal("0.125")
+    # unknown action types still load, and no handler acts on them
+    assert isinstance(future.action, UnknownAction)
+    assert future.action.type == "tiered_discount"
+
+
+def test_discount_matches_the_untyped_computation(tmp_path):
+    percentage = "17.5"
+    data_provider = _catalog(
+        tmp_path,
+        [
+            _rule(
+                "ram_discount",
+                "discount",
+                {"type": "percentage_discount", "category": "ram", "percentage": percentage},
+            )
+        ],
+    )
+    option = data_provider.get_available_options_by_category("ram")[-1]
+    context = RuleContext(configuration={"ram": option.id})
+
+    amount, _ = DiscountHandler(data_provider).execute(data_provider.rules, context)
+
+    assert amount == option.price * (Decimal(percentage) / 100)
+    assert str(amount) == str(option.price * (Decimal(percentage) / 100))
+
+
+def test_configurations_matching_a_discount_rule_are_priced(tmp_path, monkeypatch):
+    # the handler once called `.get` on the RuleContext instead of its
+    # configuration, so any discounted configuration failed with a 500
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+    service = ServerService(build_rule_engine())
+
+    priced = service.get_server_configuration({"cpu_architecture": "arm64", "ram": "ram_32gb"})
+
+    assert priced.total_discount == Decimal("29.00") * Decimal("0.2")
+    assert priced.discount_descriptions == ["20% off RAM for ARM64"]
+
+
+def test_base_price_ignores_inactive_rules(tmp_path):
+    data_provider = _catalog(
+        tmp_path,
+        [_rule("base_pricing", "pricing", {"type": "set_base_price", "amount": "9"}, False)],
+    )
+    assert data_provider.get_base_price() == Decimal("0.00")
+
+
+@pytest.mark.parametrize(
+    "actions",
+    [
+        {"type": "percentage_discount", "category": "ram", "percentage": "lots"},
+        {"type": "set_base_price", "amount": []},
+    ],
+)
+def test_invalid_actions_fail_at_load(tmp_path, actions):
+    with pytest.raises(RuntimeError, match="Invalid data in rules file"):
+        _catalog(tmp_path, [_rule("broken", "discount", actions)])
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+from backend.app.api.routes.servers import render_server_options
+from backend.app.core.cache import LRUCache
+from backend.app.core.catalog import build_rule_engine
+from backend.app.core.settings import settings
+from backend.app.services.server import ServerService
+
+
+@pytest.fixture(autouse=True)
+def isolated_snapshot_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_CACHE_DIR", tmp_path / "snapshots")
+
+
+def _availability(body: bytes, category_id: str) -> dict[str, bool]:
+    options = json.loads(body)["data"][category_id]
+    return {option["id"]: option["available"] for option in options}
+
+
+def test_rendered_options_are_cached_per_selection_and_catalog_version():
+    cache = LRUCache(max_size=16)
+    service = ServerService(build_rule_engine(), options_cache=cache)
+
+    first = service.render_server_options(
+        {"cpu_architecture": "arm64", "ram": "ram_32gb"}, render_server_options
+    )
+    # the same selection in another order is the same canonical configuration
+    assert service.render_server_options(
+        {"ram": "ram_32gb", "cpu_architecture": "arm64"}, render_server_options
+    ) is first
+    assert not _availability(first, "os")["windows_11"]
+
+    unselected = service.render_server_options({}, render_server_options)
+    assert unselected is not first
+    assert _availability(unselected, "os")["windows_11"]
+    assert cache.stats().hits == 1
+
+    reloaded = ServerService(build_rule_engine(version=2), options_cache=cache)
+    assert reloaded.render_server_options(
+        {"cpu_architecture": "arm64", "ram": "ram_32gb"}, render_server_options
+    ) is not first
+    assert cache.generation == 2
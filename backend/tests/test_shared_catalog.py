@@ -0,0 +1,95 @@
+import random
+import shutil
+
+import pytest
+from backend.app.data import DataProvider, data_file
+from backend.app.data.models import RuleContext
+from backend.app.data.provider import SharedDataProvider
+from backend.app.data.shared_catalog import open_shared_catalog
+from backend.app.rules import initialize_rule_engine
+from backend.app.rules.handlers import initialize_handler_registry
+from backend.app.services.server import ServerService
+from backend.benchmarks.catalog_scaling import _configurations
+from backend.benchmarks.synthetic_catalog import CatalogSize, generate_catalog
+
+FILES = ("categories.jsonl", "options.jsonl", "rules.jsonl", "settings.jsonl")
+
+
+def _open(directory, builds=None) -> SharedDataProvider:
+    files = [directory / filename for filename in FILES]
+
+    def build() -> DataProvider:
+        if builds is not None:
+            builds.append(1)
+        return DataProvider(*files)
+
+    return SharedDataProvider(open_shared_catalog(directory / "shared", files, build))
+
+
+def test_shared_provider_matches_a_private_load(tmp_path):
+    generate_catalog(tmp_path, CatalogSize(categories=10, options=200, rules=80, quotes=0), seed=5)
+    private = DataProvider(*(tmp_path / filename for filename in FILES))
+    shared = _open(tmp_path)
+
+    assert shared.categories == private.categories
+    assert list(shared.options) == private.options
+    assert shared.options[-1] == private.options[-1]
+    assert shared.rules == private.rules
+    assert shared.settings == private.settings
+    assert shared.content_hash == private.content_hash
+    assert shared.get_base_price() == private.get_base_price()
+
+    for category in private.get_all_categories():
+        assert shared.get_options_by_category(category.id) == private.get_options_by_category(category.id)
+        assert shared.get_available_options_by_category(category.id) == (
+            private.get_available_options_by_category(category.id)
+        )
+    assert shared.get_options_by_category("no-such-category") == []
+    for option in private.options:
+        assert shared.get_option_price(option.id) == private.get_option_price(option.id)
+    with pytest.raises(ValueError, match="Unknown option ID"):
+        shared.get_option_price("no-such-option")
+
+    rng = random.Random(5)
+    for selection in _configurations(private, 30, rng, share=0.5):
+        option = rng.choice(private.options)
+        context = RuleContext(configuration=selection, current_option=option)
+        for rule_type in ("pricing", "availability", "validation", "discount"):
+            assert [compiled.rule for compiled in shared.get_candidate_rules(rule_type, context)] == [
+                compiled.rule for compiled in private.get_candidate_rules(rule_type, context)
+            ]
+
+    services = [
+        ServerService(initialize_rule_engine(provider, initialize_handler_registry(provider)))
+        for provider in (private, shared)
+    ]
+    for selection in _configurations(private, 30, random.Random(5), share=0.5):
+        expected, actual = (service._try_price_configuration(selection) for service in services)
+        assert actual == expected
+        expected, actual = (service.get_server_options(selection) for service in services)
+        assert actual == expected
+
+
+def test_shared_catalog_is_built_once_per_content(tmp_path):
+    for filename in FILES:
+        shutil.copy(data_file(filename), tmp_path / filename)
+    builds = []
+
+    first = _open(tmp_path, builds)
+    second = _open(tmp_path, builds)
+    assert len(builds) == 1
+    assert second.shared_catalog.path == first.shared_catalog.path
+
+    options_file = tmp_path / "options.jsonl"
+    options_file.write_text(options_file.read_text().replace('"49.00"', '"59.00"'))
+    changed = _open(tmp_path, builds)
+    assert len(builds) == 2
+    assert changed.shared_catalog.path != first.shared_catalog.path
+    assert not first.shared_catalog.path.exists()
+    assert changed.content_hash != first.content_hash
+    # processes still mapping the old file keep reading it
+    assert first.get_options_by_category(first.categories[0].id)
+
+    changed.shared_catalog.path.write_bytes(b"truncated")
+    _open(tmp_path, builds)
+    assert len(builds) == 3
@@ -0,0 +1,68 @@
+import json
+import random
+
+from backend.app.data import DataProvider
+from backend.app.data.models import PercentageDiscountAction
+from backend.app.data.models.quote import Quote
+from backend.app.rules import initialize_rule_engine
+from backend.app.rules.handlers import initialize_handler_registry
+from backend.app.services.server import ServerService
+from backend.benchmarks.catalog_scaling import _configurations, measure
+from backend.benchmarks.synthetic_catalog import CatalogSize, generate_catalog
+
+SIZE = CatalogSize(categories=12, options=300, rules=60, quotes=40)
+
+
+def _load(paths) -> DataProvider:
+    return DataProvider(
+        categories_file=paths["categories.jsonl"],
+        options_file=paths["options.jsonl"],
+        rules_file=paths["rules.jsonl"],
+        settings_file=paths["settings.jsonl"],
+    )
+
+
+def test_generated_catalog_is_seeded_and_loads(tmp_path):
+    paths = generate_catalog(tmp_path / "a", SIZE, seed=7)
+    same = generate_catalog(tmp_path / "b", SIZE, seed=7)
+    other = generate_catalog(tmp_path / "c", SIZE, seed=8)
+
+    for filename, path in paths.items():
+        assert path.read_bytes() == same[filename].read_bytes()
+    assert paths["rules.jsonl"].read_bytes() != other["rules.jsonl"].read_bytes()
+
+    data_provider = _load(paths)
+    assert len(data_provider.categories) == SIZE.categories
+    assert len(data_provider.options) == SIZE.options
+    assert len(data_provider.rules) == SIZE.rules
+    assert data_provider.get_base_price() > 0
+    assert {rule.type for rule in data_provider.rules} == {
+        "pricing", "availability", "validation", "discount"
+    }
+    for rule in data_provider.get_rules_by_type("discount"):
+        assert isinstance(rule.action, PercentageDiscountAction)
+
+    with open(paths["quotes.jsonl"], encoding="utf-8") as file:
+        quotes = [Quote.model_validate_json(line) for line in file]
+    assert len(quotes) == SIZE.quotes
+    assert all(quote.configuration for quote in quotes)
+
+
+def test_generated_configurations_are_mostly_priceable(tmp_path):
+    data_provider = _load(generate_catalog(tmp_path, SIZE, seed=7))
+    rule_engine = initialize_rule_engine(data_provider, initialize_handler_registry(data_provider))
+    service = ServerService(rule_engine)
+
+    configurations = _configurations(data_provider, 50, random.Random(7), share=1.0)
+    priced = [service._try_price_configuration(c) for c in configurations]
+    assert sum(result.error is None for result in priced) > len(priced) // 2
+
+
+def test_scaling_report_measures_every_dimension():
+    result = measure(SIZE, seed=7, requests=5, rounds=1)
+
+    assert result["size"] == SIZE._asdict()
+    assert result["load_ms"] > 0 and result["retained_mib"] > 0
+    for key in ("configure", "options", "quote_lookup"):
+        assert result[key]["p50_us"] <= result[key]["p95_us"]
+    json.dumps(result)
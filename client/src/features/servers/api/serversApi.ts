@@ -21,11 +21,12 @@ export const serversApi = api.injectEndpoints({
         }),
         getServerOptions: build.query<
             IBaseResponse<ServerOptionsResponse>,
-            void
+            IServerConfigurationParams
         >({
-            query: () => ({
+            query: (params) => ({
                 url: '/servers/options',
                 method: 'GET',
+                params,
             }),
             providesTags: ['ServerOptions'],
         }),
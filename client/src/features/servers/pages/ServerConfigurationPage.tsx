@@ -19,12 +19,6 @@ const ServerConfigurationPage = () => {
 
     const [quoteModalOpen, setQuoteModalOpen] = useState(false);
 
-    const {
-        data: optionsResponse,
-        isLoading: optionsLoading,
-        error: optionsError,
-    } = useGetServerOptionsQuery();
-
     const configParams = useMemo(() => {
         const params: Record<string, string> = {};
         Object.entries(configuration).forEach(([id, selection]) => {
@@ -35,6 +29,13 @@ const ServerConfigurationPage = () => {
         return params;
     }, [configuration]);
 
+    // Availability follows the current selection
+    const {
+        data: optionsResponse,
+        isLoading: optionsLoading,
+        error: optionsError,
+    } = useGetServerOptionsQuery(configParams);
+
     // Always call configuration API - let backend handle validation
     const {
         data: pricingResponse,